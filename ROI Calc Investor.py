@@ -1,10 +1,38 @@
 # External libs
 import streamlit as st
 import pandas as pd
+import altair as alt
 
 # Internal modules
+import instrumentation  # Opt-in stage timings (append ?debug=1 to the URL)
 from constants import *  # Centralized constants
-from calculations import compute_all_savings  # Encapsulated ROI math
+from calculations import (  # Encapsulated ROI math
+    compute_payback_months,
+    compute_roi_percent,
+    tier_inputs,
+)
+from result_cache import cached_call, shared_cache  # Disk cache shared across processes
+from results import compute_savings_result  # Compact array-backed line items
+from incremental import DEPENDENTS, changed_parameters, revalue  # Recompute only affected line items
+from rendering import (  # Cached HTML fragments
+    CATEGORY_EXPLANATIONS,
+    FORMULAS_LOOKUP,
+    category_card_html,
+    category_table_html,
+    metric_card_html,
+)
+from docs_cache import DOCUMENTS, load_document  # mtime-invalidated markdown sections
+from citations import tooltip as citation_tooltip  # pre-built constant -> research paragraph index
+from goal_seek import (  # Closed-form / vectorised goal seek
+    multiplier_for_max_payback,
+    multiplier_for_target_roi,
+    price_for_max_payback,
+    price_for_target_roi,
+)
+from projection import ProjectionSettings, project_tiers  # Cash-flow / NPV engine
+from simulation import simulate_tier  # Monte Carlo uncertainty bands
+from tiers import tier_config_for  # Headcount -> tier with interpolated defaults
+from sensitivity import sensitivity_table  # Analytic tornado analysis
 
 # --- Apply custom theming for a professional investor-ready look ---
 st.set_page_config(
@@ -14,6 +42,16 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# --- Opt-in instrumentation: ?debug=1 turns on timing and shows the debug panel ---
+# Recording is scoped to this session's rerun thread, so a debug visitor
+# does not slow down everyone else on the server.
+debug_mode = st.query_params.get("debug") == "1"
+instrumentation.begin_run(
+    enabled=debug_mode,
+    track_allocations=debug_mode and st.session_state.get("debug_track_allocations", False),
+)
+ui_lap = instrumentation.lap_timer("ui")  # None unless instrumentation is on
+
 # Custom CSS to improve appearance
 st.markdown("""
 <style>
@@ -332,6 +370,9 @@ TIER_DATA = {
     }
 }
 
+if ui_lap:
+    ui_lap("styles")
+
 # --- Main App UI ---
 st.image("https://storage.googleapis.com/komodobucket/opereta_logo.png", width=200) # Replace with your logo URL or path
 
@@ -370,6 +411,9 @@ with intro_col2:
     """, unsafe_allow_html=True)
 st.markdown("</div>", unsafe_allow_html=True)
 
+if ui_lap:
+    ui_lap("header")
+
 # --- Tier Selection ---
 st.sidebar.markdown("""
 <div style="background-color: #0e5394; padding: 10px; border-radius: 5px; margin-bottom: 20px;">
@@ -380,15 +424,31 @@ st.sidebar.markdown("""
 selected_tier_name = st.sidebar.selectbox("Select Customer Tier:", list(TIER_DATA.keys()))
 tier_config = TIER_DATA[selected_tier_name]
 
+# A specific headcount resolves its own tier and interpolates the profile
+# between tier averages (a 2,200-person prospect is not a 3,000-person one).
+use_headcount = st.sidebar.checkbox(
+    "Enter a specific headcount",
+    help="Resolves the tier from the headcount and interpolates hiring rate, salaries, recruiters and price between tier averages.",
+)
+if use_headcount:
+    headcount = st.sidebar.number_input(
+        "Number of Employees", min_value=1, value=int(tier_config["avg_employees"]), step=100,
+    )
+    tier_config = tier_config_for(headcount)
+    selected_tier_name = tier_config["tier"]
+
 # --- Tier-Specific Inputs styled better ---
 st.sidebar.markdown(f"""
 <div style="background-color: #f0f2f6; padding: 10px; border-radius: 5px; margin: 15px 0;">
     <h3 style="margin-top: 0; font-size: 18px; color: #0e5394;">Customer Profile: {selected_tier_name}</h3>
-    <p style="font-size: 14px; margin-bottom: 10px; color: #596e79;">({tier_config['employee_range']} Employees)</p>
+    <p style="font-size: 14px; margin-bottom: 10px; color: #596e79;">({tier_config['employee_range']} Employees{'; profile interpolated for this headcount' if use_headcount else ''})</p>
 </div>
 """, unsafe_allow_html=True)
 
-num_employees = st.sidebar.number_input("Avg. Number of Employees in Tier", value=tier_config["avg_employees"], disabled=True)
+num_employees = st.sidebar.number_input(
+    "Number of Employees" if use_headcount else "Avg. Number of Employees in Tier",
+    value=tier_config["avg_employees"], disabled=True,
+)
 annual_hires_percent = st.sidebar.number_input("Annual Hiring Rate (% of Employees)", value=tier_config["annual_hires_percent"], disabled=True, format="%.2f")
 annual_hires = int(num_employees * annual_hires_percent)
 st.sidebar.markdown(f"<p style='color: #596e79; font-size: 14px;'>Annual Hires: <b>{annual_hires}</b></p>", unsafe_allow_html=True)
@@ -423,18 +483,38 @@ st.sidebar.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
-# --- Scenario Sensitivity ---
-SCENARIOS = {
-    "Conservative (50% Impact)": 0.5,
-    "Base (100% Impact)": 1.0,
-    "Aggressive (125% Impact)": 1.25,
-}
+# --- Scenario Sensitivity (SCENARIOS from constants) ---
 
 selected_scenario_label = st.sidebar.selectbox("Assumption Scenario:", list(SCENARIOS.keys()), index=1)
 scenario_multiplier = SCENARIOS[selected_scenario_label]
 
 # Build a scenario-scaled impact dict
-scaled_impact = {k: v * scenario_multiplier for k, v in OPERETA_IMPACT.items()}
+scenario_impact = {k: v * scenario_multiplier for k, v in OPERETA_IMPACT.items()}
+
+# Per-key overrides on top of the scenario; editing one only recomputes the
+# line items that read it (dependency tracking in incremental.py).
+scaled_impact = dict(scenario_impact)
+with st.sidebar.expander("Fine-tune Individual Assumptions"):
+    for impact_key, scenario_value in scenario_impact.items():
+        scaled_impact[impact_key] = st.number_input(
+            impact_key.replace("_", " ").capitalize(),
+            value=float(scenario_value),
+            min_value=0.0,
+            step=0.5 if impact_key.endswith("_per_recruiter") else 0.005,
+            format="%.4f",
+            key=f"impact_{selected_scenario_label}_{impact_key}",  # resets when the scenario changes
+            help=f"{citation_tooltip(impact_key)}\n\nLine items affected: {len(DEPENDENTS[impact_key])}",
+        )
+
+# The assumptions at 100% scenario with the overrides folded in; the
+# projection and goal seek scale this so they agree with the headline ROI.
+override_impact = {k: v / scenario_multiplier for k, v in scaled_impact.items()}
+
+show_uncertainty_bands = st.sidebar.checkbox(
+    "Show Monte Carlo uncertainty bands",
+    value=False,
+    help="Samples every impact assumption and research baseline independently (100k draws) and reports P5 / P50 / P95.",
+)
 
 # Display a few key impact metrics as a horizontal bar chart using HTML/CSS
 impact_metrics = [
@@ -458,6 +538,9 @@ for metric in impact_metrics:
     </div>
     """, unsafe_allow_html=True)
 
+if ui_lap:
+    ui_lap("sidebar")
+
 # --- Current Baseline Values (Can be average industry stats for simplicity for investors) ---
 current_time_to_fill_days = AVG_TIME_TO_FILL_DAYS
 current_cost_per_hire = AVG_COST_PER_HIRE_SHRM if num_employees >=500 else AVG_COST_PER_HIRE_SMALL_BIZ
@@ -480,7 +563,11 @@ def _get_savings(
     num_recruiters: int,
     impact: dict,
 ):
-    return compute_all_savings(
+    instrumentation.mark_cache_miss()  # only runs when the cache misses
+    # Second level: the on-disk cache shared by every replica and worker.
+    return cached_call(
+        "savings_result",
+        compute_savings_result,
         num_employees=num_employees,
         annual_hires=annual_hires,
         avg_annual_salary=avg_annual_salary,
@@ -490,24 +577,36 @@ def _get_savings(
     )
 
 
-all_savings_details, total_annual_savings = _get_savings(
-    num_employees,
-    annual_hires,
-    avg_annual_salary,
-    avg_recruiter_salary,
-    num_recruiters,
-    scaled_impact,
-)
+with instrumentation.cache_lookup("_get_savings"):
+    savings_result = _get_savings(
+        num_employees,
+        annual_hires,
+        avg_annual_salary,
+        avg_recruiter_salary,
+        num_recruiters,
+        scenario_impact,
+    )
+overridden_keys = changed_parameters(scenario_impact, scaled_impact)
+if overridden_keys:
+    with instrumentation.stage("incremental revalue"):
+        savings_result = revalue(
+            savings_result,
+            num_employees=num_employees,
+            annual_hires=annual_hires,
+            avg_annual_salary=avg_annual_salary,
+            avg_recruiter_salary=avg_recruiter_salary,
+            num_recruiters=num_recruiters,
+            changed=overridden_keys,
+            impact=scaled_impact,
+        )
+total_annual_savings = savings_result.total
+
+if ui_lap:
+    ui_lap("calculations")
 
 # --- Display ROI Summary for Investor ---
-net_annual_benefit = total_annual_savings - opereta_annual_cost
-# Ensure roi_percentage is defined before being used for pre-formatting
-if opereta_annual_cost > 0:
-    roi_percentage_calc = (net_annual_benefit / opereta_annual_cost) * 100
-else:
-    roi_percentage_calc = float('inf') # Or some other indicator for undefined ROI
-
-payback_period_months = (opereta_annual_cost / (total_annual_savings / 12)) if total_annual_savings > 0 else float('inf')
+roi_percentage_calc = compute_roi_percent(total_annual_savings, opereta_annual_cost)
+payback_period_months = compute_payback_months(total_annual_savings, opereta_annual_cost)
 
 # Pre-format strings for use throughout the UI
 total_savings_str = f"${total_annual_savings:,.0f}"
@@ -526,41 +625,140 @@ st.markdown(f"""
 # Create a visually impressive metrics row
 metrics_col1, metrics_col2, metrics_col3, metrics_col4 = st.columns(4)
 
-with metrics_col1:
-    st.markdown(f"""
-    <div style="background-color: white; padding: 20px; border-radius: 10px; box-shadow: 0 4px 6px rgba(0,0,0,0.1); height: 100%;">
-        <p class="metric-label">Total Annual Value</p>
-        <p class="metric-value">{total_savings_str}</p>
-        <p style="font-size: 0.9rem; color: #596e79;">Matches Target: {tier_config['target_value_range']}</p>
-    </div>
-    """, unsafe_allow_html=True)
+metric_cards = [
+    ("Total Annual Value", total_savings_str, f"Matches Target: {tier_config['target_value_range']}", None),
+    ("Opereta Annual Price", opereta_cost_str, "Target pricing for this tier", None),
+    ("Customer ROI", roi_percentage_display, f"Matches Target: {tier_config['target_roi_percent']}", "#2e7d32"),
+    ("Payback Period", payback_str, "Time to recoup investment", None),
+]
+for metrics_col, card in zip((metrics_col1, metrics_col2, metrics_col3, metrics_col4), metric_cards):
+    with metrics_col:
+        st.markdown(metric_card_html(*card), unsafe_allow_html=True)
 
-with metrics_col2:
-    st.markdown(f"""
-    <div style="background-color: white; padding: 20px; border-radius: 10px; box-shadow: 0 4px 6px rgba(0,0,0,0.1); height: 100%;">
-        <p class="metric-label">Opereta Annual Price</p>
-        <p class="metric-value">{opereta_cost_str}</p>
-        <p style="font-size: 0.9rem; color: #596e79;">Target pricing for this tier</p>
-    </div>
-    """, unsafe_allow_html=True)
+if ui_lap:
+    ui_lap("metric cards")
 
-with metrics_col3:
-    st.markdown(f"""
-    <div style="background-color: white; padding: 20px; border-radius: 10px; box-shadow: 0 4px 6px rgba(0,0,0,0.1); height: 100%;">
-        <p class="metric-label">Customer ROI</p>
-        <p class="metric-value" style="color: #2e7d32;">{roi_percentage_display}</p>
-        <p style="font-size: 0.9rem; color: #596e79;">Matches Target: {tier_config['target_roi_percent']}</p>
-    </div>
-    """, unsafe_allow_html=True)
+# --- Monte Carlo uncertainty bands (optional) ---
+@st.cache_data(show_spinner=False)
+def _get_uncertainty_bands(tier_config: dict, impact: dict, annual_price: float):
+    return cached_call(
+        "uncertainty_bands",
+        # Keyed on the full profile, not a tier name, so edits and headcounts invalidate.
+        lambda tier_config, annual_price, impact: simulate_tier(
+            tier_config, annual_price=annual_price, impact=impact, seed=42
+        ),
+        tier_config=tier_config,
+        annual_price=annual_price,
+        impact=impact,
+    )
 
-with metrics_col4:
-    st.markdown(f"""
-    <div style="background-color: white; padding: 20px; border-radius: 10px; box-shadow: 0 4px 6px rgba(0,0,0,0.1); height: 100%;">
-        <p class="metric-label">Payback Period</p>
-        <p class="metric-value">{payback_str}</p>
-        <p style="font-size: 0.9rem; color: #596e79;">Time to recoup investment</p>
-    </div>
-    """, unsafe_allow_html=True)
+
+if show_uncertainty_bands:
+    bands = _get_uncertainty_bands(tier_config, scaled_impact, opereta_annual_cost)
+    band_rows = [
+        ("Total Annual Value", bands["total_annual_savings"], lambda v: f"${v:,.0f}"),
+        ("Customer ROI", bands["roi_percent"], lambda v: f"{v:,.0f}%" if opereta_annual_cost > 0 else "N/A"),
+        ("Payback Period", bands["payback_months"], lambda v: f"{v:.1f} months" if v != float('inf') else "N/A"),
+    ]
+    band_cols = st.columns(len(band_rows))
+    for band_col, (label, band, fmt) in zip(band_cols, band_rows):
+        with band_col:
+            st.markdown(f"""
+            <div style="background-color: #f8f9fa; padding: 15px; border-radius: 10px; margin-top: 15px; border-left: 4px solid #0e5394;">
+                <p style="font-weight: 600; margin-bottom: 8px;">{label} – Monte Carlo range</p>
+                <p style="margin: 0; color: #596e79;">P5: <b>{fmt(band["p5"])}</b></p>
+                <p style="margin: 0; color: #596e79;">P50: <b>{fmt(band["p50"])}</b></p>
+                <p style="margin: 0; color: #596e79;">P95: <b>{fmt(band["p95"])}</b></p>
+            </div>
+            """, unsafe_allow_html=True)
+
+if ui_lap:
+    ui_lap("uncertainty bands")
+
+# --- Multi-year cash-flow projection ---
+@st.cache_data(show_spinner=False)
+def _get_projection(months: int, ramp_months: int, discount_rate: float, price_escalation: float,
+                    tier_config: dict, annual_price: float, impact: dict):
+    # All tiers × scenarios in one vectorised pass; the selected tier uses the
+    # sidebar profile and price, and every row the sidebar assumptions.
+    settings = ProjectionSettings(months, ramp_months, discount_rate, price_escalation)
+    tier_name = tier_config["tier"]
+    return project_tiers(
+        settings=settings, prices={tier_name: annual_price}, impact=impact, profiles={tier_name: tier_config}
+    )
+
+
+with st.expander(f"📆 Multi-Year Cash-Flow View for {selected_tier_name} (NPV & Payback)"):
+    proj_col1, proj_col2, proj_col3 = st.columns(3)
+    ramp_months = proj_col1.slider("Adoption ramp-up (months)", 0, 12, 6)
+    discount_rate_pct = proj_col2.slider("Discount rate (%/yr)", 0, 25, 10)
+    price_escalation_pct = proj_col3.slider("Annual price escalation (%)", 0, 10, 3)
+    projection_labels, projection = _get_projection(
+        36, ramp_months, discount_rate_pct / 100, price_escalation_pct / 100,
+        {**tier_config, "tier": selected_tier_name}, float(opereta_annual_cost), override_impact,
+    )
+    tier_rows = [i for i, (tier, _scenario) in enumerate(projection_labels) if tier == selected_tier_name]
+    selected_row = projection_labels.index((selected_tier_name, selected_scenario_label))
+
+    df_cash_flow = pd.DataFrame({
+        "Month": list(range(projection.settings.months + 1)) * len(tier_rows),
+        "Scenario": [projection_labels[i][1] for i in tier_rows for _ in range(projection.settings.months + 1)],
+        "Cumulative Net Cash Flow ($)": projection.cumulative[tier_rows].ravel(),
+    })
+    cash_flow_chart = alt.Chart(df_cash_flow).mark_line().encode(
+        x=alt.X("Month:Q", title="Months since contract start"),
+        y=alt.Y("Cumulative Net Cash Flow ($):Q", axis=alt.Axis(format="$,.0s")),
+        color=alt.Color("Scenario:N", sort=list(SCENARIOS.keys()),
+                        scale=alt.Scale(range=["#9bb7d4", "#0e5394", "#2e7d32"])),
+        tooltip=["Scenario", "Month", alt.Tooltip("Cumulative Net Cash Flow ($):Q", format="$,.0f")],
+    )
+    zero_rule = alt.Chart(pd.DataFrame({"y": [0]})).mark_rule(color="#ff6b6b").encode(y="y:Q")
+    st.altair_chart(cash_flow_chart + zero_rule, use_container_width=True)
+
+    irr = projection.irr_annual[selected_row]
+    projection_cards = [
+        ("36-Month NPV", f"${projection.npv[selected_row]:,.0f}",
+         f"At {discount_rate_pct}% annual discount rate", None),
+        ("IRR (annualised)", "N/A" if irr != irr else (">1,000%" if irr > 10 else f"{irr:.0%}"),
+         selected_scenario_label, "#2e7d32"),
+        ("Payback Period", f"{projection.payback_months[selected_row]:.1f} months"
+         if projection.payback_months[selected_row] != float("inf") else "N/A",
+         f"With a {ramp_months}-month adoption ramp", None),
+        ("Discounted Payback", f"{projection.discounted_payback_months[selected_row]:.1f} months"
+         if projection.discounted_payback_months[selected_row] != float("inf") else "N/A",
+         "Cash flows in present value", None),
+    ]
+    for projection_col, card in zip(st.columns(len(projection_cards)), projection_cards):
+        with projection_col:
+            st.markdown(metric_card_html(*card), unsafe_allow_html=True)
+
+if ui_lap:
+    ui_lap("projection")
+
+# --- Goal seek (replaces nudging the price input by hand) ---
+with st.expander(f"🎯 Goal Seek for {selected_tier_name}"):
+    goal_col1, goal_col2 = st.columns(2)
+    target_roi_input = goal_col1.number_input("Target customer ROI (%)", value=500, step=50)
+    max_payback_input = goal_col2.number_input("Maximum payback (months)", value=12.0, step=1.0, min_value=0.5)
+    goal_inputs = {
+        **{name: [value] for name, value in tier_inputs(tier_config).items()},
+        "annual_price": [float(opereta_annual_cost)],
+    }
+    goal_rows = [
+        (f"Highest price for {target_roi_input:,}% ROI",
+         f"${price_for_target_roi(target_roi_input, goal_inputs, scenario_multiplier=scenario_multiplier, impact=override_impact)[0]:,.0f}"),
+        (f"Highest price for ≤ {max_payback_input:g}-month payback",
+         f"${price_for_max_payback(max_payback_input, goal_inputs, scenario_multiplier=scenario_multiplier, impact=override_impact)[0]:,.0f}"),
+        (f"Lowest impact multiplier for {target_roi_input:,}% ROI at {opereta_cost_str}",
+         f"{multiplier_for_target_roi(target_roi_input, goal_inputs, impact=override_impact)[0]:.1%}"),
+        (f"Lowest impact multiplier for ≤ {max_payback_input:g}-month payback at {opereta_cost_str}",
+         f"{multiplier_for_max_payback(max_payback_input, goal_inputs, impact=override_impact)[0]:.1%}"),
+    ]
+    st.markdown("\n".join(f"- **{label}:** {value}" for label, value in goal_rows))
+    st.caption(f"Prices use the selected scenario ({selected_scenario_label}) and any fine-tuned assumptions; multipliers scale every Opereta impact assumption (100% = Base, with fine-tuning applied).")
+
+if ui_lap:
+    ui_lap("goal seek")
 
 # --- Expandable Details ---
 with st.expander(f"Click for Detailed ROI Breakdown for {selected_tier_name} (Justification for Investor Slide)"):
@@ -573,112 +771,62 @@ with st.expander(f"Click for Detailed ROI Breakdown for {selected_tier_name} (Ju
     </div>
     """, unsafe_allow_html=True)
 
-    # Fetch data from the markdown content (conceptual - in a real app, this might be loaded from the file)
-    # For this edit, we will manually insert representative text based on the markdown.
-
-    category_explanations = {
-        "1. Hiring Process Optimization": {
-            "problem": "**The Problem:** Businesses face lengthy time-to-fill (avg. 44 days), high cost-per-hire (avg. $4,700), and massive recruiter workloads (e.g., 67% spend 30 mins-2 hours to schedule one interview). This leads to lost productivity valued at tens of thousands per vacancy.",
-            "solution": "**Opereta's Impact:** By optimizing sourcing, screening, and scheduling, Opereta reduces time-to-fill (by ~25-30% based on AI platform benchmarks), increases recruiter capacity (saving ~11 hours/week/recruiter), and lowers direct hiring costs (e.g., reducing agency reliance).",
-            "areas": ["Reduced Time-to-Fill", "Increased Recruiter Productivity", "Lower Cost-Per-Hire"]
-        },
-        "2. Enhanced Hiring Quality": {
-            "problem": "**The Problem:** Mis-hires are common (75% of employers admit to them) and costly, ranging from $17,000 to 30% of first-year salary. Poor hires also drag down team performance (managers spend ~17% of time on underperformers) and fuel early turnover.",
-            "solution": "**Opereta's Impact:** AI-driven matching and assessment improve quality-of-hire, directly reducing mis-hire rates and associated costs. Better hires lead to higher productivity (top talent can be 8x more productive) and improved retention.",
-            "areas": ["Reduced Mis-Hire Costs"]
-        },
-        "3. Strategic Role Alignment": {
-            "problem": "**The Problem:** 'Shift shock' from poorly defined roles causes early attrition (43% of early leavers cite mismatched expectations). Misalignment with business strategy (a challenge for 71% of orgs) leads to talent not being optimally deployed and strategic initiatives stalling.",
-            "solution": "**Opereta's Impact:** Opereta ensures precise role definitions based on success-driving skills and aligns talent to strategic value. This reduces early turnover from role ambiguity and ensures human capital is deployed effectively, improving strategy execution.",
-            "areas": ["Lower Early Attrition (Role Clarity)"]
-        },
-        "4. Optimized Interviewing": {
-            "problem": "**The Problem:** Interview processes are often lengthy (avg. 23 days) and time-consuming for managers (e.g., ~21% more interviewer hours per hire recently). Unstructured interviews have low predictive validity, contributing to mis-hires, and a poor candidate experience can lose top talent (53% cite bad questions as a deal-breaker).",
-            "solution": "**Opereta's Impact:** Opereta streamlines interview scheduling (saving hours per interview), enables structured, data-driven assessments to improve predictive quality, and reduces the overall interview load on hiring teams, while enhancing candidate experience.",
-            "areas": ["Efficient Interview Scheduling"]
-        },
-        "5. Accelerated Onboarding": {
-            "problem": "**The Problem:** New hires take an average of 8 months to reach full productivity, representing significant lost output. Poor onboarding leads to high early turnover (20% in first 45 days) because only 12% of employees feel their company excels at it.",
-            "solution": "**Opereta's Impact:** Opereta provides structured, personalized onboarding experiences that can improve new hire productivity by ~50% and significantly increase retention (strong onboarding can retain 50% more new hires), getting employees to contribute value faster.",
-            "areas": ["Faster Time-to-Productivity"]
-        },
-        "6. Improved Internal Mobility": {
-            "problem": "**The Problem:** Low internal fill rates (avg. 24%) mean companies over-rely on costly external hires (18% salary premium, plus recruiting costs). Lack of visibility into internal skills leads to skill gaps and high turnover from employees seeing no growth paths (companies with high mobility retain employees 41% longer).",
-            "solution": "**Opereta's Impact:** Opereta's talent marketplace provides visibility into internal skills, boosting internal fill rates (e.g., by 30%+), saving significantly on external hiring costs, filling roles faster, and retaining top talent by offering clear career pathways.",
-            "areas": ["Increased Internal Fill Rate & Cost Savings"]
-        },
-        "7. Effective Performance & Development": {
-            "problem": "**The Problem:** Traditional performance reviews are often ineffective (90% fail to improve performance), yet time-consuming (managers spend ~210 hours/year). This leads to skill stagnation, disengagement (only 21% globally engaged), and turnover (24% would quit due to poor PM).",
-            "solution": "**Opereta's Impact:** Opereta facilitates continuous, AI-backed performance management and development. This increases productivity (engaged teams are ~12-21% more productive/profitable), reduces turnover (by ~15%+ through regular feedback), and builds a stronger talent pipeline.",
-            "areas": ["Productivity Gains from Engaged PM", "Reduced Turnover (Better Growth Paths)"]
-        },
-        "8. Strategic Workforce Planning": {
-            "problem": "**The Problem:** Lack of workforce foresight (71% struggle to align workforce to strategy) leads to costly reactive decisions like talent shortages or overstaffing. Skills gaps alone can cost enterprises ~$59M/year per enterprise in lost productivity.",
-            "solution": "**Opereta's Impact:** Opereta enables proactive, AI-driven SWP, helping predict future talent needs, optimize workforce size/mix, and bridge skill gaps through reskilling (1/6th cost of hiring new). This can save 5-7% of labor budget annually and ensure strategic readiness.",
-            "areas": ["Optimized Labor Budget & Skill Deployment"]
-        }
-    }
-
-    # Convert to dataframe to organize data - this stays the same
-    df_savings_details = pd.DataFrame(all_savings_details) # Define df_savings_details here
-
-    # Display detailed explanations for each category
-    unique_categories = df_savings_details["Category"].unique()
-    for category_name in unique_categories:
-        if category_name in category_explanations:
-            st.markdown(f"""
-            <div style="margin-bottom: 30px; background-color: white; padding: 20px; border-radius: 10px; box-shadow: 0 2px 4px rgba(0,0,0,0.05);">
-                <h3 style="color: #0e5394; border-bottom: 1px solid #e0e0e0; padding-bottom: 10px;">{category_name}</h3>
-                <div style="margin: 15px 0;">
-                    <div style="margin-bottom: 15px; background-color: #fafafa; padding: 15px; border-left: 4px solid #ff6b6b; border-radius: 4px;">
-                        {category_explanations[category_name]["problem"]}
-                    </div>
-                    <div style="background-color: #f0f8ff; padding: 15px; border-left: 4px solid #0e5394; border-radius: 4px;">
-                        {category_explanations[category_name]["solution"]}
-                    </div>
-                </div>
-            """, unsafe_allow_html=True)
-            
-            # Display specific line items under this category
-            category_items_df = df_savings_details[df_savings_details["Category"] == category_name][["Area", "Annual Savings ($)"]]
-            category_items_df["Annual Savings ($)"] = category_items_df["Annual Savings ($)"].apply(lambda x: f"${x:,.0f}")
-            
-            # Convert DataFrame to HTML for better styling
-            html_table = category_items_df.to_html(index=False)
-            styled_table = f"""
-            <div style="margin-top: 15px;">
-                <h4 style="font-size: 1rem; margin-bottom: 10px;">Projected Savings in This Category:</h4>
-                <div style="max-height: 200px; overflow-y: auto;">
-                    {html_table.replace('<table', '<table style="width:100%; border-collapse: collapse;" class="dataframe"')
-                     .replace('<th>', '<th style="text-align: left; padding: 8px; background-color: #f2f2f2; border-bottom: 2px solid #ddd;">')
-                     .replace('<td>', '<td style="text-align: left; padding: 8px; border-top: 1px solid #ddd;">')}
-                </div>
-            </div>
-            """
-            st.markdown(styled_table, unsafe_allow_html=True)
+    # Explanations, formulas and rendered tables are cached in ``rendering``;
+    # this section depends only on the tier and scenario, not the price.
+    for category_name in savings_result.categories:
+        if category_name in CATEGORY_EXPLANATIONS:
+            st.markdown(category_card_html(category_name), unsafe_allow_html=True)
+            st.markdown(category_table_html(savings_result, category_name), unsafe_allow_html=True)
 
             # --- Detailed math formulas (optional) ---
-            formulas_lookup = {
-                "1. Hiring Process Optimization": """#### 🔍 Calculation Details\n- **Reduced TTF:** `TTF_saved_days × Daily Vacancy Cost × Annual Hires`\n- **Recruiter Productivity:** `Hours saved × Hourly recruiter cost`\n- **Lower CPH:** `Baseline CPH × Reduction % × Annual Hires`\n\n_See `docs/value_generation_framework.md#1-hiring-process-optimization` for full walkthrough and source links._""",
-                "2. Enhanced Hiring Quality": """#### 🔍 Calculation Details\n`Mis-hire Cost × Bad Hires Prevented`\n\nWhere:\n- `Mis-hire Cost = Avg Salary × 30 %` (US DoL)\n- `Bad Hires Prevented = Annual Hires × 15 % mis-hire rate × 35 % reduction`\n\n_See `docs/value_generation_framework.md#2-enhanced-hiring-quality` for worked example._""",
-                "3. Strategic Role Alignment": """#### 🔍 Calculation Details\n`Early_Turnover × 43 % shift-shock × 60 % reduction × Replacement_Cost`\n\nReplacement cost = `Avg Salary × 21 %`\n\n_See `docs/value_generation_framework.md#3-strategic-role-alignment` for full breakdown._""",
-                "4. Optimized Interviewing": """#### 🔍 Calculation Details\n`Interviews_per_year × Time_saved × Recruiter_hourly_rate`\n\nTime saved ≈ 0.9 h/interview (90 % reduction).\n\n_See `docs/value_generation_framework.md#4-optimized-interviewing`._""",
-                "5. Accelerated Onboarding": """#### 🔍 Calculation Details\n`(Avg Sal / 12) × Months_saved × 50 % productivity_gap × Annual_Hires`\n\nMonths_saved = `8 mo × 35 %`\n\n_See `docs/value_generation_framework.md#5-accelerated-onboarding`._""",
-                "6. Improved Internal Mobility": """#### 🔍 Calculation Details\n`External_Hires_Avoided × (Salary_Premium + 0.5 × CPH)`\n\nExternal_Hires_Avoided derives from 20 pp increase in internal fill rate.\n\n_See `docs/value_generation_framework.md#6-improved-internal-mobility`._""",
-                "7. Effective Performance & Development": """#### 🔍 Calculation Details\n• **Productivity Gains:** `Total_Payroll × 20 % segment × 3 % uplift`\n• **Turnover Savings:** `Voluntary Leavers × 30 % reduction × Replacement_Cost`\n\n_See `docs/value_generation_framework.md#7-effective-performance--development`._""",
-                "8. Strategic Workforce Planning": """#### 🔍 Calculation Details\n`Total_Payroll × 4 %` labor budget optimisation.\n\n_See `docs/value_generation_framework.md#8-strategic-workforce-planning`._""",
-            }
-
-            if category_name in formulas_lookup:
-                st.markdown(formulas_lookup[category_name], unsafe_allow_html=True)
+            if category_name in FORMULAS_LOOKUP:
+                st.markdown(FORMULAS_LOOKUP[category_name], unsafe_allow_html=True)
         else:
-            # Fallback for any category not explicitly defined (should not happen if all_savings_details matches)
+            # Fallback for any category not explicitly defined (should not happen if LINE_ITEMS matches)
+            category_areas, category_amounts = savings_result.for_category(category_name)
+            category_items_df = pd.DataFrame({
+                "Area": category_areas,
+                "Annual Savings ($)": [f"${x:,.0f}" for x in category_amounts.tolist()],
+            })
             st.subheader(category_name)
-            category_items_df = df_savings_details[df_savings_details["Category"] == category_name][["Area", "Annual Savings ($)"]]
-            category_items_df["Annual Savings ($)"] = category_items_df["Annual Savings ($)"].apply(lambda x: f"${x:,.0f}")
             st.dataframe(category_items_df, use_container_width=True, hide_index=True)
             st.markdown("---")
 
+    # --- Sensitivity (tornado) analysis ---
+    @st.cache_data(show_spinner=False)
+    def _get_sensitivity(inputs: dict, impact: dict, annual_price: float):
+        return cached_call("sensitivity_table", sensitivity_table, inputs=inputs, annual_price=annual_price, impact=impact)
+
+    sensitivity_rows = _get_sensitivity(
+        {
+            "num_employees": num_employees,
+            "annual_hires": annual_hires,
+            "avg_annual_salary": avg_annual_salary,
+            "avg_recruiter_salary": avg_recruiter_salary,
+            "num_recruiters": num_recruiters,
+        },
+        scaled_impact,
+        opereta_annual_cost,
+    )
+    df_tornado = pd.DataFrame([row for row in sensitivity_rows if row["Savings Swing ($)"] > 0][:12])
+
+    st.markdown("""
+    <div style="margin-top: 30px;">
+        <h3 style="color: #0e5394;">Which Assumptions Matter Most?</h3>
+        <p>Each bar shows how total annual value moves when a single assumption is 10% lower or higher, holding all others fixed.
+        Computed analytically from the model's closed-form structure.</p>
+    </div>
+    """, unsafe_allow_html=True)
+    tornado_chart = alt.Chart(df_tornado).mark_bar(color="#0e5394").encode(
+        y=alt.Y("Parameter:N", sort=list(df_tornado["Parameter"]), title=None),
+        x=alt.X("Total Low ($):Q", title="Total Annual Value ($)", scale=alt.Scale(zero=False)),
+        x2="Total High ($):Q",
+        tooltip=["Parameter", "Value", alt.Tooltip("Savings Swing ($):Q", format="$,.0f"),
+                 alt.Tooltip("ROI Low (%):Q", format=",.0f"), alt.Tooltip("ROI High (%):Q", format=",.0f")],
+    )
+    base_rule = alt.Chart(pd.DataFrame({"total": [total_annual_savings]})).mark_rule(color="#ff6b6b").encode(x="total:Q")
+    st.altair_chart(tornado_chart + base_rule, use_container_width=True)
+
     st.markdown("""
     <div style="background-color: #f0f8ff; padding: 20px; border-radius: 5px; margin-top: 30px; border-left: 5px solid #0e5394;">
         <h4 style="color: #0e5394;">Note on 'Opereta Impact' Assumptions:</h4>
@@ -689,6 +837,9 @@ with st.expander(f"Click for Detailed ROI Breakdown for {selected_tier_name} (Ju
     </div>
     """, unsafe_allow_html=True)
 
+if ui_lap:
+    ui_lap("breakdown")
+
 st.markdown("---")
 
 # Create a visually impressive "Why This Matters" section
@@ -755,13 +906,54 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
+if ui_lap:
+    ui_lap("value props")
+
 # -------------------------------------------------------------------
 # OPTIONAL: full math deep-dive markdown
 # -------------------------------------------------------------------
 
-with st.expander("📚 Full Value Generation Framework – formulas & assumptions"):
+# Documents are parsed once per server process (re-read on mtime change);
+# only the selected section is rendered.
+with st.expander("📚 Full Value Generation Framework & Research – formulas & assumptions"):
+    doc_col1, doc_col2 = st.columns([1, 2])
+    doc_label = doc_col1.selectbox("Document:", list(DOCUMENTS.keys()))
     try:
-        with open("docs/value_generation_framework.md", "r") as md_file:
-            st.markdown(md_file.read())
+        document = load_document(DOCUMENTS[doc_label])
     except FileNotFoundError:
-        st.warning("Detailed markdown file not found. Please ensure docs/value_generation_framework.md is present.")
\ No newline at end of file
+        st.warning(f"Detailed markdown file not found. Please ensure {DOCUMENTS[doc_label]} is present.")
+    else:
+        section_title = doc_col2.selectbox("Section:", document.titles, key=f"doc_section_{doc_label}")
+        st.markdown(f"## {section_title}\n\n{document.section(section_title).body}")
+if ui_lap:
+    ui_lap("docs")
+
+# --- Hidden debug panel (?debug=1): per-rerun stage timings ---
+if debug_mode:
+    with st.sidebar.expander("🛠 Debug: stage timings", expanded=True):
+        st.checkbox("Track allocations (slower, applies from next rerun)", key="debug_track_allocations")
+        run_rows = instrumentation.run_records()
+        st.caption(f"This rerun: {sum(r['seconds'] for r in run_rows if r['stage'].startswith('ui/')) * 1000:,.1f} ms across UI sections")
+        st.dataframe(
+            pd.DataFrame({
+                "Stage": [r["stage"] for r in run_rows],
+                "ms": [r["seconds"] * 1000 for r in run_rows],
+                "KiB": [r["allocated_bytes"] / 1024 for r in run_rows],
+            }),
+            hide_index=True,
+        )
+        result_cache = shared_cache()
+        if result_cache is not None:
+            cache_stats = result_cache.stats()
+            st.caption(
+                f"Shared result cache: {cache_stats['entries']:,} entries, {cache_stats['bytes'] / 1024:,.0f} KiB · "
+                + " · ".join(f"{name} {value:,}" for name, value in cache_stats["shared"].items())
+            )
+        st.download_button(
+            "Export timings (JSON)",
+            instrumentation.export_json(),
+            file_name="opereta_timings.json",
+            mime="application/json",
+        )
+
+instrumentation.end_run()
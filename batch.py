@@ -0,0 +1,153 @@
+"""batch.py
+Vectorised counterpart of :func:`calculations.compute_all_savings`.
+Scores a whole prospect table in one NumPy pass instead of a Python loop.
+Kernels are generated from the same declarations as the scalar engine
+(:mod:`formulas`), operation for operation, so the columns match the scalar
+line items exactly.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Mapping, Tuple
+
+import numpy as np
+
+from calculations import LINE_ITEMS
+from constants import OPERETA_IMPACT
+from formulas import INPUTS, REGISTRY, baselines, compile_numpy
+
+__all__ = [
+    "BASELINE_CONSTANTS",
+    "INPUT_COLUMNS",
+    "LINE_ITEM_DEPENDENCIES",
+    "TOTAL_COLUMN",
+    "build_params",
+    "compute_all_savings_batch",
+    "compute_line_items_batch",
+    "payback_months_batch",
+    "roi_percent_batch",
+]
+
+# Per-prospect inputs accepted by the batch engine (same names as the
+# keyword arguments of ``compute_all_savings``).
+INPUT_COLUMNS: Tuple[str, ...] = INPUTS
+
+TOTAL_COLUMN = "total_annual_savings"
+
+# Research baselines the kernels read by name, derived from the registry so a
+# new formula parameter is picked up without editing this list.  Callers may
+# override any of them (scalar or per-row array) for what-if and Monte Carlo runs.
+BASELINE_CONSTANTS: Dict[str, float] = baselines()
+
+Params = Mapping[str, np.ndarray]
+
+
+# ---------- Line-item kernels ---------- #
+# Generated from formulas.REGISTRY.  Each receives a mapping of float64
+# arrays holding the inputs, the impact keys and the baseline constants.
+
+_COMPILED = compile_numpy()
+_KERNELS: Dict[str, Callable[[Params], Dict[str, np.ndarray]]] = _COMPILED.line_items
+
+# Line-item key -> the inputs, impact keys and baseline constants it reads.
+LINE_ITEM_DEPENDENCIES: Dict[str, FrozenSet[str]] = {item.key: item.parameters for item in REGISTRY}
+
+
+# ---------- Public entry points ---------- #
+
+
+def build_params(
+    data: Mapping[str, Any] | None = None,
+    *,
+    impact: Mapping[str, Any] | None = None,
+    baseline: Mapping[str, Any] | None = None,
+    **columns: Any,
+) -> Dict[str, np.ndarray]:
+    """Resolve and broadcast every model parameter to float64 arrays.
+
+    Inputs are read from *data* (a dict of arrays or a DataFrame) and/or
+    keyword arrays named after :data:`INPUT_COLUMNS`; keywords win.  Values
+    may be scalars or 1-D arrays and are broadcast together.  *impact*
+    defaults to ``OPERETA_IMPACT`` and *baseline* (a partial mapping over
+    :data:`BASELINE_CONSTANTS`) to the research constants.  Any column of
+    *data* named after an impact key or baseline constant overrides that
+    value per row.
+    """
+
+    data = data if data is not None else {}
+    impact = impact or OPERETA_IMPACT
+
+    raw: Dict[str, Any] = {}
+    for name in INPUT_COLUMNS:
+        if name in columns:
+            raw[name] = columns.pop(name)
+        elif name in data:
+            raw[name] = data[name]
+        else:
+            raise KeyError(f"Missing batch input column: {name!r}")
+    if columns:
+        raise TypeError(f"Unexpected batch inputs: {sorted(columns)}")
+
+    unknown = set(baseline or ()) - set(BASELINE_CONSTANTS)
+    if unknown:
+        raise KeyError(f"Unknown baseline constants: {sorted(unknown)}")
+    defaults = {**impact, **BASELINE_CONSTANTS, **(baseline or {})}
+    for key, value in defaults.items():
+        raw[key] = data[key] if key in data else value
+
+    names = list(raw)
+    arrays = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(raw[n], dtype=np.float64)) for n in names)
+    )
+    return dict(zip(names, arrays))
+
+
+def compute_all_savings_batch(
+    data: Mapping[str, Any] | None = None,
+    *,
+    impact: Mapping[str, Any] | None = None,
+    baseline: Mapping[str, Any] | None = None,
+    **columns: Any,
+) -> Dict[str, np.ndarray]:
+    """Vectorised ``compute_all_savings`` over many prospects at once.
+
+    Accepts the same arguments as :func:`build_params`.  Returns a wide,
+    columnar dict: one float64 array per :data:`calculations.LINE_ITEMS`
+    key plus :data:`TOTAL_COLUMN`.
+    """
+
+    params = build_params(data, impact=impact, baseline=baseline, **columns)
+
+    result = _COMPILED.fused(params)  # shared intermediates computed once
+    total = np.zeros(params["num_employees"].shape, dtype=np.float64)
+    for key, _category, _area in LINE_ITEMS:
+        total += result[key]
+    result[TOTAL_COLUMN] = total
+    return result
+
+
+def compute_line_items_batch(params: Mapping[str, np.ndarray], keys: Iterable[str]) -> Dict[str, np.ndarray]:
+    """Evaluate only the line items *keys* on resolved :func:`build_params` output."""
+    result: Dict[str, np.ndarray] = {}
+    for key in keys:
+        result.update(_KERNELS[key](params))
+    return result
+
+
+def roi_percent_batch(total_annual_savings: Any, annual_price: Any) -> np.ndarray:
+    """Vectorised :func:`calculations.compute_roi_percent` (``inf`` at zero price)."""
+    savings = np.asarray(total_annual_savings, dtype=np.float64)
+    price = np.asarray(annual_price, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        roi = ((savings - price) / price) * 100
+    return np.where(price > 0, roi, np.inf)
+
+
+def payback_months_batch(total_annual_savings: Any, annual_price: Any) -> np.ndarray:
+    """Vectorised :func:`calculations.compute_payback_months`."""
+    savings = np.asarray(total_annual_savings, dtype=np.float64)
+    price = np.asarray(annual_price, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        months = price / (savings / 12)
+    return np.where(savings > 0, months, np.inf)
+
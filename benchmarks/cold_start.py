@@ -0,0 +1,75 @@
+"""benchmarks/cold_start.py
+Cold-start time of a one-off ROI query.
+Times fresh interpreter processes for the old import path (Streamlit plus
+a pandas-importing ``calculations``) against ``roi.py`` and reports the
+median wall time of each.
+
+Usage::
+
+    python benchmarks/cold_start.py --runs 15
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_QUERY = (
+    "from calculations import compute_all_savings, compute_roi_percent, tier_inputs\n"
+    "from constants import TIER_DATA\n"
+    "t = TIER_DATA['Mid-Market']\n"
+    "_, s = compute_all_savings(**tier_inputs(t))\n"
+    "print(compute_roi_percent(s, t['opereta_target_annual_price']))\n"
+)
+
+# Each case is a full command run in a fresh interpreter.
+CASES: Dict[str, List[str]] = {
+    "python (empty interpreter)": [sys.executable, "-c", "pass"],
+    # What a script needed before: Streamlit for the app's ROI math and
+    # pandas pulled in by ``calculations``.
+    "streamlit + pandas import path": [
+        sys.executable, "-c", "import streamlit, pandas\n" + _QUERY,
+    ],
+    "roi.py CLI": [sys.executable, os.path.join(ROOT, "roi.py"), "--tier", "Mid-Market"],
+}
+
+
+def time_command(command: List[str], runs: int) -> List[float]:
+    """Wall-clock seconds of *runs* sequential executions of *command*."""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, check=True, stdout=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare cold-start time of ROI query paths.")
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    # One untimed run each so the OS page cache is warm for every case.
+    for command in CASES.values():
+        time_command(command, 1)
+
+    medians = {}
+    for label, command in CASES.items():
+        timings = time_command(command, args.runs)
+        medians[label] = statistics.median(timings)
+        print(f"{label:<32} median {medians[label] * 1000:8.1f} ms  (min {min(timings) * 1000:.1f} ms)")
+
+    old, new = medians["streamlit + pandas import path"], medians["roi.py CLI"]
+    print(f"\nroi.py starts {old / new:.1f}x faster ({(old - new) * 1000:.0f} ms saved per query)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,397 @@
+"""benchmarks/load_test.py
+Concurrent-session load test of the Streamlit app.
+Starts N headless sessions (one ``AppTest`` per thread, all in this
+process, so they share ``st.cache_data``, the result cache and the GIL the
+way sessions on one server do).  Each session makes random sidebar widget
+changes (tier, scenario, checkboxes, price) and reruns.  The report holds
+the per-rerun latency distribution overall and per widget kind, the
+``_get_savings`` cache hit rate (from :mod:`instrumentation`) and process
+RSS growth, as JSON that ``--compare`` checks against an earlier release.
+
+Usage::
+
+    python benchmarks/load_test.py --sessions 8 --reruns 25 --output load.json
+    python benchmarks/load_test.py --sessions 8 --compare load.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+APP_PATH = os.path.join(ROOT, "ROI Calc Investor.py")
+WIDGET_KINDS: Tuple[str, ...] = ("selectbox", "checkbox", "number_input", "slider")
+DEFAULT_THRESHOLD = 0.25
+# Sidebar number inputs are nudged by up to this fraction either way.
+NUMBER_JITTER = 0.2
+# Compared against --compare, as (report path, higher is worse).
+COMPARED: Tuple[Tuple[str, bool], ...] = (
+    ("latency_ms.p50", True),
+    ("latency_ms.p95", True),
+    ("latency_ms.p99", True),
+    ("cache.hit_rate", False),
+    ("memory.growth_mib", True),
+)
+
+
+def _rss_bytes() -> int:
+    """Current resident set size (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm", "r") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _percentiles(samples: List[float]) -> Dict[str, float]:
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def pick(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+    return {
+        "count": len(ordered),
+        "mean": statistics.fmean(ordered),
+        "p50": pick(0.50),
+        "p90": pick(0.90),
+        "p95": pick(0.95),
+        "p99": pick(0.99),
+        "max": ordered[-1],
+    }
+
+
+def _quiet_streamlit() -> None:
+    # Streamlit sets levels per logger, so the parent level alone is not enough.
+    import logging
+
+    for name in list(logging.root.manager.loggerDict):
+        if name.startswith("streamlit"):
+            logging.getLogger(name).setLevel(logging.ERROR)
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+# ---------- Sessions ---------- #
+
+
+def _random_change(app: Any, rng: random.Random, kinds: Tuple[str, ...]) -> str | None:
+    """Apply one random change to an enabled sidebar widget; returns its kind.
+
+    The kind is drawn first so the few selectors are not drowned out by the
+    many number inputs.
+    """
+    candidates: Dict[str, List[Any]] = {}
+    for kind in kinds:
+        enabled = [
+            widget for widget in getattr(app.sidebar, kind)
+            if not getattr(widget, "disabled", False) and not isinstance(widget.value, (list, tuple))  # no ranges
+        ]
+        if enabled:
+            candidates[kind] = enabled
+    if not candidates:
+        return None
+    kind = rng.choice(sorted(candidates))
+    widget = rng.choice(candidates[kind])
+    if kind == "selectbox":
+        widget.set_value(rng.choice([option for option in widget.options if option != widget.value] or widget.options))
+    elif kind == "checkbox":
+        widget.set_value(not widget.value)
+    elif kind == "slider":
+        low, high = widget.min, widget.max
+        value = low + rng.random() * (high - low)
+        widget.set_value(type(widget.value)(round(value / widget.step) * widget.step) if widget.step else value)
+    else:
+        value = widget.value * (1 + rng.uniform(-NUMBER_JITTER, NUMBER_JITTER))
+        widget.set_value(type(widget.value)(value))
+    return kind
+
+
+class _Session(threading.Thread):
+    """One simulated user: an initial run, then *reruns* random changes."""
+
+    def __init__(self, index: int, args: argparse.Namespace, start: threading.Barrier, samples: List[Dict[str, Any]]):
+        super().__init__(name=f"load-session-{index}", daemon=True)
+        self.index = index
+        self.args = args
+        self.start_barrier = start
+        self.samples = samples
+        self.rng = random.Random(args.seed + index)
+        self.error: str | None = None
+
+    def _run(self, app: Any, kind: str) -> None:
+        started = time.perf_counter()
+        app.run()
+        seconds = time.perf_counter() - started
+        if app.exception:
+            raise RuntimeError(f"session {self.index}: app raised {app.exception[0].message}")
+        self.samples.append({"session": self.index, "kind": kind, "seconds": seconds, "rss": _rss_bytes()})
+
+    def run(self) -> None:
+        from streamlit.testing.v1 import AppTest
+
+        try:
+            app = AppTest.from_file(APP_PATH, default_timeout=self.args.timeout)
+            self.start_barrier.wait()
+            self._run(app, "initial")
+            for _ in range(self.args.reruns):
+                kind = _random_change(app, self.rng, tuple(self.args.widgets))
+                if kind is None:
+                    self.error = f"session {self.index}: no enabled sidebar widget to change"
+                    break
+                time.sleep(self.rng.uniform(0, self.args.think_time))
+                self._run(app, kind)
+        except threading.BrokenBarrierError:
+            self.error = f"session {self.index}: start barrier broken"
+        except Exception as exc:  # reported, not raised, so other sessions finish
+            self.error = f"{type(exc).__name__}: {exc}"
+            self.start_barrier.abort()
+
+
+@contextlib.contextmanager
+def _shared_server_state() -> Iterator[None]:
+    """Make concurrent ``AppTest`` runs share what one server shares.
+
+    ``AppTest.run`` installs a mock ``Runtime`` singleton and clears it when
+    the run ends, which would pull it out from under the other sessions'
+    runs; while active, ``Runtime.instance()`` falls back to the last mock
+    installed instead of raising.  Likewise each run patches and then
+    restores the ``global.appTest`` config option, so it is held on
+    throughout.  Each run also builds its own ``ScriptCache``, so every
+    rerun would recompile the script (and concurrent ``ast.parse`` calls can
+    fail on CPython 3.11); runs share one cache instead, as sessions on a
+    server do.
+    """
+    from streamlit.runtime.runtime import Runtime
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    from streamlit.testing.v1 import app_test, local_script_runner
+    from streamlit.testing.v1.util import patch_config_options
+
+    original_instance = Runtime.__dict__["instance"]
+    script_cache = ScriptCache()
+    last: Dict[str, Any] = {}
+
+    def instance(cls: Any) -> Any:
+        current = cls._instance
+        if current is not None:
+            last["runtime"] = current
+            return current
+        if "runtime" in last:
+            return last["runtime"]
+        return original_instance.__func__(cls)
+
+    Runtime.instance = classmethod(instance)  # type: ignore[method-assign, assignment]
+    for module in (app_test, local_script_runner):
+        module.ScriptCache = lambda: script_cache  # type: ignore[attr-defined]
+    try:
+        with patch_config_options({"global.appTest": True}):
+            yield
+    finally:
+        Runtime.instance = original_instance  # type: ignore[method-assign]
+        for module in (app_test, local_script_runner):
+            module.ScriptCache = ScriptCache  # type: ignore[attr-defined]
+
+
+def run_load_test(args: argparse.Namespace) -> Dict[str, Any]:
+    """Run every session to completion and summarise the samples."""
+    import streamlit
+    from streamlit.testing.v1 import AppTest
+
+    import instrumentation
+    from result_cache import shared_cache
+
+    # Untimed warm-up run for imports and module-level setup, then start
+    # every session against empty in-memory caches.
+    warm_up = AppTest.from_file(APP_PATH, default_timeout=args.timeout).run()
+    _quiet_streamlit()  # loggers are created lazily during the first run
+    if warm_up.exception:
+        raise RuntimeError(f"App raised during warm-up: {warm_up.exception[0].message}")
+    streamlit.cache_data.clear()
+    streamlit.cache_resource.clear()
+    instrumentation.enable()
+    instrumentation.reset()
+
+    samples: List[Dict[str, Any]] = []  # list.append is atomic under the GIL
+    barrier = threading.Barrier(args.sessions)
+    sessions = [_Session(i, args, barrier, samples) for i in range(args.sessions)]
+    rss_before = _rss_bytes()
+    started = time.perf_counter()
+    with _shared_server_state():
+        for session in sessions:
+            session.start()
+        for session in sessions:
+            session.join()
+    elapsed = time.perf_counter() - started
+
+    totals = instrumentation.snapshot()["totals"]
+    hits = int(totals.get("cache/_get_savings hit", {}).get("calls", 0))
+    misses = int(totals.get("cache/_get_savings miss", {}).get("calls", 0))
+    reruns = [sample for sample in samples if sample["kind"] != "initial"]
+    rss = [sample["rss"] for sample in sorted(samples, key=lambda sample: sample["rss"])]
+    mib = 1024 * 1024
+    shared = shared_cache()
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "streamlit": streamlit.__version__,
+        "machine": platform.node(),
+        "settings": {
+            "sessions": args.sessions,
+            "reruns": args.reruns,
+            "widgets": list(args.widgets),
+            "think_time": args.think_time,
+            "seed": args.seed,
+        },
+        "errors": [session.error for session in sessions if session.error],
+        "seconds": elapsed,
+        "reruns_per_second": len(samples) / elapsed if elapsed > 0 else 0.0,
+        "latency_ms": {k: v * 1e3 if k != "count" else v for k, v in _percentiles(
+            [sample["seconds"] for sample in reruns]).items()},
+        "initial_run_ms": {k: v * 1e3 if k != "count" else v for k, v in _percentiles(
+            [sample["seconds"] for sample in samples if sample["kind"] == "initial"]).items()},
+        "latency_ms_by_widget": {
+            kind: {k: v * 1e3 if k != "count" else v for k, v in _percentiles(
+                [sample["seconds"] for sample in reruns if sample["kind"] == kind]).items()}
+            for kind in sorted({sample["kind"] for sample in reruns})
+        },
+        "cache": {
+            "_get_savings_hits": hits,
+            "_get_savings_misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            "shared": shared.stats()["shared"] if shared is not None else None,
+        },
+        "memory": {
+            "rss_before_mib": rss_before / mib,
+            "rss_after_mib": _rss_bytes() / mib,
+            "rss_peak_mib": (rss[-1] if rss else rss_before) / mib,
+            "growth_mib": (_rss_bytes() - rss_before) / mib,
+        },
+    }
+
+
+# ---------- Comparison ---------- #
+
+
+def _lookup(report: Dict[str, Any], path: str) -> float | None:
+    value: Any = report
+    for part in path.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+    return float(value)
+
+
+def compare_reports(current: Dict[str, Any], previous: Dict[str, Any], *, threshold: float) -> List[str]:
+    """Print both reports side by side; describe metrics worse by more than *threshold*."""
+    if current["settings"] != previous["settings"]:
+        print(f"note: settings differ from the baseline ({previous['settings']})", file=sys.stderr)
+    problems = []
+    print(f"\n{'metric':<22} {previous.get('commit') or 'baseline':>12} {current.get('commit') or 'current':>12}  change")
+    for path, higher_is_worse in COMPARED:
+        old, new = _lookup(previous, path), _lookup(current, path)
+        if old is None or new is None:
+            continue
+        change = (new - old) / abs(old) if old else 0.0
+        print(f"{path:<22} {old:12.2f} {new:12.2f}  {change:+.0%}")
+        worse = change > threshold if higher_is_worse else change < -threshold
+        # Memory noise of a few MiB is not a regression however large in relative terms.
+        if worse and not (path.startswith("memory.") and abs(new - old) < 16):
+            problems.append(f"{path}: {old:.2f} -> {new:.2f} ({change:+.0%}, allowed {threshold:.0%})")
+    return problems
+
+
+# ---------- CLI ---------- #
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Load-test the Streamlit app with concurrent headless sessions.")
+    parser.add_argument("--sessions", type=int, default=8, help="Concurrent sessions")
+    parser.add_argument("--reruns", type=int, default=20, help="Random widget changes per session")
+    parser.add_argument("--widgets", nargs="+", choices=WIDGET_KINDS, default=list(WIDGET_KINDS),
+                        help="Sidebar widget kinds the sessions change")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Max random pause before each change (s)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=120.0, help="Per-rerun AppTest timeout (s)")
+    parser.add_argument("--cache-dir", default=None,
+                        help="OPERETA_CACHE_DIR for the run (default: a fresh temporary directory)")
+    parser.add_argument("--output", help="Write the JSON report here")
+    parser.add_argument("--compare", help="Earlier report to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed relative worsening per compared metric")
+    args = parser.parse_args(argv)
+
+    # A cold shared result cache keeps runs comparable across releases.
+    with tempfile.TemporaryDirectory(prefix="opereta-load-") as scratch:
+        os.environ["OPERETA_CACHE_DIR"] = args.cache_dir or scratch
+        report = run_load_test(args)
+
+    latency, cache, memory = report["latency_ms"], report["cache"], report["memory"]
+    print(
+        f"{args.sessions} sessions x {args.reruns} reruns in {report['seconds']:.1f}s "
+        f"({report['reruns_per_second']:.1f} reruns/s)"
+    )
+    if latency:
+        print(
+            f"rerun latency  p50 {latency['p50']:.0f} ms  p95 {latency['p95']:.0f} ms  "
+            f"p99 {latency['p99']:.0f} ms  max {latency['max']:.0f} ms"
+        )
+    for kind, stats in report["latency_ms_by_widget"].items():
+        print(f"  {kind:<14} n={stats['count']:<5} p50 {stats['p50']:.0f} ms  p95 {stats['p95']:.0f} ms")
+    print(
+        f"_get_savings cache  {cache['_get_savings_hits']} hits / {cache['_get_savings_misses']} misses "
+        f"({cache['hit_rate']:.0%})"
+    )
+    print(
+        f"RSS  {memory['rss_before_mib']:.0f} -> {memory['rss_after_mib']:.0f} MiB "
+        f"(peak {memory['rss_peak_mib']:.0f}, growth {memory['growth_mib']:+.0f} MiB)"
+    )
+
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump(report, fh, indent=2)
+    if report["errors"]:
+        print("\nSession errors:", file=sys.stderr)
+        for line in report["errors"]:
+            print(f"  {line}", file=sys.stderr)
+        return 1
+    if args.compare:
+        with open(args.compare, "r") as fh:
+            problems = compare_reports(report, json.load(fh), threshold=args.threshold)
+        if problems:
+            print("\nLoad-test regressions:", file=sys.stderr)
+            for line in problems:
+                print(f"  {line}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,262 @@
+"""benchmarks/suite.py
+Performance regression suite for the calculation engine and the app.
+Each benchmark reports a median time per operation.  Runs are appended to a
+JSON history file, and the suite exits non-zero when any benchmark is slower
+than the median of its recent history on the same machine by more than its
+threshold, so a formula change that slows the nightly scoring job fails CI.
+A run with regressions is not recorded (unless ``--force-record``), so slow
+numbers never become the baseline.
+
+Usage::
+
+    python benchmarks/suite.py                     # run all, compare, record
+    python benchmarks/suite.py --only batch_1m --threshold 0.5
+    python benchmarks/suite.py --no-record --rows 200000
+    python benchmarks/suite.py --force-record      # accept a known slowdown
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+DEFAULT_HISTORY = os.path.join(ROOT, "benchmarks", "history.json")
+DEFAULT_THRESHOLD = 0.25
+# How many previous runs form the baseline (their median, per benchmark).
+BASELINE_RUNS = 5
+
+# Per-benchmark allowed slowdown over baseline; noisier ones get more room.
+THRESHOLDS: Dict[str, float] = {
+    "cache_hit_scaled_impact": 0.50,
+    "app_rerun": 0.50,
+}
+
+
+def _median_time(fn: Callable[[], Any], *, repeat: int, number: int = 1) -> float:
+    """Median seconds per call of *fn* over *repeat* rounds of *number* calls."""
+    fn()  # warm-up: imports, caches, first-touch allocations
+    rounds = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        rounds.append((time.perf_counter() - started) / number)
+    return statistics.median(rounds)
+
+
+def _quiet_streamlit() -> None:
+    # Streamlit sets levels per logger, so the parent level alone is not enough.
+    import logging
+
+    for name in list(logging.root.manager.loggerDict):
+        if name.startswith("streamlit"):
+            logging.getLogger(name).setLevel(logging.ERROR)
+
+
+# ---------- Benchmarks ---------- #
+# Each returns {"seconds": <median per op>, ...extra info}.
+
+
+def bench_single_call(args: argparse.Namespace) -> Dict[str, float]:
+    from calculations import compute_all_savings, tier_inputs
+    from constants import TIER_DATA
+
+    inputs = tier_inputs(TIER_DATA["Mid-Market"])
+    seconds = _median_time(lambda: compute_all_savings(**inputs), repeat=7, number=2000)
+    return {"seconds": seconds}
+
+
+def bench_batch_1m(args: argparse.Namespace) -> Dict[str, float]:
+    import numpy as np
+
+    from batch import compute_all_savings_batch
+
+    rng = np.random.default_rng(0)
+    employees = rng.integers(100, 20_000, args.rows).astype(np.float64)
+    data = {
+        "num_employees": employees,
+        "annual_hires": np.floor(employees * rng.uniform(0.05, 0.2, args.rows)),
+        "avg_annual_salary": rng.uniform(50_000, 120_000, args.rows),
+        "avg_recruiter_salary": rng.uniform(60_000, 90_000, args.rows),
+        "num_recruiters": np.maximum(1.0, np.floor(employees / 500)),
+    }
+    seconds = _median_time(lambda: compute_all_savings_batch(data), repeat=5)
+    return {"seconds": seconds, "rows": args.rows, "rows_per_second": args.rows / seconds}
+
+
+def bench_monte_carlo(args: argparse.Namespace) -> Dict[str, float]:
+    from constants import TIER_DATA
+    from simulation import simulate_tier
+
+    n_samples = 100_000
+    seconds = _median_time(
+        lambda: simulate_tier(TIER_DATA["Mid Enterprise"], n_samples=n_samples, seed=1), repeat=5
+    )
+    return {"seconds": seconds, "samples_per_second": n_samples / seconds}
+
+
+def bench_cache_hit_scaled_impact(args: argparse.Namespace) -> Dict[str, float]:
+    # The app's @st.cache_data key hashes every argument, including the
+    # scaled_impact dict, on each rerun; this times a warm cache hit.
+    import streamlit as st
+
+    from calculations import compute_all_savings, tier_inputs
+    from constants import OPERETA_IMPACT, TIER_DATA
+
+    _quiet_streamlit()  # "no runtime" warnings outside `streamlit run`
+
+    @st.cache_data(show_spinner=False)
+    def cached(inputs: dict, impact: dict):
+        return compute_all_savings(**inputs, impact=impact)
+
+    inputs = tier_inputs(TIER_DATA["Mid-Market"])
+    scaled_impact = {k: v * 1.25 for k, v in OPERETA_IMPACT.items()}
+    seconds = _median_time(lambda: cached(inputs, scaled_impact), repeat=7, number=200)
+    cached.clear()
+    return {"seconds": seconds}
+
+
+def bench_app_rerun(args: argparse.Namespace) -> Dict[str, float]:
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(os.path.join(ROOT, "ROI Calc Investor.py"), default_timeout=120)
+    app.run()
+    _quiet_streamlit()  # loggers are created lazily during the first run
+    if app.exception:
+        raise RuntimeError(f"App raised during benchmark: {app.exception}")
+    seconds = _median_time(app.run, repeat=args.app_reruns)
+    return {"seconds": seconds}
+
+
+BENCHMARKS: Dict[str, Callable[[argparse.Namespace], Dict[str, float]]] = {
+    "single_call": bench_single_call,
+    "batch_1m": bench_batch_1m,
+    "monte_carlo": bench_monte_carlo,
+    "cache_hit_scaled_impact": bench_cache_hit_scaled_impact,
+    "app_rerun": bench_app_rerun,
+}
+
+
+# ---------- History & regression check ---------- #
+
+
+def load_history(path: str) -> List[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return []
+    with open(path, "r") as fh:
+        return json.load(fh)
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def find_regressions(
+    results: Dict[str, Dict[str, float]],
+    history: List[Dict[str, Any]],
+    *,
+    threshold: float | None = None,
+    machine: str | None = None,
+) -> List[str]:
+    """Describe each benchmark slower than its baseline by more than its threshold.
+
+    The baseline is the median of the last :data:`BASELINE_RUNS` recorded
+    runs from *machine* (default: this host) that include the benchmark
+    (same row count for ``batch_1m``).  *threshold* overrides
+    :data:`THRESHOLDS` / :data:`DEFAULT_THRESHOLD`.
+    """
+
+    machine = machine or platform.node()
+    problems = []
+    for name, result in results.items():
+        previous = [
+            run["results"][name]["seconds"]
+            for run in history
+            if run.get("machine") == machine
+            and name in run["results"]
+            and run["results"][name].get("rows") == result.get("rows")
+        ][-BASELINE_RUNS:]
+        if not previous:
+            continue
+        baseline = statistics.median(previous)
+        allowed = threshold if threshold is not None else THRESHOLDS.get(name, DEFAULT_THRESHOLD)
+        if result["seconds"] > baseline * (1 + allowed):
+            problems.append(
+                f"{name}: {result['seconds'] * 1e3:.4g} ms vs baseline {baseline * 1e3:.4g} ms "
+                f"(+{result['seconds'] / baseline - 1:.0%}, allowed +{allowed:.0%})"
+            )
+    return problems
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the ROI engine benchmark suite.")
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="Benchmarks to run (default: all)")
+    parser.add_argument("--history", default=DEFAULT_HISTORY, help="JSON history file")
+    parser.add_argument("--threshold", type=float, help="Allowed slowdown for every benchmark, e.g. 0.25")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Prospects in batch_1m")
+    parser.add_argument("--app-reruns", type=int, default=5)
+    parser.add_argument("--no-record", action="store_true", help="Compare only; do not append to history")
+    parser.add_argument(
+        "--force-record", action="store_true", help="Append to history even when a regression is reported"
+    )
+    args = parser.parse_args(argv)
+
+    # A cold, private result cache keeps app timings independent of whatever
+    # the user's ~/.cache/opereta already holds.
+    results: Dict[str, Dict[str, float]] = {}
+    with tempfile.TemporaryDirectory(prefix="opereta-bench-") as scratch:
+        os.environ["OPERETA_CACHE_DIR"] = scratch
+        for name in args.only or list(BENCHMARKS):
+            results[name] = BENCHMARKS[name](args)
+            extra = "  ".join(f"{k}={v:,.0f}" for k, v in results[name].items() if k != "seconds")
+            print(f"{name:<26} {results[name]['seconds'] * 1e3:12.4f} ms  {extra}")
+
+    history = load_history(args.history)
+    regressions = find_regressions(results, history, threshold=args.threshold)
+
+    if regressions and not args.no_record and not args.force_record:
+        print("Not recording this run: it has regressions (use --force-record to accept them).", file=sys.stderr)
+    if not args.no_record and (args.force_record or not regressions):
+        import numpy as np
+
+        history.append(
+            {
+                "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "commit": _git_commit(),
+                "python": platform.python_version(),
+                "numpy": np.__version__,
+                "machine": platform.node(),
+                "results": results,
+            }
+        )
+        with open(args.history, "w") as fh:
+            json.dump(history, fh, indent=2)
+
+    if regressions:
+        print("\nPerformance regressions:", file=sys.stderr)
+        for line in regressions:
+            print(f"  {line}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,257 @@
+"""citations.py
+Pre-built index from model constants to their research-paragraph sources.
+``python citations.py build`` parses the lifecycle research document once,
+resolving each constant (``AVG_TIME_TO_FILL_DAYS``, every ``OPERETA_IMPACT``
+key, ...) to the byte offsets of the paragraphs that support it, and writes
+``docs/citations.json``.  The app loads that file lazily on the first
+lookup; after that a citation is one dict access and its excerpt one
+``seek``/``read``, so the markdown is never re-parsed at runtime.  The
+index records the document's SHA-256; if the document no longer matches
+(or changes while the app runs) the index is rebuilt in memory, and if
+that fails the tooltips go empty rather than quote the wrong paragraph.
+
+Usage::
+
+    python citations.py build
+    python citations.py check   # exit 1 if the index is stale
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterator, List, Tuple
+
+from docs_cache import DOCUMENTS, HEADING_PATTERN, plain_title
+
+__all__ = [
+    "CITATION_SOURCES",
+    "Citation",
+    "build_index",
+    "citations_for",
+    "excerpt",
+    "tooltip",
+]
+
+_ROOT = os.path.dirname(os.path.abspath(__file__))
+SOURCE_PATH = DOCUMENTS["Research Data by Lifecycle Stage"]
+INDEX_PATH = os.path.join("docs", "citations.json")
+
+# Constant or impact key -> bold lead-ins of the paragraphs citing it.
+CITATION_SOURCES: Dict[str, Tuple[str, ...]] = {
+    # Industry benchmarks
+    "AVG_TIME_TO_FILL_DAYS": ("Lengthy Time-to-Fill",),
+    "AVG_COST_PER_HIRE_SHRM": ("High Cost per Hire",),
+    "AVG_COST_PER_HIRE_SMALL_BIZ": ("High Cost per Hire",),
+    "RECRUITER_INTERVIEW_SCHEDULING_TIME_MAX_HOURS": ("Recruiter Workload & Volume", "Streamlined Scheduling & Coordination"),
+    "AVG_CANDIDATES_PER_OPENING": ("Recruiter Workload & Volume",),
+    "INTERVIEWS_PER_HIRE": ("Inefficient Interview Process",),
+    "AVG_MISHIRE_COST_LOW": ("Direct Financial Losses",),
+    "AVG_MISHIRE_COST_HIGH": ("Direct Financial Losses",),
+    "MISHIRE_COST_PERCENT_OF_SALARY_DOL": ("Direct Financial Losses",),
+    "MANAGERS_TIME_ON_UNDERPERFORMERS_PERCENT": ("Lost Productivity & Team Impact",),
+    "NEW_HIRES_LEAVING_IN_90_DAYS_PERCENT": ("High Turnover/Replacement Costs",),
+    "COST_TO_REPLACE_PERCENT_OF_SALARY": ("High Turnover/Replacement Costs",),
+    "TOP_PERFORMER_PRODUCTIVITY_MULTIPLIER_LOW": ("Higher Performance & Productivity",),
+    "AVG_TIME_TO_PRODUCTIVITY_MONTHS": ("Slow Ramp-Up = Lost Productivity",),
+    "NEW_HIRE_TURNOVER_FIRST_45_DAYS_PERCENT": ("Early Turnover from Poor Onboarding",),
+    "EXTERNAL_HIRE_SALARY_PREMIUM_PERCENT": ("Low Internal Mobility Rates", "Significant Cost Savings on Hires"),
+    "INTERNAL_HIRE_TTF_REDUCTION_DAYS": ("Faster Filling of Critical Roles",),
+    "AVG_MANAGER_HOURS_PERF_REVIEWS_YEAR": ("Ineffective Performance Reviews",),
+    "LABOR_BUDGET_SAVING_WITH_GOOD_SWP_PERCENT": ("Missed Opportunities & Ad hoc Decisions",),
+    "COST_OF_VACANCY_PER_DAY_ESTIMATE_FACTOR": ("Lost Productivity from Delays",),
+    # Current-state baselines
+    "CURRENT_MISHIRE_RATE_PERCENT": ("Prevalence of Bad Hires",),
+    "SHIFT_SHOCK_SHARE_OF_EARLY_LEAVERS_PERCENT": ("“Shift Shock” from Poor Role Definition",),
+    "CURRENT_INTERNAL_FILL_RATE_PERCENT": ("Low Internal Mobility Rates",),
+    "CURRENT_ANNUAL_VOLUNTARY_TURNOVER_PERCENT": ("Retention of Top Talent (and associated savings)",),
+    # Opereta impact assumptions
+    "ttf_total_reduction_percent": ("Faster Time-to-Hire",),
+    "recruiter_total_hours_saved_per_week_per_recruiter": ("Recruiter Efficiency Gains",),
+    "cph_total_reduction_percent": ("Hiring Cost Reduction",),
+    "mishire_rate_reduction_percent": ("Better Match & Reduced Mis-Hires",),
+    "shift_shock_turnover_reduction_percent": ("Precise Role Definitions via AI Insights",),
+    "role_def_manager_time_reduction_percent": ("Precise Role Definitions via AI Insights", "Lost Productivity & Team Impact"),
+    "interview_scheduling_time_reduction_percent": ("Streamlined Scheduling & Coordination",),
+    "interviewer_hours_per_hire_reduction_percent": ("Reduced Interview Load via AI Screening",),
+    "time_to_productivity_reduction_percent": ("Faster Time-to-Productivity",),
+    "onboarding_early_turnover_reduction_percent": ("Higher Retention & Engagement",),
+    "internal_fill_rate_increase_points": ("Significant Cost Savings on Hires",),
+    "internal_mobility_retention_improvement_percent_of_turnover": ("Retention of Top Talent (and associated savings)",),
+    "productivity_gain_from_better_pm_percent_of_payroll_segment": ("Increased Employee Productivity & Engagement",),
+    "turnover_reduction_from_better_pm_percent_of_turnover": ("Reduced Turnover through Growth & Recognition",),
+    "critical_skill_shortage_cost_reduction_percent": ("Proactive Talent Strategy (Cost Avoidance)",),
+    "labor_budget_swp_total_saving_percent": ("Optimized Workforce Size and Mix",),
+}
+
+# "* **Lead-in:** text" (bullets) or "**Lead-in:** text" (closing notes).
+_LEAD = re.compile(r"^(?:[*-]\s+)?\*\*(.+?):?\*\*:?")
+
+
+@dataclass(frozen=True)
+class Citation:
+    """One source paragraph: ``[start, end)`` are UTF-8 byte offsets into the research document."""
+
+    section: str
+    subsection: str
+    lead: str
+    start: int
+    end: int
+
+
+# ---------- Build step ---------- #
+
+
+def _paragraphs(data: bytes) -> Iterator[Citation]:
+    """Lead-in paragraphs of *data*, with the ``##`` / ``###`` headings above them."""
+    section = subsection = ""
+    offset = 0
+    for block in re.split(rb"(\r?\n[ \t]*\r?\n)", data):
+        start, offset = offset, offset + len(block)
+        text = block.decode("utf-8").strip()
+        heading = HEADING_PATTERN.match(text)
+        if heading:
+            level = len(heading.group(1))
+            if level == 2:
+                section, subsection = plain_title(heading.group(2)), ""
+            elif level == 3:
+                subsection = plain_title(heading.group(2))
+            continue
+        lead = _LEAD.match(text)
+        if lead:
+            yield Citation(section, subsection, plain_title(lead.group(1)).rstrip(":"), start, start + len(block))
+
+
+def build_index(data: bytes) -> Dict[str, List[Citation]]:
+    """Resolve :data:`CITATION_SOURCES` against the research document bytes.
+
+    Raises ``KeyError`` if a lead-in is missing or ambiguous, so edits to the
+    document that break a citation fail the build instead of going stale.
+    """
+
+    by_lead: Dict[str, List[Citation]] = {}
+    for paragraph in _paragraphs(data):
+        by_lead.setdefault(paragraph.lead, []).append(paragraph)
+
+    index: Dict[str, List[Citation]] = {}
+    for name, leads in CITATION_SOURCES.items():
+        for lead in leads:
+            found = by_lead.get(lead, [])
+            if len(found) != 1:
+                raise KeyError(f"{name}: {len(found)} paragraphs start with {lead!r} in {SOURCE_PATH}")
+            index.setdefault(name, []).append(found[0])
+    return index
+
+
+def _read_source() -> bytes:
+    with open(os.path.join(_ROOT, SOURCE_PATH), "rb") as fh:
+        return fh.read()
+
+
+def _serialise(data: bytes) -> str:
+    payload = {
+        "source": SOURCE_PATH,
+        "sha256": hashlib.sha256(data).hexdigest(),
+        "citations": {name: [asdict(c) for c in found] for name, found in build_index(data).items()},
+    }
+    return json.dumps(payload, indent=1, ensure_ascii=False) + "\n"
+
+
+# ---------- Lookup ---------- #
+
+_index: Dict[str, Tuple[Citation, ...]] = {}
+_loaded_signature: Tuple[int, int] | None = None  # source (mtime_ns, size) _index matches
+_lock = threading.Lock()
+
+
+def _fresh_index(data: bytes) -> Dict[str, Tuple[Citation, ...]]:
+    """The stored index if it was built from *data*, else one rebuilt from it."""
+    try:
+        with open(os.path.join(_ROOT, INDEX_PATH), "r", encoding="utf-8") as fh:
+            stored = json.load(fh)
+    except (OSError, ValueError):
+        stored = {}
+    if stored.get("sha256") == hashlib.sha256(data).hexdigest():
+        return {name: tuple(Citation(**c) for c in found) for name, found in stored["citations"].items()}
+    try:
+        return {name: tuple(found) for name, found in build_index(data).items()}
+    except KeyError as exc:
+        print(f"citations: {INDEX_PATH} is stale and cannot be rebuilt ({exc}); citations disabled", file=sys.stderr)
+        return {}
+
+
+def _load() -> Dict[str, Tuple[Citation, ...]]:
+    global _index, _loaded_signature
+    stat = os.stat(os.path.join(_ROOT, SOURCE_PATH))
+    signature = (stat.st_mtime_ns, stat.st_size)
+    if signature != _loaded_signature:
+        with _lock:
+            if signature != _loaded_signature:
+                _index = _fresh_index(_read_source())
+                excerpt.cache_clear()
+                _loaded_signature = signature
+    return _index
+
+
+def citations_for(name: str) -> Tuple[Citation, ...]:
+    """Source paragraphs of a constant or impact key (empty if uncited)."""
+    return _load().get(name, ())
+
+
+@functools.lru_cache(maxsize=None)
+def excerpt(citation: Citation) -> str:
+    """Plain text of the cited paragraph, without its lead-in."""
+    with open(os.path.join(_ROOT, SOURCE_PATH), "rb") as fh:
+        fh.seek(citation.start)
+        text = fh.read(citation.end - citation.start).decode("utf-8").strip()
+    text = _LEAD.sub("", text, count=1)
+    return re.sub(r"\\(.)", r"\1", text).replace("**", "").strip()
+
+
+def tooltip(name: str, max_chars: int = 420) -> str:
+    """Markdown source note for *name*, e.g. for a Streamlit ``help=`` tooltip."""
+    notes = []
+    for citation in citations_for(name):
+        text = excerpt(citation)
+        if len(text) > max_chars:
+            text = text[:max_chars].rsplit(" ", 1)[0] + " …"
+        notes.append(f"**{citation.lead}** ({citation.section}): {text}")
+    return "\n\n".join(notes)
+
+
+# ---------- CLI ---------- #
+
+
+def main(argv: List[str] | None = None) -> int:
+    command = (argv if argv is not None else sys.argv[1:]) or ["build"]
+    if command[0] not in ("build", "check"):
+        print("usage: python citations.py [build | check]", file=sys.stderr)
+        return 2
+
+    text = _serialise(_read_source())
+    path = os.path.join(_ROOT, INDEX_PATH)
+    if command[0] == "check":
+        try:
+            with open(path, "r", encoding="utf-8") as fh:
+                current = fh.read()
+        except FileNotFoundError:
+            current = ""
+        if current != text:
+            print(f"{INDEX_PATH} is out of date; run: python citations.py build", file=sys.stderr)
+            return 1
+        return 0
+
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write(text)
+    print(f"Wrote {INDEX_PATH} ({len(CITATION_SOURCES)} names)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,172 @@
+"""compiled_model.py
+The savings model compiled to a coefficient matrix.
+Every constant sub-product in :mod:`model_terms` (impact keys, research
+baselines, unit conversions) is folded once into a coefficient, leaving each
+line item as ``coefficients @ monomials(inputs)`` over six input monomials.
+Evaluating a prospect is a handful of multiply-adds, and the closed form
+makes inverse questions (price for a target ROI, break-even scenario
+multiplier) direct formulas instead of searches.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Mapping, Tuple
+
+import numpy as np
+
+from batch import BASELINE_CONSTANTS, INPUT_COLUMNS, TOTAL_COLUMN
+from calculations import LINE_ITEMS
+from constants import OPERETA_IMPACT
+from model_terms import SAVINGS_TERMS, SIZE_FLAGS
+
+__all__ = [
+    "CompiledModel",
+]
+
+_INPUT_FACTORS = frozenset(INPUT_COLUMNS) | frozenset(SIZE_FLAGS)
+
+
+class CompiledModel:
+    """Savings model with all constants pre-multiplied into coefficients.
+
+    Parameters
+    ----------
+    impact:
+        Impact dict to compile in (default ``OPERETA_IMPACT``).
+    baseline:
+        Partial overrides of :data:`batch.BASELINE_CONSTANTS`.
+
+    Attributes
+    ----------
+    monomials:
+        Input factor tuples, e.g. ``("annual_hires", "avg_annual_salary")``.
+    coefficients:
+        ``(len(LINE_ITEMS), len(monomials))`` matrix; row *i* dotted with the
+        monomial values gives line item *i*.
+    total_coefficients:
+        Column sums of :attr:`coefficients` – the total in one dot product.
+    """
+
+    def __init__(
+        self,
+        impact: Mapping[str, float] | None = None,
+        baseline: Mapping[str, float] | None = None,
+    ) -> None:
+        self.impact: Dict[str, float] = dict(impact or OPERETA_IMPACT)
+        constants = {**self.impact, **BASELINE_CONSTANTS, **(baseline or {})}
+
+        monomials: List[Tuple[str, ...]] = []
+        rows: List[Dict[int, float]] = []
+        for key, _category, _area in LINE_ITEMS:
+            row: Dict[int, float] = {}
+            for coefficient, factors in SAVINGS_TERMS[key]:
+                impact_factors = [f for f in factors if f in self.impact]
+                if len(impact_factors) != 1:
+                    # Inversion relies on every term scaling linearly with
+                    # exactly one impact key.
+                    raise ValueError(
+                        f"{key}: term must contain exactly one impact key, got {impact_factors}"
+                    )
+                monomial = tuple(sorted(f for f in factors if f in _INPUT_FACTORS))
+                for name in factors:
+                    if name not in _INPUT_FACTORS:
+                        coefficient *= constants[name]
+                if monomial not in monomials:
+                    monomials.append(monomial)
+                index = monomials.index(monomial)
+                row[index] = row.get(index, 0.0) + coefficient
+            rows.append(row)
+
+        self.monomials: Tuple[Tuple[str, ...], ...] = tuple(monomials)
+        self.coefficients = np.zeros((len(rows), len(monomials)), dtype=np.float64)
+        for i, row in enumerate(rows):
+            for j, value in row.items():
+                self.coefficients[i, j] = value
+        self.total_coefficients = self.coefficients.sum(axis=0)
+        # Sparse view: most line items touch a single monomial.
+        self._row_terms = tuple(tuple(sorted(row.items())) for row in rows)
+        self._total_terms = tuple(zip(self.total_coefficients.tolist(), self.monomials))
+
+    # ---------- Evaluation ---------- #
+
+    @staticmethod
+    def _factor_values(inputs: Mapping[str, Any]) -> Dict[str, Any]:
+        large = (inputs["num_employees"] >= 500) * 1.0
+        values = {name: inputs[name] for name in INPUT_COLUMNS}
+        values[SIZE_FLAGS[0]] = large
+        values[SIZE_FLAGS[1]] = 1.0 - large
+        return values
+
+    def total(self, **inputs: Any) -> Any:
+        """Total annual savings for scalar (or same-shape array) inputs."""
+        values = self._factor_values(inputs)
+        total = 0.0
+        for coefficient, monomial in self._total_terms:
+            term = coefficient
+            for name in monomial:
+                term = term * values[name]
+            total = total + term
+        return total
+
+    def evaluate_batch(
+        self, data: Mapping[str, Any] | None = None, **columns: Any
+    ) -> Dict[str, np.ndarray]:
+        """Line items and total for many prospects (layout of :mod:`batch`)."""
+        data = data if data is not None else {}
+        missing = [n for n in INPUT_COLUMNS if n not in columns and n not in data]
+        if missing:
+            raise KeyError(f"Missing batch input columns: {missing}")
+        arrays = np.broadcast_arrays(
+            *(
+                np.atleast_1d(np.asarray(columns[n] if n in columns else data[n], dtype=np.float64))
+                for n in INPUT_COLUMNS
+            )
+        )
+        values = self._factor_values(dict(zip(INPUT_COLUMNS, arrays)))
+        # One 1-D array per monomial (a stacked 2-D basis would be a single
+        # large allocation the allocator cannot recycle between calls).
+        basis = []
+        for monomial in self.monomials:
+            product = values[monomial[0]]
+            for name in monomial[1:]:
+                product = product * values[name]
+            basis.append(product)
+        result: Dict[str, np.ndarray] = {}
+        for (key, _category, _area), row_terms in zip(LINE_ITEMS, self._row_terms):
+            amount = np.zeros(arrays[0].shape, dtype=np.float64)
+            for j, coefficient in row_terms:
+                amount += coefficient * basis[j]
+            result[key] = amount
+        total = np.zeros(arrays[0].shape, dtype=np.float64)
+        for j, coefficient in enumerate(self.total_coefficients):
+            total += coefficient * basis[j]
+        result[TOTAL_COLUMN] = total
+        return result
+
+    # ---------- Inverse questions ---------- #
+
+    def price_for_target_roi(self, target_roi_percent: Any, **inputs: Any) -> Any:
+        """Highest annual price that still yields *target_roi_percent*.
+
+        ROI = (S - P) / P × 100, so P = S / (1 + ROI / 100).
+        """
+        return self.total(**inputs) / (1 + np.asarray(target_roi_percent) / 100)
+
+    def multiplier_for_target_roi(
+        self, target_roi_percent: Any, annual_price: Any, **inputs: Any
+    ) -> Any:
+        """Scenario multiplier on every impact key that yields the target ROI.
+
+        Each term carries exactly one impact key, so savings scale linearly:
+        S(m) = m × S(1) and m = P × (1 + ROI / 100) / S(1).
+        """
+        with np.errstate(divide="ignore"):
+            return (
+                np.asarray(annual_price, dtype=np.float64)
+                * (1 + np.asarray(target_roi_percent) / 100)
+                / self.total(**inputs)
+            )
+
+    def break_even_multiplier(self, annual_price: Any, **inputs: Any) -> Any:
+        """Scenario multiplier at which savings exactly cover the price."""
+        return self.multiplier_for_target_roi(0.0, annual_price, **inputs)
@@ -31,6 +31,15 @@ AVG_MANAGER_HOURS_PERF_REVIEWS_YEAR = 210  # Gartner
 LABOR_BUDGET_SAVING_WITH_GOOD_SWP_PERCENT = 0.05  # Gartner
 COST_OF_VACANCY_PER_DAY_ESTIMATE_FACTOR = 1.5  # Internal (conservative)
 
+# ---------------------------
+# Current-State Baselines (pre-Opereta)
+# ---------------------------
+
+CURRENT_MISHIRE_RATE_PERCENT = 0.15  # CareerBuilder
+SHIFT_SHOCK_SHARE_OF_EARLY_LEAVERS_PERCENT = 0.43  # Mismatched expectations
+CURRENT_INTERNAL_FILL_RATE_PERCENT = 0.24  # Baseline from research
+CURRENT_ANNUAL_VOLUNTARY_TURNOVER_PERCENT = 0.12  # Industry average
+
 # ---------------------------
 # Opereta Assumed Impact Values (Full Vision)
 # ---------------------------
@@ -103,4 +112,13 @@ TIER_DATA = {
         "target_value_range": "$10M - $12M",
         "target_roi_percent": "~1000%+",
     },
-} 
\ No newline at end of file
+}
+
+# ---------------------------
+# Assumption Scenarios (multiplier applied to every OPERETA_IMPACT value)
+# ---------------------------
+SCENARIOS = {
+    "Conservative (50% Impact)": 0.5,
+    "Base (100% Impact)": 1.0,
+    "Aggressive (125% Impact)": 1.25,
+}
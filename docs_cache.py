@@ -0,0 +1,126 @@
+"""docs_cache.py
+Process-wide cache of the markdown reference documents.
+Each file is read and split into its ``##`` sections once, then served from
+memory to every session until its mtime (or size) changes on disk, so the
+app only renders the section being viewed instead of re-reading and
+re-rendering the whole document on each rerun.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import threading
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+__all__ = [
+    "DOCUMENTS",
+    "DocSection",
+    "Document",
+    "HEADING_PATTERN",
+    "load_document",
+    "plain_title",
+    "split_sections",
+]
+
+_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Display label -> path relative to the repository root.
+DOCUMENTS: Dict[str, str] = {
+    "Value Generation Framework": os.path.join("docs", "value_generation_framework.md"),
+    "Research Data by Lifecycle Stage": "Opereta Talent Intelligence ROI – Data by Employee Lifecycle Stage.md",
+}
+
+HEADING_PATTERN = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_FENCE = re.compile(r"^\s*(```|~~~)")
+
+
+@dataclass(frozen=True)
+class DocSection:
+    """One ``##`` section (or the preamble before the first one)."""
+
+    title: str
+    body: str
+
+
+@dataclass(frozen=True)
+class Document:
+    path: str
+    mtime_ns: int
+    size: int
+    title: str
+    sections: Tuple[DocSection, ...]
+
+    @property
+    def titles(self) -> Tuple[str, ...]:
+        return tuple(section.title for section in self.sections)
+
+    def section(self, title: str) -> DocSection:
+        for section in self.sections:
+            if section.title == title:
+                return section
+        raise KeyError(f"{title!r} is not a section of {self.path}")
+
+
+def plain_title(raw: str) -> str:
+    """Heading text without markdown escapes and bold markers."""
+    # Headings in the research export look like "**1\. Hiring Inefficiency**".
+    return re.sub(r"\\(.)", r"\1", raw).replace("**", "").strip()
+
+
+def split_sections(text: str, level: int = 2) -> Tuple[str, Tuple[DocSection, ...]]:
+    """Return ``(document title, sections)`` split at headings of *level*.
+
+    Text before the first such heading becomes an "Overview" section when it
+    holds anything besides the title.  Headings inside code fences are
+    ignored.
+    """
+
+    title = ""
+    sections = []
+    current_title, current_lines = "Overview", []
+    in_fence = False
+    for line in text.splitlines():
+        if _FENCE.match(line):
+            in_fence = not in_fence
+        match = None if in_fence else HEADING_PATTERN.match(line)
+        if match and len(match.group(1)) == 1 and not title:
+            title = plain_title(match.group(2))
+            continue
+        if match and len(match.group(1)) == level:
+            if "".join(current_lines).strip():
+                sections.append(DocSection(current_title, "\n".join(current_lines).strip("\n")))
+            current_title, current_lines = plain_title(match.group(2)), []
+            continue
+        current_lines.append(line)
+    if "".join(current_lines).strip():
+        sections.append(DocSection(current_title, "\n".join(current_lines).strip("\n")))
+    return title, tuple(sections)
+
+
+_cache: Dict[str, Document] = {}
+_lock = threading.Lock()
+
+
+def load_document(path: str) -> Document:
+    """Parsed *path* (relative to the repository root), re-read only when it changes.
+
+    Raises ``FileNotFoundError`` if the file is missing.
+    """
+
+    full_path = os.path.join(_ROOT, path)
+    stat = os.stat(full_path)
+    cached = _cache.get(full_path)
+    if cached is not None and (cached.mtime_ns, cached.size) == (stat.st_mtime_ns, stat.st_size):
+        return cached
+
+    with _lock:
+        cached = _cache.get(full_path)
+        if cached is not None and (cached.mtime_ns, cached.size) == (stat.st_mtime_ns, stat.st_size):
+            return cached
+        with open(full_path, "r", encoding="utf-8") as fh:
+            title, sections = split_sections(fh.read())
+        document = Document(path, stat.st_mtime_ns, stat.st_size, title, sections)
+        _cache[full_path] = document
+        return document
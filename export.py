@@ -0,0 +1,445 @@
+"""export.py
+Parallel batch export of per-account ROI reports (PPTX, PDF, HTML).
+Accounts are scored in one vectorised pass; each worker process then
+loads the deck and HTML templates once in its pool initializer and renders
+chunks of accounts from them, with a category-savings chart drawn as a
+native PowerPoint chart or an inline SVG.  Finished files are written
+atomically and recorded in a streamed ``manifest.jsonl``, so re-running an
+interrupted export resumes where it stopped.
+
+Usage::
+
+    python export.py accounts.csv out_dir --format pptx pdf --workers 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import html
+import io
+import json
+import os
+import re
+import string
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Sequence, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from batch import TOTAL_COLUMN
+from results import AREAS, CATEGORIES, CATEGORY_CODES, KEYS, SavingsResult
+from scoring import PRICE_COLUMN, iter_prospect_chunks, score_frame
+
+__all__ = [
+    "bar_chart_svg",
+    "build_reports",
+    "run_export",
+]
+
+MANIFEST_NAME = "manifest.jsonl"
+FORMATS = ("pptx", "pdf", "html")
+NAME_COLUMN = "account"
+DEFAULT_HTML_TEMPLATE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates", "roi_report.html")
+CHART_TOKEN = "{{chart}}"
+PDF_OPTIONS = {"page-size": "A4", "encoding": "UTF-8", "quiet": ""}
+
+
+# ---------- Report payloads ---------- #
+
+
+def _slug(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9]+", "-", name).strip("-").lower() or "account"
+
+
+def _money(value: float) -> str:
+    return f"${value:,.0f}"
+
+
+def build_reports(
+    frame: pd.DataFrame,
+    *,
+    name_column: str = NAME_COLUMN,
+    price_column: str = PRICE_COLUMN,
+    date: str | None = None,
+) -> List[Dict[str, Any]]:
+    """Score *frame* and return one picklable report payload per row.
+
+    Payloads hold display-ready fields (the ``$name`` / ``{{name}}``
+    template placeholders), per-category amounts for the chart and the
+    line items for the table.  Rows without a *name_column* value are
+    named ``account-00001`` and so on; file stems are unique slugs.
+    """
+
+    scored = score_frame(frame, price_column=price_column, line_items=True)
+    result = SavingsResult(scored[list(KEYS)].to_numpy(dtype=np.float64))
+    categories = result.category_totals()
+    date = date or datetime.date.today().isoformat()
+
+    if name_column in scored.columns:
+        names = scored[name_column].astype(str).tolist()
+    else:
+        names = [f"account-{i + 1:05d}" for i in range(len(scored))]
+
+    reports: List[Dict[str, Any]] = []
+    taken: Set[str] = set()
+    suffixes: Dict[str, int] = {}
+    for row, name in enumerate(names):
+        slug = stem = _slug(name)
+        while stem in taken:  # "Acme" twice must not land on an actual "Acme 2"
+            suffixes[slug] = suffixes.get(slug, 1) + 1
+            stem = f"{slug}-{suffixes[slug]}"
+        taken.add(stem)
+        roi = float(scored["roi_percent"].iat[row])
+        payback = float(scored["payback_months"].iat[row])
+        reports.append({
+            "stem": stem,
+            "fields": {
+                "account": name,
+                "date": date,
+                "employees": f"{scored['num_employees'].iat[row]:,.0f}",
+                "annual_hires": f"{scored['annual_hires'].iat[row]:,.0f}",
+                "total_savings": _money(scored[TOTAL_COLUMN].iat[row]),
+                "annual_price": _money(scored[price_column].iat[row]),
+                "roi_percent": f"{roi:,.0f}%" if np.isfinite(roi) else "N/A",
+                "payback_months": f"{payback:.1f} months" if np.isfinite(payback) else "N/A",
+            },
+            "total_savings": float(scored[TOTAL_COLUMN].iat[row]),
+            "categories": [float(v) for v in categories[row]],
+            "line_items": [float(v) for v in result.amounts[row]],
+        })
+    return reports
+
+
+def bar_chart_svg(labels: Sequence[str], values: Sequence[float], *, width: int = 680) -> str:
+    """Horizontal bar chart as an inline SVG string (no plotting dependency)."""
+    label_width, value_width, bar_height, gap = 250, 90, 22, 8
+    top = max(max(values, default=0.0), 1.0)
+    plot_width = width - label_width - value_width
+    rows = []
+    for i, (label, value) in enumerate(zip(labels, values)):
+        y = i * (bar_height + gap)
+        bar = max(value, 0.0) / top * plot_width
+        rows.append(
+            f'<text x="{label_width - 8}" y="{y + 15}" text-anchor="end">{html.escape(label)}</text>'
+            f'<rect x="{label_width}" y="{y}" width="{bar:.1f}" height="{bar_height}" fill="#0e5394"/>'
+            f'<text x="{label_width + bar + 6:.1f}" y="{y + 15}">{_money(value)}</text>'
+        )
+    height = len(rows) * (bar_height + gap)
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'font-family="Helvetica, Arial, sans-serif" font-size="12" fill="#263238">{"".join(rows)}</svg>'
+    )
+
+
+# ---------- Worker side ---------- #
+
+# Parsed templates, loaded once per worker process by :func:`_init_worker`.
+_TEMPLATES: Dict[str, Any] = {}
+
+
+def _default_pptx_template() -> bytes:
+    """A three-slide deck (title, summary, chart) using ``{{name}}`` placeholders."""
+    from pptx import Presentation
+    from pptx.util import Inches
+
+    prs = Presentation()
+    title = prs.slides.add_slide(prs.slide_layouts[0])
+    title.shapes.title.text = "{{account}}"
+    title.placeholders[1].text = "Opereta ROI Assessment · {{date}}"
+
+    summary = prs.slides.add_slide(prs.slide_layouts[1])
+    summary.shapes.title.text = "Projected Annual ROI"
+    body = summary.placeholders[1].text_frame
+    body.text = "Total annual value: {{total_savings}}"
+    for line in (
+        "Opereta annual price: {{annual_price}}",
+        "Customer ROI: {{roi_percent}}",
+        "Payback period: {{payback_months}}",
+        "{{employees}} employees · {{annual_hires}} annual hires",
+    ):
+        body.add_paragraph().text = line
+
+    chart = prs.slides.add_slide(prs.slide_layouts[5])
+    chart.shapes.title.text = "Savings by Category"
+    chart.shapes.add_textbox(Inches(0.5), Inches(1.5), Inches(9), Inches(5.5)).text_frame.text = CHART_TOKEN
+
+    buffer = io.BytesIO()
+    prs.save(buffer)
+    return buffer.getvalue()
+
+
+def _pptx_placeholders(data: bytes) -> List[Tuple[int, int]]:
+    """``(slide, shape)`` indices of text shapes containing ``{{...}}``."""
+    from pptx import Presentation
+
+    found = []
+    for s, slide in enumerate(Presentation(io.BytesIO(data)).slides):
+        for i, shape in enumerate(slide.shapes):
+            if shape.has_text_frame and "{{" in shape.text_frame.text:
+                found.append((s, i))
+    return found
+
+
+def _init_worker(formats: Sequence[str], pptx_template: str | None, html_template: str, wkhtmltopdf: str | None) -> None:
+    _TEMPLATES.clear()
+    if "pptx" in formats:
+        if pptx_template is None:
+            data = _default_pptx_template()
+        else:
+            with open(pptx_template, "rb") as fh:
+                data = fh.read()
+        _TEMPLATES["pptx"] = (data, _pptx_placeholders(data))
+    if "html" in formats or "pdf" in formats:
+        with open(html_template, "r", encoding="utf-8") as fh:
+            _TEMPLATES["html"] = string.Template(fh.read())
+    if "pdf" in formats:
+        import pdfkit
+
+        _TEMPLATES["pdf"] = pdfkit.configuration(wkhtmltopdf=wkhtmltopdf or "")
+
+
+def _replace_tokens(text_frame: Any, fields: Dict[str, str]) -> None:
+    for paragraph in text_frame.paragraphs:
+        runs = paragraph.runs
+        text = "".join(run.text for run in runs)
+        if "{{" not in text:
+            continue
+        for name, value in fields.items():
+            text = text.replace("{{" + name + "}}", value)
+        # Tokens may be split across runs; keep the first run's formatting.
+        runs[0].text = text
+        for run in runs[1:]:
+            run.text = ""
+
+
+def _add_category_chart(slide: Any, placeholder: Any, report: Dict[str, Any]) -> None:
+    from pptx.chart.data import CategoryChartData
+    from pptx.enum.chart import XL_CHART_TYPE
+
+    data = CategoryChartData()
+    data.categories = CATEGORIES
+    data.add_series("Annual savings", report["categories"])
+    chart = slide.shapes.add_chart(
+        XL_CHART_TYPE.BAR_CLUSTERED, placeholder.left, placeholder.top, placeholder.width, placeholder.height, data
+    ).chart
+    chart.has_legend = False
+    plot = chart.plots[0]
+    plot.has_data_labels = True
+    plot.data_labels.number_format = "$#,##0"
+    plot.data_labels.number_format_is_linked = False
+    placeholder._element.getparent().remove(placeholder._element)
+
+
+def _render_pptx(report: Dict[str, Any], path: str) -> None:
+    from pptx import Presentation
+
+    data, placeholders = _TEMPLATES["pptx"]
+    prs = Presentation(io.BytesIO(data))
+    slides = prs.slides
+    shapes = [(slides[s], slides[s].shapes[i]) for s, i in placeholders]  # before charts shift indices
+    for slide, shape in shapes:
+        if shape.text_frame.text.strip() == CHART_TOKEN:
+            _add_category_chart(slide, shape, report)
+        else:
+            _replace_tokens(shape.text_frame, report["fields"])
+    prs.save(path)
+
+
+def _render_html(report: Dict[str, Any]) -> str:
+    rows = "\n".join(
+        f'        <tr><td>{html.escape(CATEGORIES[code])}</td><td>{html.escape(area)}</td>'
+        f'<td class="amount">{amount:,.0f}</td></tr>'
+        for code, area, amount in zip(CATEGORY_CODES, AREAS, report["line_items"])
+    )
+    return _TEMPLATES["html"].safe_substitute(
+        {name: html.escape(value) for name, value in report["fields"].items()},
+        chart_svg=bar_chart_svg(CATEGORIES, report["categories"]),
+        line_item_rows=rows,
+    )
+
+
+def _write_atomic(path: str, write: Callable[[str], None]) -> None:
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)  # a report either exists whole or not at all
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _render_report(report: Dict[str, Any], out_dir: str, formats: Sequence[str]) -> List[str]:
+    files = []
+    page = _render_html(report) if ("html" in formats or "pdf" in formats) else ""
+    for fmt in formats:
+        name = f"{report['stem']}.{fmt}"
+        path = os.path.join(out_dir, name)
+        if fmt == "pptx":
+            _write_atomic(path, lambda tmp: _render_pptx(report, tmp))
+        elif fmt == "html":
+
+            def write_html(tmp: str) -> None:
+                with open(tmp, "w", encoding="utf-8") as fh:
+                    fh.write(page)
+
+            _write_atomic(path, write_html)
+        else:
+            import pdfkit
+
+            _write_atomic(
+                path,
+                lambda tmp: pdfkit.from_string(page, tmp, options=PDF_OPTIONS, configuration=_TEMPLATES["pdf"]),
+            )
+        files.append(name)
+    return files
+
+
+def _render_chunk(reports: List[Dict[str, Any]], out_dir: str, formats: Sequence[str]) -> List[Dict[str, Any]]:
+    """Render a chunk of accounts; one failing account does not sink the rest."""
+    entries = []
+    for report in reports:
+        entry: Dict[str, Any] = {
+            "account": report["fields"]["account"],
+            "stem": report["stem"],
+            "total_savings": report["total_savings"],
+        }
+        try:
+            entry.update(files=_render_report(report, out_dir, formats), status="ok")
+        except Exception as exc:  # noqa: BLE001 - recorded in the manifest
+            entry.update(files=[], status="error", error=f"{type(exc).__name__}: {exc}")
+        entries.append(entry)
+    return entries
+
+
+# ---------- Driver ---------- #
+
+
+def _check_dependencies(formats: Sequence[str], wkhtmltopdf: str | None) -> None:
+    if "pptx" in formats:
+        try:
+            import pptx  # noqa: F401
+        except ImportError as exc:
+            raise ImportError("PPTX export requires the 'python-pptx' package.") from exc
+    if "pdf" in formats:
+        try:
+            import pdfkit
+        except ImportError as exc:
+            raise ImportError("PDF export requires the 'pdfkit' package and wkhtmltopdf.") from exc
+        pdfkit.configuration(wkhtmltopdf=wkhtmltopdf or "")  # raises OSError if wkhtmltopdf is missing
+
+
+def _print_progress(done: int, total: int, elapsed: float) -> None:
+    rate = done / elapsed if elapsed > 0 else 0.0
+    print(
+        f"\r{done:,}/{total:,} accounts ({done / total:.0%}) – {rate:,.1f} accounts/s",
+        end="",
+        file=sys.stderr,
+        flush=True,
+    )
+
+
+def run_export(
+    in_path: str,
+    out_dir: str,
+    *,
+    formats: Sequence[str] = ("pptx",),
+    name_column: str = NAME_COLUMN,
+    price_column: str = PRICE_COLUMN,
+    pptx_template: str | None = None,
+    html_template: str = DEFAULT_HTML_TEMPLATE,
+    wkhtmltopdf: str | None = None,
+    workers: int | None = None,
+    chunk_size: int = 25,
+    progress: Callable[[int, int, float], None] | None = _print_progress,
+) -> Dict[str, Any]:
+    """Render (or resume rendering) one report per account of *in_path* into *out_dir*.
+
+    Accounts whose files all exist are skipped.  Every rendered account is
+    appended to ``manifest.jsonl`` as soon as its chunk finishes; failures
+    are recorded there with their error instead of aborting the run.
+    *progress* receives ``(accounts done, accounts to do, seconds)`` for
+    this run only, so skipped accounts do not inflate the rate.
+    """
+
+    formats = tuple(dict.fromkeys(formats))
+    unknown = [fmt for fmt in formats if fmt not in FORMATS]
+    if unknown or not formats:
+        raise ValueError(f"formats must be drawn from {FORMATS}, got {list(formats)}")
+    _check_dependencies(formats, wkhtmltopdf)
+
+    frame = pd.concat(iter_prospect_chunks(in_path, 100_000), ignore_index=True)
+    reports = build_reports(frame, name_column=name_column, price_column=price_column)
+
+    os.makedirs(out_dir, exist_ok=True)
+    pending = [
+        r for r in reports
+        if not all(os.path.exists(os.path.join(out_dir, f"{r['stem']}.{fmt}")) for fmt in formats)
+    ]
+    counts = {"accounts": len(reports), "skipped": len(reports) - len(pending), "rendered": 0, "failed": 0}
+
+    started = time.perf_counter()
+    done = 0
+    with open(os.path.join(out_dir, MANIFEST_NAME), "a", encoding="utf-8") as manifest, ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(formats, pptx_template, html_template, wkhtmltopdf),
+    ) as pool:
+        futures = [
+            pool.submit(_render_chunk, pending[i:i + chunk_size], out_dir, formats)
+            for i in range(0, len(pending), chunk_size)
+        ]
+        for future in as_completed(futures):
+            entries = future.result()
+            for entry in entries:
+                manifest.write(json.dumps(entry) + "\n")
+                counts["rendered" if entry["status"] == "ok" else "failed"] += 1
+            manifest.flush()
+            done += len(entries)
+            if progress is not None:
+                progress(done, len(pending), time.perf_counter() - started)
+    if progress is _print_progress and pending:
+        print(file=sys.stderr)
+
+    return {**counts, "formats": list(formats), "seconds": time.perf_counter() - started}
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Render one ROI report per account in parallel.")
+    parser.add_argument("input", help="Accounts CSV/Parquet (scoring.py input columns plus an account name)")
+    parser.add_argument("out_dir", help="Output directory (re-run to resume)")
+    parser.add_argument("--format", dest="formats", nargs="+", choices=FORMATS, default=["pptx"])
+    parser.add_argument("--name-column", default=NAME_COLUMN)
+    parser.add_argument("--price-column", default=PRICE_COLUMN)
+    parser.add_argument("--pptx-template", default=None, help="Deck with {{name}} placeholders and a {{chart}} box")
+    parser.add_argument("--html-template", default=DEFAULT_HTML_TEMPLATE, help="HTML with $name placeholders")
+    parser.add_argument("--wkhtmltopdf", default=None, help="Path to the wkhtmltopdf binary (default: on PATH)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=25, help="Accounts per worker task")
+    args = parser.parse_args(argv)
+
+    stats = run_export(
+        args.input,
+        args.out_dir,
+        formats=args.formats,
+        name_column=args.name_column,
+        price_column=args.price_column,
+        pptx_template=args.pptx_template,
+        html_template=args.html_template,
+        wkhtmltopdf=args.wkhtmltopdf,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+    )
+    print(
+        f"Rendered {stats['rendered']:,} accounts ({stats['skipped']:,} already done, "
+        f"{stats['failed']:,} failed) in {stats['seconds']:.1f}s",
+        file=sys.stderr,
+    )
+    return 1 if stats["failed"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,760 @@
+"""formulas.py
+Declarative registry of the savings formulas.
+Every line item is declared once, as an expression over named parameters
+(prospect inputs, ``OPERETA_IMPACT`` keys and research baselines from
+``constants.py``).  The declarations are compiled into the scalar engine
+behind ``compute_all_savings``, the fused NumPy kernels of :mod:`batch`,
+the sum-of-products terms of :mod:`model_terms` and the formula text shown
+in the app and in ``docs/value_generation_framework.md``, so a new line item
+is fast in every engine and documented the moment it is declared.
+
+Declarations follow the original arithmetic operation-for-operation, so the
+generated engines reproduce the hand-written ones bit for bit.  Importing
+this module does not import NumPy; batch kernels are compiled on first use.
+
+Usage::
+
+    python formulas.py docs            # rewrite the generated docs section
+    python formulas.py docs --check    # exit 1 if the docs are out of date
+    python formulas.py source          # print the generated engine code
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from dataclasses import dataclass
+from fractions import Fraction
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet, Iterator, List, Tuple
+
+import constants
+from constants import OPERETA_IMPACT
+
+__all__ = [
+    "INPUTS",
+    "LABELS",
+    "REGISTRY",
+    "SIZE_FLAGS",
+    "LineItem",
+    "baselines",
+    "category_markdown",
+    "compile_numpy",
+    "expand_terms",
+    "render",
+    "scalar_kernel",
+]
+
+# Per-prospect inputs (keyword arguments of ``compute_all_savings``).
+INPUTS: Tuple[str, ...] = (
+    "num_employees",
+    "annual_hires",
+    "avg_annual_salary",
+    "avg_recruiter_salary",
+    "num_recruiters",
+)
+
+# Display label and unit of every parameter the formulas read.
+LABELS: Dict[str, Tuple[str, str]] = {
+    "num_employees": ("Employees", ""),
+    "annual_hires": ("Annual hires", ""),
+    "avg_annual_salary": ("Avg salary", "$"),
+    "avg_recruiter_salary": ("Recruiter salary", "$"),
+    "num_recruiters": ("Recruiters", ""),
+    "ttf_total_reduction_percent": ("Time-to-fill reduction", "%"),
+    "recruiter_total_hours_saved_per_week_per_recruiter": ("Hours saved per recruiter-week", "h"),
+    "cph_total_reduction_percent": ("Cost-per-hire reduction", "%"),
+    "mishire_rate_reduction_percent": ("Mis-hire reduction", "%"),
+    "shift_shock_turnover_reduction_percent": ("Shift-shock reduction", "%"),
+    "interview_scheduling_time_reduction_percent": ("Scheduling time reduction", "%"),
+    "time_to_productivity_reduction_percent": ("Time-to-productivity reduction", "%"),
+    "internal_fill_rate_increase_points": ("Internal fill rate increase", "%"),
+    "productivity_gain_from_better_pm_percent_of_payroll_segment": ("PM productivity gain", "%"),
+    "turnover_reduction_from_better_pm_percent_of_turnover": ("PM turnover reduction", "%"),
+    "labor_budget_swp_total_saving_percent": ("Labor budget saving", "%"),
+    "AVG_TIME_TO_FILL_DAYS": ("Avg time-to-fill", "days"),
+    "COST_OF_VACANCY_PER_DAY_ESTIMATE_FACTOR": ("Vacancy cost factor", "×"),
+    "AVG_COST_PER_HIRE_SHRM": ("SHRM cost-per-hire", "$"),
+    "AVG_COST_PER_HIRE_SMALL_BIZ": ("Small-business cost-per-hire", "$"),
+    "CURRENT_MISHIRE_RATE_PERCENT": ("Mis-hire rate", "%"),
+    "MISHIRE_COST_PERCENT_OF_SALARY_DOL": ("Mis-hire cost (US DoL)", "%"),
+    "NEW_HIRES_LEAVING_IN_90_DAYS_PERCENT": ("Hires leaving within 90 days", "%"),
+    "SHIFT_SHOCK_SHARE_OF_EARLY_LEAVERS_PERCENT": ("Shift-shock share of early leavers", "%"),
+    "COST_TO_REPLACE_PERCENT_OF_SALARY": ("Replacement cost share of salary", "%"),
+    "INTERVIEWS_PER_HIRE": ("Interviews per hire", ""),
+    "RECRUITER_AVG_HOURLY_RATE": ("Recruiter hourly rate", "$"),
+    "AVG_TIME_TO_PRODUCTIVITY_MONTHS": ("Time to productivity", "months"),
+    "CURRENT_INTERNAL_FILL_RATE_PERCENT": ("Internal fill rate", "%"),
+    "EXTERNAL_HIRE_SALARY_PREMIUM_PERCENT": ("External hire salary premium", "%"),
+    "CURRENT_ANNUAL_VOLUNTARY_TURNOVER_PERCENT": ("Voluntary turnover", "%"),
+}
+
+
+def _kind(name: str) -> str:
+    if name in INPUTS:
+        return "input"
+    if name in OPERETA_IMPACT:
+        return "impact"
+    if hasattr(constants, name):
+        return "baseline"
+    raise AttributeError(f"Unknown model parameter: {name!r}")
+
+
+def format_value(value: float, unit: str) -> str:
+    """``0.3, "%"`` -> ``"30 %"``, ``4700, "$"`` -> ``"$4,700"``."""
+    if unit == "%":
+        return f"{value * 100:g} %"
+    if unit == "$":
+        return f"${value:,g}"
+    if unit == "×":
+        return f"{value:g}×"
+    return f"{value:,g} {unit}".rstrip()
+
+
+# ---------- Expression nodes ---------- #
+
+
+class Expr:
+    """Base node; arithmetic operators build :class:`BinOp` trees."""
+
+    __slots__ = ()
+
+    def __add__(self, other: Any) -> "BinOp":
+        return BinOp("+", self, _lift(other))
+
+    def __radd__(self, other: Any) -> "BinOp":
+        return BinOp("+", _lift(other), self)
+
+    def __sub__(self, other: Any) -> "BinOp":
+        return BinOp("-", self, _lift(other))
+
+    def __rsub__(self, other: Any) -> "BinOp":
+        return BinOp("-", _lift(other), self)
+
+    def __mul__(self, other: Any) -> "BinOp":
+        return BinOp("*", self, _lift(other))
+
+    def __rmul__(self, other: Any) -> "BinOp":
+        return BinOp("*", _lift(other), self)
+
+    def __truediv__(self, other: Any) -> "BinOp":
+        return BinOp("/", self, _lift(other))
+
+    def __ge__(self, other: Any) -> "Compare":
+        return Compare(">=", self, _lift(other))
+
+    def children(self) -> Tuple["Expr", ...]:
+        return ()
+
+
+class Param(Expr):
+    """A named input, impact key or research baseline."""
+
+    __slots__ = ("name", "kind")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.kind = _kind(name)
+
+
+class Const(Expr):
+    """A literal, with an optional unit and note for display."""
+
+    __slots__ = ("value", "unit", "note")
+
+    def __init__(self, value: float, unit: str = "", note: str = "") -> None:
+        self.value = value
+        self.unit = unit
+        self.note = note
+
+
+class BinOp(Expr):
+    __slots__ = ("op", "left", "right")
+
+    def __init__(self, op: str, left: Expr, right: Expr) -> None:
+        self.op = op
+        self.left = left
+        self.right = right
+
+    def children(self) -> Tuple[Expr, ...]:
+        return (self.left, self.right)
+
+
+class Compare(Expr):
+    __slots__ = ("op", "left", "right")
+
+    def __init__(self, op: str, left: Expr, right: Expr) -> None:
+        self.op = op
+        self.left = left
+        self.right = right
+
+    def children(self) -> Tuple[Expr, ...]:
+        return (self.left, self.right)
+
+
+class Where(Expr):
+    """``then if condition else otherwise``.
+
+    *flags* names the 0/1 factors that stand for the two branches in the
+    sum-of-products form (``flags[0]`` is 1 where the condition holds).
+    """
+
+    __slots__ = ("condition", "then", "otherwise", "flags")
+
+    def __init__(self, condition: Compare, then: Any, otherwise: Any, *, flags: Tuple[str, str]) -> None:
+        self.condition = condition
+        self.then = _lift(then)
+        self.otherwise = _lift(otherwise)
+        self.flags = flags
+
+    def children(self) -> Tuple[Expr, ...]:
+        return (self.condition, self.then, self.otherwise)
+
+
+class Named(Expr):
+    """An intermediate quantity with its own name and label.
+
+    Engines compute it once per evaluation, even when several line items
+    share it; the formula text shows it as a separate definition.
+    """
+
+    __slots__ = ("name", "label", "expr")
+
+    def __init__(self, name: str, label: str, expr: Expr) -> None:
+        if name in INPUTS:
+            raise ValueError(f"Intermediate {name!r} shadows an input")
+        self.name = name
+        self.label = label
+        self.expr = expr
+
+    def children(self) -> Tuple[Expr, ...]:
+        return (self.expr,)
+
+
+def _lift(value: Any) -> Expr:
+    return value if isinstance(value, Expr) else Const(value)
+
+
+def walk(node: Expr) -> Iterator[Expr]:
+    """Every node below and including *node*, children first."""
+    for child in node.children():
+        yield from walk(child)
+    yield node
+
+
+class _Params:
+    """``P.avg_annual_salary`` -> ``Param("avg_annual_salary")``."""
+
+    def __getattr__(self, name: str) -> Param:
+        return Param(name)
+
+
+P = _Params()
+
+
+@dataclass(frozen=True)
+class LineItem:
+    key: str
+    category: str
+    area: str
+    expr: Expr
+
+    @property
+    def parameters(self) -> FrozenSet[str]:
+        """Inputs, impact keys and baselines the line item reads."""
+        return frozenset(node.name for node in walk(self.expr) if isinstance(node, Param))
+
+
+# ---------- Declarations ---------- #
+
+# Cost-per-hire switches between SHRM and small-business figures at 500
+# employees; the flags model the switch as 0/1 factors.
+SIZE_FLAGS: Tuple[str, str] = ("uses_shrm_cost_per_hire", "uses_small_biz_cost_per_hire")
+
+current_cost_per_hire = Named(
+    "current_cost_per_hire",
+    "Baseline cost-per-hire",
+    Where(P.num_employees >= 500, P.AVG_COST_PER_HIRE_SHRM, P.AVG_COST_PER_HIRE_SMALL_BIZ, flags=SIZE_FLAGS),
+)
+total_payroll = Named("total_payroll", "Total payroll", P.num_employees * P.avg_annual_salary)
+replacement_cost = Named(
+    "replacement_cost", "Replacement cost", P.avg_annual_salary * P.COST_TO_REPLACE_PERCENT_OF_SALARY
+)
+
+# 1. Hiring Process Optimization
+ttf_reduction_days = Named(
+    "ttf_reduction_days", "Days saved per hire", P.AVG_TIME_TO_FILL_DAYS * P.ttf_total_reduction_percent
+)
+daily_vacancy_cost = Named(
+    "daily_vacancy_cost",
+    "Daily vacancy cost",
+    (P.avg_annual_salary / Const(260.0, note="working days")) * P.COST_OF_VACANCY_PER_DAY_ESTIMATE_FACTOR,
+)
+recruiter_hours_saved = Named(
+    "recruiter_hours_saved_annual",
+    "Recruiter hours saved",
+    P.recruiter_total_hours_saved_per_week_per_recruiter * Const(50, note="weeks") * P.num_recruiters,
+)
+recruiter_hourly_cost = Named(
+    "recruiter_hourly_cost", "Recruiter hourly cost", P.avg_recruiter_salary / Const(2080.0, "h/year")
+)
+
+# 2. Enhanced Hiring Quality
+avg_cost_of_mishire = Named(
+    "avg_cost_of_mishire", "Cost of a mis-hire", P.avg_annual_salary * P.MISHIRE_COST_PERCENT_OF_SALARY_DOL
+)
+current_annual_mishires = Named(
+    "current_annual_mishires", "Current mis-hires", P.annual_hires * P.CURRENT_MISHIRE_RATE_PERCENT
+)
+
+# 3. Strategic Role Alignment
+shift_shock_leavers = Named(
+    "num_early_leavers_shift_shock",
+    "Shift-shock early leavers",
+    P.annual_hires * P.NEW_HIRES_LEAVING_IN_90_DAYS_PERCENT * P.SHIFT_SHOCK_SHARE_OF_EARLY_LEAVERS_PERCENT,
+)
+
+# 4. Optimized Interviewing
+num_interviews = Named("num_interviews_annually", "Interviews per year", P.annual_hires * P.INTERVIEWS_PER_HIRE)
+
+# 5. Accelerated Onboarding
+months_ramp_saved = Named(
+    "months_ramp_saved",
+    "Ramp months saved",
+    P.AVG_TIME_TO_PRODUCTIVITY_MONTHS
+    - P.AVG_TIME_TO_PRODUCTIVITY_MONTHS * (1 - P.time_to_productivity_reduction_percent),
+)
+
+# 6. Improved Internal Mobility
+external_hires_avoided = Named(
+    "external_hires_avoided",
+    "External hires avoided",
+    P.annual_hires
+    * ((P.CURRENT_INTERNAL_FILL_RATE_PERCENT + P.internal_fill_rate_increase_points) - P.CURRENT_INTERNAL_FILL_RATE_PERCENT),
+)
+saving_per_internal_hire = Named(
+    "cost_saving_per_internal_hire",
+    "Saving per internal hire",
+    (P.avg_annual_salary * P.EXTERNAL_HIRE_SALARY_PREMIUM_PERCENT) + (current_cost_per_hire * 0.5),
+)
+
+# 7. Effective Performance & Development
+voluntary_leavers = Named(
+    "num_voluntary_leavers", "Voluntary leavers", P.num_employees * P.CURRENT_ANNUAL_VOLUNTARY_TURNOVER_PERCENT
+)
+
+_HIRING = "1. Hiring Process Optimization"
+_PM = "7. Effective Performance & Development"
+
+# Items of one category must be contiguous (see results.CATEGORY_CODES).
+REGISTRY: Tuple[LineItem, ...] = (
+    LineItem(
+        "savings_ttf", _HIRING, "Reduced Time-to-Fill",
+        ttf_reduction_days * daily_vacancy_cost * P.annual_hires,
+    ),
+    LineItem(
+        "savings_recruiter_time", _HIRING, "Increased Recruiter Productivity",
+        recruiter_hours_saved * recruiter_hourly_cost,
+    ),
+    LineItem(
+        "savings_cph", _HIRING, "Lower Cost-Per-Hire",
+        current_cost_per_hire * P.cph_total_reduction_percent * P.annual_hires,
+    ),
+    LineItem(
+        "savings_mishires", "2. Enhanced Hiring Quality", "Reduced Mis-Hire Costs",
+        current_annual_mishires * P.mishire_rate_reduction_percent * avg_cost_of_mishire,
+    ),
+    LineItem(
+        "savings_shift_shock", "3. Strategic Role Alignment", "Lower Early Attrition (Role Clarity)",
+        shift_shock_leavers * P.shift_shock_turnover_reduction_percent * replacement_cost,
+    ),
+    LineItem(
+        "savings_interview_sched", "4. Optimized Interviewing", "Efficient Interview Scheduling",
+        num_interviews * Const(1, "h") * P.interview_scheduling_time_reduction_percent * P.RECRUITER_AVG_HOURLY_RATE,
+    ),
+    LineItem(
+        "savings_faster_ttp", "5. Accelerated Onboarding", "Faster Time-to-Productivity",
+        (P.avg_annual_salary / 12) * months_ramp_saved * Const(0.5, "%", "productivity gap") * P.annual_hires,
+    ),
+    LineItem(
+        "savings_internal_fill", "6. Improved Internal Mobility", "Increased Internal Fill Rate & Cost Savings",
+        external_hires_avoided * saving_per_internal_hire,
+    ),
+    LineItem(
+        "savings_pm_productivity", _PM, "Productivity Gains from Engaged PM",
+        total_payroll * Const(0.20, "%", "payroll segment")
+        * P.productivity_gain_from_better_pm_percent_of_payroll_segment,
+    ),
+    LineItem(
+        "savings_pm_turnover", _PM, "Reduced Turnover (Better Growth Paths)",
+        voluntary_leavers * P.turnover_reduction_from_better_pm_percent_of_turnover * replacement_cost,
+    ),
+    LineItem(
+        "savings_swp_labor_opt", "8. Strategic Workforce Planning", "Optimized Labor Budget & Skill Deployment",
+        total_payroll * P.labor_budget_swp_total_saving_percent,
+    ),
+)
+
+CATEGORIES: Tuple[str, ...] = tuple(dict.fromkeys(item.category for item in REGISTRY))
+
+
+# ---------- Scalar engine ---------- #
+
+
+def _scalar_source(name: str) -> str:
+    lines = [f"def {name}({', '.join(INPUTS)}, impact, lap):"]
+    assigned: set = set()
+
+    def ref(node: Expr) -> str:
+        if isinstance(node, Param):
+            return f"impact[{node.name!r}]" if node.kind == "impact" else node.name
+        if isinstance(node, Const):
+            return repr(node.value)
+        if isinstance(node, Named):
+            if node.name not in assigned:
+                lines.append(f"    {node.name} = {ref(node.expr)}")
+                assigned.add(node.name)
+            return node.name
+        if isinstance(node, Where):
+            return f"({ref(node.then)} if {ref(node.condition)} else {ref(node.otherwise)})"
+        return f"({ref(node.left)} {node.op} {ref(node.right)})"  # BinOp / Compare
+
+    for i, item in enumerate(REGISTRY):
+        lines.append(f"    {item.key} = {ref(item.expr)}")
+        if i + 1 == len(REGISTRY) or REGISTRY[i + 1].category != item.category:
+            lines.append(f"    if lap:\n        lap({item.category!r})")
+    lines.append(f"    return ({', '.join(item.key for item in REGISTRY)},)")
+    return "\n".join(lines) + "\n"
+
+
+def baselines() -> Dict[str, Any]:
+    """Research baseline constants the registry reads, by name, from :mod:`constants`."""
+    names = {node.name for item in REGISTRY for node in walk(item.expr) if isinstance(node, Param)}
+    return {name: getattr(constants, name) for name in sorted(names) if _kind(name) == "baseline"}
+
+
+@lru_cache(maxsize=None)
+def scalar_kernel() -> Callable[..., Tuple[float, ...]]:
+    """Compiled scalar engine: ``fn(*INPUTS, impact, lap) -> amounts``.
+
+    Baselines are bound from ``constants`` at compile time; *lap* is an
+    :class:`instrumentation.LapTimer` or ``None``.
+    """
+    namespace: Dict[str, Any] = dict(baselines())
+    exec(compile(_scalar_source("savings_amounts"), "<formulas:scalar>", "exec"), namespace)
+    return namespace["savings_amounts"]
+
+
+# ---------- NumPy engine ---------- #
+
+_UFUNCS = {"+": "np.add", "-": "np.subtract", "*": "np.multiply", "/": "np.divide"}
+
+
+class _NumpyWriter:
+    """Emits statements for one generated kernel.
+
+    Intermediate results are fresh arrays owned by the kernel, so further
+    operations on them run in place (``out=``) instead of allocating.
+    """
+
+    def __init__(self) -> None:
+        self.lines: List[str] = []
+        self.assigned: set = set()
+        self.temps = 0
+
+    def _temp(self) -> str:
+        self.temps += 1
+        return f"_t{self.temps}"
+
+    def emit(self, node: Expr) -> Tuple[str, bool]:
+        """Return ``(python expression, is an owned temporary)``."""
+        if isinstance(node, Param):
+            return f"p[{node.name!r}]", False
+        if isinstance(node, Const):
+            return repr(node.value), False
+        if isinstance(node, Named):
+            if node.name not in self.assigned:
+                value, owned = self.emit(node.expr)
+                self.lines.append(f"    {node.name} = {value}")
+                if owned:
+                    self.lines.append(f"    del {value}")
+                self.assigned.add(node.name)
+            return node.name, False
+        if isinstance(node, Compare):
+            return f"({self.emit(node.left)[0]} {node.op} {self.emit(node.right)[0]})", False
+        if isinstance(node, Where):
+            target = self._temp()
+            condition, then, otherwise = (self.emit(n)[0] for n in node.children())
+            self.lines.append(f"    {target} = np.where({condition}, {then}, {otherwise})")
+            return target, True
+
+        (left, left_owned), (right, right_owned) = self.emit(node.left), self.emit(node.right)
+        ufunc = _UFUNCS[node.op]
+        if isinstance(node.left, Const) and isinstance(node.right, Const):
+            return f"({left} {node.op} {right})", False
+        if left_owned or right_owned:
+            target = left if left_owned else right
+            self.lines.append(f"    {ufunc}({left}, {right}, out={target})")
+            return target, True
+        target = self._temp()
+        self.lines.append(f"    {target} = {ufunc}({left}, {right})")
+        return target, True
+
+    def result(self, node: Expr) -> str:
+        value, owned = self.emit(node)
+        return value if owned else f"np.array({value}, dtype=np.float64)"
+
+
+def _numpy_source(name: str, items: Tuple[LineItem, ...]) -> str:
+    # Free each shared intermediate after the last item that reads it, so
+    # the fused kernel holds no more full-size arrays than it needs.
+    last_use = {
+        node.name: i for i, item in enumerate(items) for node in walk(item.expr) if isinstance(node, Named)
+    }
+    writer = _NumpyWriter()
+    results = []
+    for i, item in enumerate(items):
+        results.append((item.key, writer.result(item.expr)))
+        done = sorted(named for named, last in last_use.items() if last == i)
+        if done and i + 1 < len(items):
+            writer.lines.append(f"    del {', '.join(done)}")
+    body = ", ".join(f"{key!r}: {value}" for key, value in results)
+    return "\n".join([f"def {name}(p):", *writer.lines, f"    return {{{body}}}"]) + "\n"
+
+
+def _flags_source(name: str) -> str:
+    lines = [f"def {name}(p):", "    flags = {}"]
+    writer = _NumpyWriter()
+    for node in {id(n): n for item in REGISTRY for n in walk(item.expr) if isinstance(n, Where)}.values():
+        condition = writer.emit(node.condition)[0]
+        lines.append(f"    holds = ({condition}).astype(np.float64)")
+        lines.append(f"    flags[{node.flags[0]!r}] = holds")
+        lines.append(f"    flags[{node.flags[1]!r}] = 1.0 - holds")
+    return "\n".join([*lines, "    return flags"]) + "\n"
+
+
+@dataclass(frozen=True)
+class NumpyKernels:
+    """Generated batch kernels; each takes a ``batch.build_params`` mapping."""
+
+    line_items: Dict[str, Callable[[Any], Any]]  # key -> kernel returning {key: array}
+    fused: Callable[[Any], Dict[str, Any]]  # every line item, shared intermediates once
+    flags: Callable[[Any], Dict[str, Any]]  # the 0/1 Where flags
+
+
+@lru_cache(maxsize=None)
+def compile_numpy() -> NumpyKernels:
+    import numpy as np
+
+    def build(source: str, name: str) -> Callable[[Any], Any]:
+        namespace: Dict[str, Any] = {"np": np}
+        exec(compile(source, f"<formulas:{name}>", "exec"), namespace)
+        return namespace[name]
+
+    return NumpyKernels(
+        line_items={item.key: build(_numpy_source(item.key, (item,)), item.key) for item in REGISTRY},
+        fused=build(_numpy_source("all_line_items", REGISTRY), "all_line_items"),
+        flags=build(_flags_source("flags"), "flags"),
+    )
+
+
+# ---------- Sum-of-products form ---------- #
+
+Polynomial = Dict[Tuple[str, ...], Fraction]
+
+
+def _expand(node: Expr) -> Polynomial:
+    if isinstance(node, Param):
+        return {(node.name,): Fraction(1)}
+    if isinstance(node, Const):
+        return {(): Fraction(node.value)}
+    if isinstance(node, Named):
+        return _expand(node.expr)
+    if isinstance(node, Where):
+        flag_then, flag_otherwise = node.flags
+        return _add(
+            _multiply({(flag_then,): Fraction(1)}, _expand(node.then)),
+            _multiply({(flag_otherwise,): Fraction(1)}, _expand(node.otherwise)),
+        )
+    if isinstance(node, BinOp):
+        left, right = _expand(node.left), _expand(node.right)
+        if node.op == "+":
+            return _add(left, right)
+        if node.op == "-":
+            return _add(left, {factors: -c for factors, c in right.items()})
+        if node.op == "*":
+            return _multiply(left, right)
+        if set(right) == {()}:
+            return {factors: c / right[()] for factors, c in left.items()}
+    raise ValueError(f"Not expressible as a sum of products: {render(node)}")
+
+
+def _add(a: Polynomial, b: Polynomial) -> Polynomial:
+    out = dict(a)
+    for factors, c in b.items():
+        out[factors] = out.get(factors, Fraction(0)) + c
+    return {factors: c for factors, c in out.items() if c != 0}
+
+
+def _multiply(a: Polynomial, b: Polynomial) -> Polynomial:
+    out: Polynomial = {}
+    for fa, ca in a.items():
+        for fb, cb in b.items():
+            factors = tuple(sorted(fa + fb))
+            if len(set(factors)) != len(factors):
+                raise ValueError(f"A parameter appears twice in one term: {factors}")
+            out[factors] = out.get(factors, Fraction(0)) + ca * cb
+    return {factors: c for factors, c in out.items() if c != 0}
+
+
+def expand_terms(item: LineItem) -> Tuple[Tuple[float, Tuple[str, ...]], ...]:
+    """*item* as ``(coefficient, factor names)`` terms, coefficients folded exactly."""
+    return tuple((float(c), factors) for factors, c in _expand(item.expr).items())
+
+
+# ---------- Formula text ---------- #
+
+_SYMBOLS = {"+": "+", "-": "−", "*": "×", "/": "÷", ">=": "≥"}
+_PRECEDENCE = {"+": 1, "-": 1, "*": 2, "/": 2}
+
+
+def label(name: str) -> str:
+    return LABELS[name][0] if name in LABELS else name.replace("_", " ").capitalize()
+
+
+def render(node: Expr) -> str:
+    """Human-readable formula, e.g. ``Days saved per hire × Daily vacancy cost``."""
+    if isinstance(node, Param):
+        return label(node.name)
+    if isinstance(node, Const):
+        return " ".join(filter(None, (format_value(node.value, node.unit), node.note)))
+    if isinstance(node, Named):
+        return node.label
+    if isinstance(node, Compare):
+        return f"{render(node.left)} {_SYMBOLS[node.op]} {render(node.right)}"
+    if isinstance(node, Where):
+        return f"({render(node.then)} if {render(node.condition)}, else {render(node.otherwise)})"
+
+    precedence = _PRECEDENCE[node.op]
+
+    def side(child: Expr, right: bool) -> str:
+        text = render(child)
+        if isinstance(child, BinOp):
+            inner = _PRECEDENCE[child.op]
+            if inner < precedence or (right and inner == precedence and node.op in "-/"):
+                return f"({text})"
+        return text
+
+    return f"{side(node.left, False)} {_SYMBOLS[node.op]} {side(node.right, True)}"
+
+
+def _definitions(node: Expr) -> List[Named]:
+    """Named intermediates under *node*, outermost first, without repeats."""
+    seen: Dict[str, Named] = {}
+
+    def visit(n: Expr) -> None:
+        if isinstance(n, Named) and n.name not in seen:
+            seen[n.name] = n
+        for child in n.children():
+            visit(child)
+
+    visit(node)
+    return list(seen.values())
+
+
+def _anchor(category: str) -> str:
+    # GitHub heading anchor of "## 1  Hiring Process Optimization".
+    return "-".join(category.replace(".", "").replace("&", "").lower().split(" "))
+
+
+def category_markdown(category: str, *, heading: str | None = "#### 🔍 Calculation Details") -> str:
+    """Formulas, definitions and research baselines of one category as markdown."""
+    items = [item for item in REGISTRY if item.category == category]
+    lines = [heading, ""] if heading else []
+    for item in items:
+        lines.append(f"- **{item.area}:** `{render(item.expr)}`")
+        for named in _definitions(item.expr):
+            lines.append(f"    - `{named.label} = {render(named.expr)}`")
+    baselines = sorted(
+        {name for item in items for name in item.parameters if _kind(name) == "baseline"},
+        key=lambda name: label(name),
+    )
+    if baselines:
+        values = "; ".join(
+            f"{label(name)} = {format_value(getattr(constants, name), LABELS.get(name, ('', ''))[1])}"
+            for name in baselines
+        )
+        lines += ["", f"Research baselines: {values}."]
+    lines += ["", f"_See `docs/value_generation_framework.md#{_anchor(category)}` for the full walkthrough and sources._"]
+    return "\n".join(lines)
+
+
+# ---------- Docs ---------- #
+
+DOCS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "docs", "value_generation_framework.md")
+DOCS_BEGIN = "<!-- BEGIN GENERATED by `python formulas.py docs`; do not edit by hand -->"
+DOCS_END = "<!-- END GENERATED -->"
+DOCS_EXAMPLE_TIER = "Mid-Market"
+
+
+def docs_section() -> str:
+    """The generated formula reference, with example values for one tier."""
+    from calculations import compute_savings_amounts, tier_inputs
+
+    amounts = compute_savings_amounts(**tier_inputs(constants.TIER_DATA[DOCS_EXAMPLE_TIER]))
+    by_key = {item.key: amount for item, amount in zip(REGISTRY, amounts)}
+    parts = [
+        DOCS_BEGIN,
+        "## Formula Reference",
+        "",
+        f"_Generated from `formulas.py`, the single source of every engine.  Example values: **{DOCS_EXAMPLE_TIER}** tier, Base scenario._",
+    ]
+    for category in CATEGORIES:
+        parts += ["", f"### {category}", "", category_markdown(category, heading=None).rsplit("\n\n", 1)[0], ""]
+        parts += [
+            f"- {item.area}: **${by_key[item.key]:,.0f}**" for item in REGISTRY if item.category == category
+        ]
+    parts += ["", DOCS_END]
+    return "\n".join(parts)
+
+
+def render_docs(text: str) -> str:
+    """*text* with the generated section replaced (or inserted before "How to Use")."""
+    section = docs_section()
+    if DOCS_BEGIN in text:
+        head, rest = text.split(DOCS_BEGIN, 1)
+        return head + section + rest.split(DOCS_END, 1)[1]
+    marker = "## How to Use This Document"
+    head, sep, tail = text.partition(marker)
+    return f"{head}{section}\n\n---\n\n{sep}{tail}" if sep else f"{text.rstrip()}\n\n{section}\n"
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Formula registry tools.")
+    parser.add_argument("command", choices=("docs", "source"))
+    parser.add_argument("--check", action="store_true", help="With 'docs': fail if the file is out of date")
+    args = parser.parse_args(argv)
+
+    if args.command == "source":
+        print(_scalar_source("savings_amounts"))
+        print(_numpy_source("all_line_items", REGISTRY))
+        print(_flags_source("flags"))
+        return 0
+
+    with open(DOCS_PATH, "r", encoding="utf-8") as fh:
+        current = fh.read()
+    updated = render_docs(current)
+    if args.check:
+        if updated != current:
+            print(f"{DOCS_PATH} is out of date; run `python formulas.py docs`", file=sys.stderr)
+            return 1
+        return 0
+    if updated != current:
+        with open(DOCS_PATH, "w", encoding="utf-8") as fh:
+            fh.write(updated)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,296 @@
+"""goal_seek.py
+Vectorised goal-seek on top of the savings model.
+Answers investor questions such as "highest price that still gives 500% ROI"
+or "lowest scenario multiplier that keeps payback within 12 months" for one
+tier or a whole batch of prospects at once.
+
+Every term of the model scales linearly with exactly one impact key, so
+savings at scenario multiplier *m* are ``m × S(1)`` and the ROI /
+simple-payback goals have closed forms.  The ROI inversions are
+:class:`compiled_model.CompiledModel`'s own; this module adds batch
+plumbing and the payback goals.  Goals on the ramped, discounted cash-flow
+projection are not closed-form and are solved by vectorised bisection, all
+rows in lock-step.
+
+Usage::
+
+    python goal_seek.py price --tier "Mid Enterprise" --target-roi 500
+    python goal_seek.py multiplier --tier all --max-payback 12 --ramp-months 6
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Mapping, Tuple
+
+import numpy as np
+
+from batch import BASELINE_CONSTANTS, INPUT_COLUMNS
+from calculations import tier_inputs
+from compiled_model import CompiledModel
+from constants import OPERETA_IMPACT, TIER_DATA
+from projection import ProjectionSettings, cumulative_cash_flow, payback_month
+
+__all__ = [
+    "bisect_monotone",
+    "multiplier_for_max_payback",
+    "multiplier_for_target_roi",
+    "price_for_max_payback",
+    "price_for_target_roi",
+    "tier_batch",
+]
+
+
+def tier_batch(tiers: List[str] | None = None) -> Dict[str, np.ndarray]:
+    """Batch input columns (plus ``annual_price``) for ``TIER_DATA`` tiers."""
+    rows = []
+    for tier in tiers or list(TIER_DATA):
+        rows.append({**tier_inputs(TIER_DATA[tier]), "annual_price": TIER_DATA[tier]["opereta_target_annual_price"]})
+    return {name: np.array([row[name] for row in rows], dtype=np.float64) for name in rows[0]}
+
+
+@lru_cache(maxsize=32)
+def _compiled(impact: Tuple[Tuple[str, float], ...], baseline: Tuple[Tuple[str, float], ...]) -> CompiledModel:
+    return CompiledModel(dict(impact), dict(baseline))
+
+
+def _model_and_inputs(
+    data: Mapping[str, Any] | None,
+    impact: Mapping[str, float] | None,
+    baseline: Mapping[str, Any] | None,
+    columns: Dict[str, Any],
+) -> Tuple[CompiledModel, Dict[str, np.ndarray]]:
+    """The compiled model for *impact* / *baseline* and the input columns as arrays."""
+    data = data if data is not None else {}
+    columns.pop("annual_price", None)
+    per_row = [name for name in (*data, *columns) if name in OPERETA_IMPACT or name in BASELINE_CONSTANTS]
+    if per_row:
+        raise ValueError(f"Per-row impact/baseline columns are not supported here: {per_row}; pass impact=/baseline=")
+    missing = [name for name in INPUT_COLUMNS if name not in columns and name not in data]
+    if missing:
+        raise KeyError(f"Missing batch input columns: {missing}")
+    arrays = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(columns.get(name, data.get(name)), dtype=np.float64)) for name in INPUT_COLUMNS)
+    )
+    model = _compiled(
+        tuple(sorted((impact or OPERETA_IMPACT).items())),
+        tuple(sorted((baseline or {}).items())),
+    )
+    return model, dict(zip(INPUT_COLUMNS, arrays))
+
+
+def _base_savings(
+    data: Mapping[str, Any] | None,
+    impact: Mapping[str, float] | None,
+    baseline: Mapping[str, Any] | None,
+    columns: Dict[str, Any],
+) -> np.ndarray:
+    """Total annual savings at scenario multiplier 1."""
+    model, inputs = _model_and_inputs(data, impact, baseline, columns)
+    return model.total(**inputs)
+
+
+def _price(data: Mapping[str, Any] | None, annual_price: Any, columns: Dict[str, Any]) -> np.ndarray:
+    if annual_price is None:
+        annual_price = columns.get("annual_price", (data if data is not None else {}).get("annual_price"))
+    if annual_price is None:
+        raise KeyError("annual_price is required (keyword or column)")
+    return np.asarray(annual_price, dtype=np.float64)
+
+
+def bisect_monotone(
+    fn: Callable[[np.ndarray], np.ndarray],
+    target: Any,
+    lo: Any,
+    hi: Any,
+    *,
+    iterations: int = 60,
+) -> np.ndarray:
+    """Solve ``fn(x) == target`` per row for a monotone *fn* by bisection.
+
+    *fn* maps an ``(n,)`` array of candidates to ``(n,)`` values and may be
+    increasing or decreasing.  Rows whose bracket ``[lo, hi]`` does not
+    straddle the target get NaN.
+    """
+
+    lo, hi, target = np.broadcast_arrays(
+        np.asarray(lo, dtype=np.float64), np.asarray(hi, dtype=np.float64), np.asarray(target, dtype=np.float64)
+    )
+    lo, hi = lo.astype(np.float64), hi.astype(np.float64)
+    below_lo = fn(lo) < target
+    valid = below_lo != (fn(hi) < target)
+    for _ in range(iterations):
+        mid = 0.5 * (lo + hi)
+        move_lo = (fn(mid) < target) == below_lo
+        lo = np.where(move_lo, mid, lo)
+        hi = np.where(move_lo, hi, mid)
+    return np.where(valid, 0.5 * (lo + hi), np.nan)
+
+
+# ---------- ROI goals (closed form) ---------- #
+
+
+def price_for_target_roi(
+    target_roi_percent: Any,
+    data: Mapping[str, Any] | None = None,
+    *,
+    scenario_multiplier: Any = 1.0,
+    impact: Mapping[str, float] | None = None,
+    baseline: Mapping[str, Any] | None = None,
+    **columns: Any,
+) -> np.ndarray:
+    """Highest annual price that still yields *target_roi_percent*.
+
+    :meth:`CompiledModel.price_for_target_roi` scaled by the multiplier.
+    """
+    model, inputs = _model_and_inputs(data, impact, baseline, columns)
+    return np.asarray(scenario_multiplier, dtype=np.float64) * model.price_for_target_roi(
+        np.asarray(target_roi_percent, dtype=np.float64), **inputs
+    )
+
+
+def multiplier_for_target_roi(
+    target_roi_percent: Any,
+    data: Mapping[str, Any] | None = None,
+    *,
+    annual_price: Any = None,
+    impact: Mapping[str, float] | None = None,
+    baseline: Mapping[str, Any] | None = None,
+    **columns: Any,
+) -> np.ndarray:
+    """Lowest scenario multiplier that reaches *target_roi_percent* (0 = break-even).
+
+    ``annual_price`` defaults to an ``annual_price`` column of *data*; the
+    inversion is :meth:`CompiledModel.multiplier_for_target_roi`.
+    """
+    price = _price(data, annual_price, columns)
+    model, inputs = _model_and_inputs(data, impact, baseline, columns)
+    return model.multiplier_for_target_roi(np.asarray(target_roi_percent, dtype=np.float64), price, **inputs)
+
+
+# ---------- Payback goals ---------- #
+
+
+def price_for_max_payback(
+    max_payback_months: Any,
+    data: Mapping[str, Any] | None = None,
+    *,
+    scenario_multiplier: Any = 1.0,
+    settings: ProjectionSettings | None = None,
+    discounted: bool = False,
+    impact: Mapping[str, float] | None = None,
+    baseline: Mapping[str, Any] | None = None,
+    **columns: Any,
+) -> np.ndarray:
+    """Highest annual price whose payback is at most *max_payback_months*.
+
+    Without *settings* this is the app's simple payback, P / (S / 12), so
+    P = months × S / 12.  With *settings* the payback comes from the ramped
+    cash-flow projection (optionally *discounted*) and is bisected.
+    """
+    savings = scenario_multiplier * _base_savings(data, impact, baseline, columns)
+    months = np.broadcast_to(np.asarray(max_payback_months, dtype=np.float64), savings.shape)
+    if settings is None:
+        return months * savings / 12
+
+    # The cumulative cash flow is linear in price: savings curve + P × unit curve.
+    savings_curve = cumulative_cash_flow(savings, 0.0, settings, discounted=discounted)
+    unit_price_curve = cumulative_cash_flow(np.zeros_like(savings), 1.0, settings, discounted=discounted)
+
+    def payback(price: np.ndarray) -> np.ndarray:
+        return payback_month(savings_curve + price[:, None] * unit_price_curve)
+
+    # Payback rises with price; the upper bracket is a year of full savings.
+    return bisect_monotone(payback, months, 0.0, savings)
+
+
+def multiplier_for_max_payback(
+    max_payback_months: Any,
+    data: Mapping[str, Any] | None = None,
+    *,
+    annual_price: Any = None,
+    settings: ProjectionSettings | None = None,
+    discounted: bool = False,
+    max_multiplier: float = 10.0,
+    impact: Mapping[str, float] | None = None,
+    baseline: Mapping[str, Any] | None = None,
+    **columns: Any,
+) -> np.ndarray:
+    """Lowest scenario multiplier whose payback is at most *max_payback_months*.
+
+    Closed form m = 12 P / (months × S(1)) for the simple payback; bisection
+    over ``[0, max_multiplier]`` on the projection when *settings* is given.
+    """
+    price = _price(data, annual_price, columns)
+    savings = _base_savings(data, impact, baseline, columns)
+    months = np.broadcast_to(np.asarray(max_payback_months, dtype=np.float64), savings.shape)
+    if settings is None:
+        with np.errstate(divide="ignore"):
+            return 12 * price / (months * savings)
+
+    # Linear in the multiplier: m × savings curve + price curve.
+    savings_curve = cumulative_cash_flow(savings, 0.0, settings, discounted=discounted)
+    price_curve = cumulative_cash_flow(np.zeros_like(savings), price, settings, discounted=discounted)
+
+    def payback(multiplier: np.ndarray) -> np.ndarray:
+        return payback_month(multiplier[:, None] * savings_curve + price_curve)
+
+    # Payback falls as the multiplier grows; the smallest passing value is
+    # the crossing point.
+    return bisect_monotone(lambda m: -payback(m), -months, 1e-9, max_multiplier)
+
+
+# ---------- CLI ---------- #
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Goal-seek price or scenario multiplier per tier.")
+    parser.add_argument("solve_for", choices=("price", "multiplier"))
+    parser.add_argument("--tier", choices=[*TIER_DATA, "all"], default="all")
+    goal = parser.add_mutually_exclusive_group(required=True)
+    goal.add_argument("--target-roi", type=float, help="Target ROI in percent")
+    goal.add_argument("--max-payback", type=float, help="Maximum payback in months")
+    parser.add_argument("--scenario", type=float, default=1.0, help="Scenario multiplier when solving for price")
+    parser.add_argument("--price", type=float, help="Annual price when solving for the multiplier (default: tier target)")
+    parser.add_argument("--ramp-months", type=int, help="Use the cash-flow projection with this adoption ramp")
+    parser.add_argument("--discount-rate", type=float, help="Use discounted payback at this annual rate")
+    args = parser.parse_args(argv)
+
+    tiers = list(TIER_DATA) if args.tier == "all" else [args.tier]
+    data = tier_batch(tiers)
+    if args.price is not None:
+        data["annual_price"] = np.full(len(tiers), args.price)
+    settings = None
+    if args.ramp_months is not None or args.discount_rate is not None:
+        defaults = ProjectionSettings()
+        settings = ProjectionSettings(
+            ramp_months=defaults.ramp_months if args.ramp_months is None else args.ramp_months,
+            discount_rate=defaults.discount_rate if args.discount_rate is None else args.discount_rate,
+        )
+    discounted = args.discount_rate is not None
+
+    if args.solve_for == "price" and args.target_roi is not None:
+        values = price_for_target_roi(args.target_roi, data, scenario_multiplier=args.scenario)
+    elif args.solve_for == "price":
+        values = price_for_max_payback(
+            args.max_payback, data, scenario_multiplier=args.scenario, settings=settings, discounted=discounted
+        )
+    elif args.target_roi is not None:
+        values = multiplier_for_target_roi(args.target_roi, data)
+    else:
+        values = multiplier_for_max_payback(args.max_payback, data, settings=settings, discounted=discounted)
+
+    json.dump(
+        {tier: (float(v) if np.isfinite(v) else None) for tier, v in zip(tiers, values)},
+        sys.stdout,
+        indent=2,
+    )
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,269 @@
+"""instrumentation.py
+Opt-in timing hooks for the calculation engine and the app.
+Off by default; set ``OPERETA_INSTRUMENT=1`` or call :func:`enable` to turn
+it on for the whole process, or pass ``enabled=True`` to :func:`begin_run`
+to record only the current thread (one Streamlit rerun) until
+:func:`end_run`.  While disabled every hook returns a shared no-op (or
+``None``), so instrumented code pays one flag check.  While enabled each stage records call count,
+wall time and, optionally, net bytes allocated (``tracemalloc``), both as
+process-wide totals and as a per-thread list for the current Streamlit
+rerun.  Everything exports to JSON.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Set, TypeVar
+
+__all__ = [
+    "ENABLED",
+    "LapTimer",
+    "begin_run",
+    "cache_lookup",
+    "disable",
+    "enable",
+    "end_run",
+    "export_json",
+    "lap_timer",
+    "mark_cache_miss",
+    "reset",
+    "run_records",
+    "snapshot",
+    "stage",
+    "timed",
+]
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+ENABLED: bool = os.environ.get("OPERETA_INSTRUMENT", "") not in ("", "0")
+
+_totals: Dict[str, Dict[str, float]] = {}
+_lock = threading.Lock()
+_local = threading.local()
+_track_allocations = False  # process-wide request, from enable()
+_tracing_threads: Set[threading.Thread] = set()  # runs that asked for tracemalloc
+
+
+def _on() -> bool:
+    return ENABLED or getattr(_local, "active", False)
+
+
+def _sync_tracing() -> None:
+    """Trace allocations exactly while someone asked for it (call under ``_lock``)."""
+    _tracing_threads.difference_update([t for t in _tracing_threads if not t.is_alive()])
+    wanted = (ENABLED and _track_allocations) or bool(_tracing_threads)
+    if wanted and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    elif not wanted and tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def enable(*, track_allocations: bool = False) -> None:
+    """Turn recording on (process-wide); optionally trace allocations too."""
+    global ENABLED, _track_allocations
+    with _lock:
+        ENABLED, _track_allocations = True, track_allocations
+        _sync_tracing()
+
+
+def disable() -> None:
+    global ENABLED, _track_allocations
+    with _lock:
+        ENABLED, _track_allocations = False, False
+        _sync_tracing()
+
+
+def reset() -> None:
+    """Forget all recorded totals."""
+    with _lock:
+        _totals.clear()
+
+
+def _allocated() -> int:
+    return tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+
+
+def _record(name: str, seconds: float, allocated: int) -> None:
+    with _lock:
+        stats = _totals.get(name)
+        if stats is None:
+            stats = _totals[name] = {"calls": 0, "seconds": 0.0, "max_seconds": 0.0, "allocated_bytes": 0}
+        stats["calls"] += 1
+        stats["seconds"] += seconds
+        stats["max_seconds"] = max(stats["max_seconds"], seconds)
+        stats["allocated_bytes"] += allocated
+    records = getattr(_local, "records", None)
+    if records is not None:
+        records.append({"stage": name, "seconds": seconds, "allocated_bytes": allocated})
+
+
+# ---------- Hooks ---------- #
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc: Any) -> bool:
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    __slots__ = ("name", "started", "allocated")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __enter__(self) -> "_Stage":
+        self.allocated = _allocated()
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: Any) -> bool:
+        _record(self.name, time.perf_counter() - self.started, _allocated() - self.allocated)
+        return False
+
+
+def stage(name: str) -> Any:
+    """Context manager timing the enclosed block as *name*."""
+    return _Stage(name) if _on() else _NULL_STAGE
+
+
+def timed(name: str | None = None) -> Callable[[F], F]:
+    """Decorator form of :func:`stage` (defaults to the function's name)."""
+
+    def decorate(fn: F) -> F:
+        label = name or fn.__qualname__
+
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _on():
+                return fn(*args, **kwargs)
+            with _Stage(label):
+                return fn(*args, **kwargs)
+
+        wrapper.__wrapped__ = fn  # type: ignore[attr-defined]
+        wrapper.__name__ = fn.__name__
+        wrapper.__doc__ = fn.__doc__
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+class LapTimer:
+    """Records the time since the previous lap under ``<prefix>/<label>``.
+
+    For straight-line hot code where a ``with`` block per stage would cost
+    more than the stage itself::
+
+        lap = instrumentation.lap_timer("savings")
+        ...
+        if lap:
+            lap("1. Hiring Process Optimization")
+    """
+
+    __slots__ = ("prefix", "last", "allocated")
+
+    def __init__(self, prefix: str) -> None:
+        self.prefix = prefix
+        self.allocated = _allocated()
+        self.last = time.perf_counter()
+
+    def __call__(self, label: str) -> None:
+        now, allocated = time.perf_counter(), _allocated()
+        _record(f"{self.prefix}/{label}", now - self.last, allocated - self.allocated)
+        self.allocated = allocated
+        self.last = time.perf_counter()
+
+
+def lap_timer(prefix: str) -> LapTimer | None:
+    """A :class:`LapTimer`, or ``None`` while disabled."""
+    return LapTimer(prefix) if _on() else None
+
+
+class _CacheLookup(_Stage):
+    __slots__ = ()
+
+    def __enter__(self) -> "_CacheLookup":
+        _local.cache_missed = False
+        return super().__enter__()  # type: ignore[return-value]
+
+    def __exit__(self, *exc: Any) -> bool:
+        self.name = f"{self.name} {'miss' if getattr(_local, 'cache_missed', False) else 'hit'}"
+        return super().__exit__(*exc)
+
+
+def cache_lookup(name: str) -> Any:
+    """Time a call to a cached function, recorded as ``"<name> hit|miss"``.
+
+    The cached function body calls :func:`mark_cache_miss`, which only runs
+    when the cache actually misses.
+    """
+    return _CacheLookup(f"cache/{name}") if _on() else _NULL_STAGE
+
+
+def mark_cache_miss() -> None:
+    if _on():
+        _local.cache_missed = True
+
+
+# ---------- Reporting ---------- #
+
+
+def begin_run(*, enabled: bool = False, track_allocations: bool = False) -> None:
+    """Start a fresh per-thread record list (call at the top of a rerun).
+
+    *enabled* records this thread even while the process-wide flag is off,
+    and *track_allocations* traces allocations for it, until :func:`end_run`
+    (or the thread exits).
+    """
+    _local.active = enabled
+    current = threading.current_thread()
+    with _lock:
+        if enabled and track_allocations:
+            _tracing_threads.add(current)
+        else:
+            _tracing_threads.discard(current)
+        _sync_tracing()
+    _local.records = [] if _on() else None
+
+
+def end_run() -> None:
+    """Stop the per-thread recording started by :func:`begin_run`."""
+    _local.active = False
+    with _lock:
+        _tracing_threads.discard(threading.current_thread())
+        _sync_tracing()
+
+
+def run_records() -> List[Dict[str, Any]]:
+    """Stages recorded on this thread since :func:`begin_run`, in order."""
+    return list(getattr(_local, "records", None) or [])
+
+
+def snapshot() -> Dict[str, Any]:
+    with _lock:
+        totals = {name: dict(stats) for name, stats in sorted(_totals.items())}
+    return {
+        "enabled": _on(),
+        "tracking_allocations": tracemalloc.is_tracing(),
+        "totals": totals,
+        "last_run": run_records(),
+    }
+
+
+def export_json(path: str | None = None) -> str:
+    """:func:`snapshot` as JSON text, also written to *path* if given."""
+    text = json.dumps(snapshot(), indent=2)
+    if path is not None:
+        with open(path, "w") as fh:
+            fh.write(text)
+    return text
@@ -0,0 +1,51 @@
+"""model_terms.py
+Sum-of-products form of the savings model.
+Every line item in ``compute_all_savings`` is a sum of terms, each a
+constant coefficient times a product of named parameters (inputs, impact
+keys and research baselines).  Because no parameter appears twice in a term,
+partial derivatives and coefficient folding are exact and need no re-runs.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Mapping, Tuple
+
+import numpy as np
+
+from formulas import REGISTRY, SIZE_FLAGS, compile_numpy, expand_terms
+
+__all__ = [
+    "SAVINGS_TERMS",
+    "SIZE_FLAGS",
+    "Term",
+    "add_size_flags",
+    "evaluate_terms",
+]
+
+# (coefficient, factor names)
+Term = Tuple[float, Tuple[str, ...]]
+
+# Expanded from the declarations in formulas.py: products are multiplied
+# out, constants folded exactly and cancelling terms dropped (e.g. the
+# baseline internal fill rate).  Branches such as the cost-per-hire switch at
+# 500 employees become 0/1 flag factors (SIZE_FLAGS), so every term stays a
+# plain product.
+SAVINGS_TERMS: Dict[str, Tuple[Term, ...]] = {item.key: expand_terms(item) for item in REGISTRY}
+
+
+def add_size_flags(params: Mapping[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Return *params* plus the 0/1 cost-per-hire flag factors."""
+    return {**params, **compile_numpy().flags(params)}
+
+
+def evaluate_terms(
+    terms: Tuple[Term, ...], params: Mapping[str, np.ndarray]
+) -> np.ndarray:
+    """Evaluate one line item's terms against flagged *params*."""
+    total = 0.0
+    for coefficient, factors in terms:
+        value = coefficient
+        for name in factors:
+            value = value * params[name]
+        total = total + value
+    return np.asarray(total, dtype=np.float64)
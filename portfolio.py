@@ -0,0 +1,353 @@
+"""portfolio.py
+Columnar portfolio of per-account results with incrementally maintained rollups.
+Accounts (signed customers and prospects) are stored as rows of contiguous
+arrays: model inputs, annual price, line-item amounts and group codes.
+Rollups of account count, ARR, total savings, ARR-weighted ROI and
+per-category savings are kept per tier (``TIER_DATA`` keys) and per custom
+segment.  Adding, changing or removing one account touches only that row
+and the two group totals it belongs to, so dashboards never re-aggregate
+the whole book.
+
+Usage::
+
+    python portfolio.py accounts.csv --by tier segment
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from collections import Counter
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from batch import INPUT_COLUMNS, compute_all_savings_batch
+from calculations import compute_savings_amounts, tier_inputs
+from constants import OPERETA_IMPACT, TIER_DATA
+from incremental import changed_parameters, revalue
+from results import CATEGORIES, KEYS, SavingsResult
+
+__all__ = [
+    "GROUPINGS",
+    "Portfolio",
+]
+
+GROUPINGS = ("tier", "segment")
+DEFAULT_SEGMENT = "Unassigned"
+
+# Rollup fields per group; categories follow.  ``priced_savings`` only sums
+# accounts with a positive price so zero-price accounts do not skew ROI.
+_FIELDS = ("accounts", "arr", "total_annual_savings", "priced_savings")
+_N_FIELDS = len(_FIELDS) + len(CATEGORIES)
+
+
+def _contributions(price: np.ndarray, amounts: np.ndarray) -> np.ndarray:
+    """Rollup vectors (rows × :data:`_N_FIELDS`) for accounts with these prices and amounts."""
+    result = SavingsResult(amounts)
+    total = np.atleast_1d(result.total)
+    out = np.empty((len(total), _N_FIELDS), dtype=np.float64)
+    out[:, 0] = 1.0
+    out[:, 1] = price
+    out[:, 2] = total
+    out[:, 3] = np.where(price > 0, total, 0.0)
+    out[:, len(_FIELDS):] = np.atleast_2d(result.category_totals())
+    return out
+
+
+class _Rollup:
+    """Running sums per group label; labels get integer codes on first use."""
+
+    __slots__ = ("labels", "codes", "sums")
+
+    def __init__(self, labels: Sequence[str] = ()) -> None:
+        self.labels: List[str] = []
+        self.codes: Dict[str, int] = {}
+        self.sums = np.zeros((0, _N_FIELDS), dtype=np.float64)
+        for label in labels:
+            self.code(label)
+
+    def code(self, label: str) -> int:
+        code = self.codes.get(label)
+        if code is None:
+            code = self.codes[label] = len(self.labels)
+            self.labels.append(label)
+            self.sums = np.vstack([self.sums, np.zeros((1, _N_FIELDS))])
+        return code
+
+    def add(self, codes: np.ndarray, vectors: np.ndarray) -> None:
+        np.add.at(self.sums, codes, vectors)
+
+    def frame(self) -> pd.DataFrame:
+        sums = self.sums
+        arr, priced = sums[:, 1], sums[:, 3]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            roi = np.where(arr > 0, (priced - arr) / arr * 100, np.nan)
+        frame = pd.DataFrame(
+            {
+                "accounts": sums[:, 0].round().astype(np.int64),
+                "arr": arr,
+                "total_annual_savings": sums[:, 2],
+                "arr_weighted_roi_percent": roi,
+                **{category: sums[:, len(_FIELDS) + i] for i, category in enumerate(CATEGORIES)},
+            },
+            index=pd.Index(self.labels, name="group"),
+        )
+        return frame
+
+
+class Portfolio:
+    """Per-account savings in columnar form with tier and segment rollups.
+
+    All accounts share one *impact* mapping (``OPERETA_IMPACT`` by default).
+    Incremental updates add and subtract exact per-account vectors, so the
+    rollups can drift from a fresh sum by a few ULPs after many edits;
+    :meth:`rebuild` re-aggregates from the stored rows.
+    """
+
+    def __init__(self, impact: Mapping[str, float] | None = None, *, capacity: int = 1024) -> None:
+        self.impact: Dict[str, float] = dict(impact or OPERETA_IMPACT)
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._inputs = np.zeros((capacity, len(INPUT_COLUMNS)), dtype=np.float64)
+        self._price = np.zeros(capacity, dtype=np.float64)
+        self._amounts = np.zeros((capacity, len(KEYS)), dtype=np.float64)
+        self._codes = {name: np.zeros(capacity, dtype=np.int32) for name in GROUPINGS}
+        self._rollups = {"tier": _Rollup(TIER_DATA), "segment": _Rollup()}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, account_id: object) -> bool:
+        return account_id in self._rows
+
+    def _reserve(self, n: int) -> None:
+        capacity = len(self._price)
+        if n <= capacity:
+            return
+        capacity = max(n, 2 * capacity)
+        grow = lambda a: np.concatenate([a, np.zeros((capacity - len(a), *a.shape[1:]), dtype=a.dtype)])  # noqa: E731
+        self._inputs, self._price, self._amounts = grow(self._inputs), grow(self._price), grow(self._amounts)
+        self._codes = {name: grow(codes) for name, codes in self._codes.items()}
+
+    def _group_code(self, grouping: str, label: str) -> int:
+        if grouping == "tier" and label not in TIER_DATA:
+            raise KeyError(f"Unknown tier {label!r}; expected one of {list(TIER_DATA)}")
+        return self._rollups[grouping].code(label)
+
+    def _apply(self, rows: np.ndarray, sign: float) -> None:
+        vectors = sign * _contributions(self._price[rows], self._amounts[rows])
+        for name, rollup in self._rollups.items():
+            rollup.add(self._codes[name][rows], vectors)
+
+    # ---------- Editing ---------- #
+
+    def add_accounts(
+        self,
+        frame: pd.DataFrame,
+        *,
+        id_column: str = "account",
+        tier_column: str = "tier",
+        segment_column: str = "segment",
+        price_column: str = "annual_price",
+    ) -> None:
+        """Bulk-load new accounts, scored in one vectorised pass.
+
+        *frame* needs the :data:`batch.INPUT_COLUMNS`, a price and a tier;
+        the segment column is optional.  Raises ``KeyError`` for ids that
+        are already in the portfolio.
+        """
+
+        ids = frame[id_column].astype(str).tolist()
+        duplicates = sorted({i for i, n in Counter(ids).items() if n > 1 or i in self._rows})
+        if duplicates:
+            raise KeyError(f"Accounts already in the portfolio or repeated: {duplicates[:10]}")
+
+        start, stop = len(self._ids), len(self._ids) + len(ids)
+        self._reserve(stop)
+        rows = np.arange(start, stop)
+        data = {name: frame[name].to_numpy(dtype=np.float64) for name in INPUT_COLUMNS}
+        savings = compute_all_savings_batch(data, impact=self.impact)
+        self._inputs[rows] = np.column_stack([data[name] for name in INPUT_COLUMNS])
+        self._price[rows] = frame[price_column].to_numpy(dtype=np.float64)
+        self._amounts[rows] = SavingsResult.from_batch(savings).amounts
+        segments = frame[segment_column].astype(str) if segment_column in frame else [DEFAULT_SEGMENT] * len(ids)
+        for name, labels in (("tier", frame[tier_column].astype(str)), ("segment", segments)):
+            self._codes[name][rows] = [self._group_code(name, label) for label in labels]
+
+        self._rows.update((account_id, row) for row, account_id in zip(rows.tolist(), ids))
+        self._ids.extend(ids)
+        self._apply(rows, 1.0)
+
+    def upsert(
+        self,
+        account_id: str,
+        *,
+        tier: str | None = None,
+        segment: str | None = None,
+        annual_price: float | None = None,
+        **inputs: float,
+    ) -> None:
+        """Add one account or change some of its fields.
+
+        A new account's inputs and price default to its tier's ``TIER_DATA``
+        profile.  Only this account's line items are recomputed (and only if
+        an input changed) and only its old and new groups are updated.
+        """
+
+        unknown = set(inputs) - set(INPUT_COLUMNS)
+        if unknown:
+            raise TypeError(f"Unexpected account inputs: {sorted(unknown)}")
+
+        row = self._rows.get(account_id)
+        if row is None and tier is None:
+            raise KeyError(f"New account {account_id!r} needs a tier")
+        if row is None:
+            segment = segment or DEFAULT_SEGMENT
+        # Resolve everything that can fail before the rollups are touched.
+        tier_code = self._group_code("tier", tier) if tier is not None else None
+        segment_code = self._group_code("segment", segment) if segment is not None else None
+
+        if row is None:
+            profile = tier_inputs(TIER_DATA[tier])
+            values = {name: float(inputs.get(name, profile[name])) for name in INPUT_COLUMNS}
+            changed: Tuple[str, ...] = INPUT_COLUMNS
+            if annual_price is None:
+                annual_price = TIER_DATA[tier]["opereta_target_annual_price"]
+        else:
+            before = dict(zip(INPUT_COLUMNS, self._inputs[row].tolist()))
+            values = {**before, **{name: float(value) for name, value in inputs.items()}}
+            changed = changed_parameters(before, values)
+        amounts = compute_savings_amounts(**values, impact=self.impact) if changed else None
+
+        if row is None:
+            row = len(self._ids)
+            self._reserve(row + 1)
+            self._ids.append(account_id)
+            self._rows[account_id] = row
+        else:
+            self._apply(np.array([row]), -1.0)
+        if tier_code is not None:
+            self._codes["tier"][row] = tier_code
+        if segment_code is not None:
+            self._codes["segment"][row] = segment_code
+        if annual_price is not None:
+            self._price[row] = annual_price
+        if amounts is not None:
+            self._inputs[row] = [values[name] for name in INPUT_COLUMNS]
+            self._amounts[row] = amounts
+        self._apply(np.array([row]), 1.0)
+
+    def remove(self, account_id: str) -> None:
+        """Drop one account; the last row moves into its slot."""
+        row = self._rows.pop(account_id)
+        self._apply(np.array([row]), -1.0)
+        last = len(self._ids) - 1
+        if row != last:
+            moved = self._ids[last]
+            self._ids[row] = moved
+            self._rows[moved] = row
+            for array in (self._inputs, self._price, self._amounts, *self._codes.values()):
+                array[row] = array[last]
+        self._ids.pop()
+
+    def set_impact(self, impact: Mapping[str, float]) -> None:
+        """Re-value every account under new impact assumptions.
+
+        Only the line items that read a changed key are recomputed; the
+        rollups are then re-aggregated once.
+        """
+
+        impact = dict(impact)
+        changed = changed_parameters(self.impact, impact)
+        n = len(self._ids)
+        if changed and n:
+            columns = dict(zip(INPUT_COLUMNS, self._inputs[:n].T))
+            self._amounts[:n] = revalue(
+                SavingsResult(self._amounts[:n]), columns, changed=changed, impact=impact
+            ).amounts
+        self.impact = impact
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        """Recompute every rollup from the stored rows."""
+        for rollup in self._rollups.values():
+            rollup.sums[:] = 0.0
+        if self._ids:
+            self._apply(np.arange(len(self._ids)), 1.0)
+
+    # ---------- Reading ---------- #
+
+    def rollup(self, by: str = "tier") -> pd.DataFrame:
+        """Per-group accounts, ARR, savings, ARR-weighted ROI and category savings.
+
+        ARR-weighted ROI is ``sum(price × ROI) / sum(price)`` over accounts
+        with a positive price, which reduces to
+        ``(sum(savings) - ARR) / ARR × 100``.
+        """
+        if by not in GROUPINGS:
+            raise ValueError(f"by must be one of {GROUPINGS}, got {by!r}")
+        return self._rollups[by].frame()
+
+    def totals(self) -> Dict[str, float]:
+        """Whole-portfolio rollup (the sum of the tier groups)."""
+        frame = self._rollups["tier"].frame()
+        sums = frame.drop(columns="arr_weighted_roi_percent").sum()
+        arr, priced = (float(v) for v in self._rollups["tier"].sums[:, [1, 3]].sum(axis=0))
+        return {
+            **{name: float(value) for name, value in sums.items()},
+            "arr_weighted_roi_percent": (priced - arr) / arr * 100 if arr > 0 else float("nan"),
+        }
+
+    def account(self, account_id: str) -> Dict[str, Any]:
+        row = self._rows[account_id]
+        return {
+            "account": account_id,
+            "tier": self._rollups["tier"].labels[self._codes["tier"][row]],
+            "segment": self._rollups["segment"].labels[self._codes["segment"][row]],
+            **dict(zip(INPUT_COLUMNS, self._inputs[row].tolist())),
+            "annual_price": float(self._price[row]),
+            "total_annual_savings": SavingsResult(self._amounts[row]).total,
+        }
+
+    def to_frame(self) -> pd.DataFrame:
+        """One row per account with inputs, price, group labels and line items."""
+        n = len(self._ids)
+        frame = pd.DataFrame(self._inputs[:n], columns=list(INPUT_COLUMNS))
+        frame.insert(0, "account", self._ids)
+        for name in reversed(GROUPINGS):
+            frame.insert(1, name, np.asarray(self._rollups[name].labels, dtype=object)[self._codes[name][:n]])
+        frame["annual_price"] = self._price[:n]
+        result = SavingsResult(self._amounts[:n])
+        for j, key in enumerate(KEYS):
+            frame[key] = result.amounts[:, j]
+        frame["total_annual_savings"] = result.total
+        return frame
+
+
+# ---------- CLI ---------- #
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Roll up savings of an account file by tier and segment.")
+    parser.add_argument("input", help="CSV with account, tier, [segment], annual_price and the model inputs")
+    parser.add_argument("--by", nargs="+", choices=GROUPINGS, default=["tier"])
+    args = parser.parse_args(argv)
+
+    portfolio = Portfolio()
+    portfolio.add_accounts(pd.read_csv(args.input))
+    with pd.option_context("display.width", 200, "display.max_columns", None, "display.float_format", "{:,.0f}".format):
+        for by in args.by:
+            print(f"\nBy {by}:\n{portfolio.rollup(by)}")
+    totals = portfolio.totals()
+    print(
+        f"\n{totals['accounts']:,.0f} accounts · ARR ${totals['arr']:,.0f} · "
+        f"savings ${totals['total_annual_savings']:,.0f} · ARR-weighted ROI {totals['arr_weighted_roi_percent']:,.0f}%",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,314 @@
+"""projection.py
+Month-by-month cash-flow projection of the savings model.
+Annual savings per category are spread over an N-month horizon with an
+adoption ramp, the subscription is billed annually in advance with yearly
+price escalation, and NPV, IRR, payback and discounted payback are computed
+as array operations over every row at once.  One call covers all tiers ×
+scenarios, so the app's chart and the CSV export come from the same pass.
+
+Usage::
+
+    python projection.py out_dir --months 36 --ramp-months 6 --discount-rate 0.1
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+from batch import compute_all_savings_batch
+from calculations import tier_inputs
+from constants import OPERETA_IMPACT, SCENARIOS, TIER_DATA
+from results import CATEGORIES, SavingsResult
+
+__all__ = [
+    "Projection",
+    "ProjectionSettings",
+    "cumulative_cash_flow",
+    "export_frames",
+    "irr_monthly",
+    "payback_month",
+    "project",
+    "project_tiers",
+]
+
+
+@dataclass(frozen=True)
+class ProjectionSettings:
+    """Horizon and financial assumptions of a projection.
+
+    ``ramp_months`` is the time to full adoption (savings grow linearly
+    from 1/ramp_months of run-rate in month 1; 0 means full from day one).
+    ``discount_rate`` and ``price_escalation`` are annual rates.
+    """
+
+    months: int = 36
+    ramp_months: int = 6
+    discount_rate: float = 0.10
+    price_escalation: float = 0.03
+
+    def adoption(self) -> np.ndarray:
+        """Share of run-rate savings realised in each month 1..N."""
+        month = np.arange(1, self.months + 1, dtype=np.float64)
+        if self.ramp_months <= 0:
+            return np.ones_like(month)
+        return np.minimum(month / self.ramp_months, 1.0)
+
+    def discount_factors(self) -> np.ndarray:
+        """Present-value factor for each time point 0..N (months)."""
+        return (1 + self.discount_rate) ** (-np.arange(self.months + 1) / 12)
+
+
+@dataclass(frozen=True)
+class Projection:
+    """Projected cash flows for ``n`` rows over ``months`` months.
+
+    Time point *t* is the end of month *t*; price payments fall at
+    t = 0, 12, 24, ... and month *t*'s savings at t.
+    """
+
+    settings: ProjectionSettings
+    category_savings: np.ndarray  # (n, len(CATEGORIES), months)
+    payments: np.ndarray  # (n, months + 1)
+    cash_flow: np.ndarray  # (n, months + 1), net of payments
+    cumulative: np.ndarray  # (n, months + 1)
+    discounted_cumulative: np.ndarray  # (n, months + 1)
+    npv: np.ndarray  # (n,)
+    irr_annual: np.ndarray  # (n,), NaN when undefined
+    payback_months: np.ndarray  # (n,), inf when not reached
+    discounted_payback_months: np.ndarray  # (n,)
+
+    @property
+    def monthly_savings(self) -> np.ndarray:
+        """Total savings per month, shape ``(n, months)``."""
+        return self.category_savings.sum(axis=1)
+
+    def summary(self) -> Dict[str, np.ndarray]:
+        return {
+            "npv": self.npv,
+            "irr_annual": self.irr_annual,
+            "payback_months": self.payback_months,
+            "discounted_payback_months": self.discounted_payback_months,
+            "total_savings": self.category_savings.sum(axis=(1, 2)),
+            "total_payments": self.payments.sum(axis=1),
+        }
+
+
+# ---------- Vectorised metrics ---------- #
+
+
+def payback_month(cumulative: np.ndarray) -> np.ndarray:
+    """Month at which each row's cumulative cash flow turns non-negative for good.
+
+    Interpolates linearly inside the crossing month; ``inf`` if the row is
+    still negative at the horizon, 0 if it never goes negative.
+    """
+
+    cumulative = np.atleast_2d(cumulative)
+    horizon = cumulative.shape[1] - 1
+    negative = cumulative < 0
+    any_negative = negative.any(axis=1)
+    # Last negative time point: a later annual payment can dip the
+    # cumulative below zero again, so the first crossing is not enough.
+    last = horizon - np.argmax(negative[:, ::-1], axis=1)
+    rows = np.arange(cumulative.shape[0])
+    nxt = np.minimum(last + 1, horizon)
+    before, after = cumulative[rows, last], cumulative[rows, nxt]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        month = last + (-before) / (after - before)
+    month = np.where(last >= horizon, np.inf, month)
+    return np.where(any_negative, month, 0.0)
+
+
+def irr_monthly(cash_flow: np.ndarray, *, iterations: int = 200) -> np.ndarray:
+    """Monthly IRR of each row by vectorised bisection on ``log(1 + r)``.
+
+    Searches monthly rates between -99.99% and +999,900%; rows whose NPV
+    does not change sign over that range get NaN.
+    """
+
+    cash_flow = np.atleast_2d(cash_flow)
+    t = np.arange(cash_flow.shape[1], dtype=np.float64)
+
+    def npv_at(x: np.ndarray) -> np.ndarray:
+        return (cash_flow * np.exp(-x[:, None] * t)).sum(axis=1)
+
+    lo = np.full(cash_flow.shape[0], np.log(1e-4))
+    hi = np.full(cash_flow.shape[0], np.log(1e4))
+    npv_lo, npv_hi = npv_at(lo), npv_at(hi)
+    valid = np.sign(npv_lo) * np.sign(npv_hi) < 0
+    for _ in range(iterations):
+        mid = 0.5 * (lo + hi)
+        npv_mid = npv_at(mid)
+        same_as_lo = np.sign(npv_mid) == np.sign(npv_lo)
+        lo = np.where(same_as_lo, mid, lo)
+        npv_lo = np.where(same_as_lo, npv_mid, npv_lo)
+        hi = np.where(same_as_lo, hi, mid)
+    return np.where(valid, np.expm1(0.5 * (lo + hi)), np.nan)
+
+
+def _payments(annual_price: Any, n: int, settings: ProjectionSettings) -> np.ndarray:
+    price = np.broadcast_to(np.asarray(annual_price, dtype=np.float64), (n,))
+    payments = np.zeros((n, settings.months + 1))
+    years = np.arange(0, settings.months, 12)
+    payments[:, years] = price[:, None] * (1 + settings.price_escalation) ** (years / 12)
+    return payments
+
+
+def cumulative_cash_flow(
+    total_annual: Any,
+    annual_price: Any,
+    settings: ProjectionSettings = ProjectionSettings(),
+    *,
+    discounted: bool = False,
+) -> np.ndarray:
+    """Cumulative net cash flow ``(n, months + 1)`` from total annual savings.
+
+    The lightweight core of :func:`project` (no per-category curves or
+    IRR), for callers that evaluate many candidate prices or multipliers.
+    """
+
+    total_annual = np.atleast_1d(np.asarray(total_annual, dtype=np.float64))
+    cash_flow = -_payments(annual_price, total_annual.shape[0], settings)
+    cash_flow[:, 1:] += (total_annual / 12)[:, None] * settings.adoption()
+    if discounted:
+        cash_flow *= settings.discount_factors()
+    return np.cumsum(cash_flow, axis=1)
+
+
+def project(
+    category_annual: Any,
+    annual_price: Any,
+    settings: ProjectionSettings = ProjectionSettings(),
+) -> Projection:
+    """Project rows of annual per-category savings against an annual price.
+
+    *category_annual* is ``(n, len(CATEGORIES))`` (e.g.
+    :meth:`results.SavingsResult.category_totals`); *annual_price* is a
+    scalar or ``(n,)``.
+    """
+
+    category_annual = np.atleast_2d(np.asarray(category_annual, dtype=np.float64))
+    category_savings = (category_annual / 12)[:, :, None] * settings.adoption()
+    payments = _payments(annual_price, category_annual.shape[0], settings)
+
+    cash_flow = -payments
+    cash_flow[:, 1:] += category_savings.sum(axis=1)
+    discounted = cash_flow * settings.discount_factors()
+    cumulative = np.cumsum(cash_flow, axis=1)
+    discounted_cumulative = np.cumsum(discounted, axis=1)
+
+    return Projection(
+        settings=settings,
+        category_savings=category_savings,
+        payments=payments,
+        cash_flow=cash_flow,
+        cumulative=cumulative,
+        discounted_cumulative=discounted_cumulative,
+        npv=discounted_cumulative[:, -1],
+        irr_annual=(1 + irr_monthly(cash_flow)) ** 12 - 1,
+        payback_months=payback_month(cumulative),
+        discounted_payback_months=payback_month(discounted_cumulative),
+    )
+
+
+def project_tiers(
+    tiers: Sequence[str] | None = None,
+    scenarios: Mapping[str, float] | None = None,
+    settings: ProjectionSettings = ProjectionSettings(),
+    *,
+    prices: Mapping[str, float] | None = None,
+    impact: Mapping[str, float] | None = None,
+    profiles: Mapping[str, Mapping[str, Any]] | None = None,
+) -> Tuple[List[Tuple[str, str]], Projection]:
+    """Project every tier × scenario in one pass.
+
+    Returns ``(labels, projection)`` where ``labels[i]`` is the
+    ``(tier, scenario)`` of projection row *i*.  *prices* overrides a tier's
+    target annual price; *impact* replaces ``OPERETA_IMPACT`` as the
+    assumptions each scenario multiplier scales; *profiles* replaces a
+    tier's ``TIER_DATA`` entry (e.g. with :func:`tiers.tier_config_for`).
+    """
+
+    tiers = list(tiers or TIER_DATA)
+    scenarios = dict(scenarios or SCENARIOS)
+    labels = [(tier, scenario) for tier in tiers for scenario in scenarios]
+
+    profiles = {**TIER_DATA, **(profiles or {})}
+    per_tier = [tier_inputs(profiles[tier]) for tier in tiers]
+    repeat = len(scenarios)
+    inputs = {
+        name: np.repeat([row[name] for row in per_tier], repeat).astype(np.float64)
+        for name in per_tier[0]
+    }
+    multiplier = np.tile(np.fromiter(scenarios.values(), dtype=np.float64), len(tiers))
+    savings = compute_all_savings_batch(
+        inputs, impact={k: v * multiplier for k, v in (impact or OPERETA_IMPACT).items()}
+    )
+    prices = prices or {}
+    price = np.repeat(
+        [prices.get(tier, profiles[tier]["opereta_target_annual_price"]) for tier in tiers], repeat
+    ).astype(np.float64)
+
+    category_annual = SavingsResult.from_batch(savings).category_totals()
+    return labels, project(category_annual, price, settings)
+
+
+# ---------- Export ---------- #
+
+
+def export_frames(labels: Sequence[Tuple[str, str]], projection: Projection) -> Dict[str, Any]:
+    """``summary`` (one row per label) and long ``monthly`` DataFrames."""
+    import pandas as pd
+
+    index = pd.DataFrame(labels, columns=["tier", "scenario"])
+    summary = pd.concat([index, pd.DataFrame(projection.summary())], axis=1)
+
+    n, months = len(labels), projection.settings.months
+    monthly = pd.DataFrame(
+        {
+            "tier": np.repeat(index["tier"].to_numpy(), months + 1),
+            "scenario": np.repeat(index["scenario"].to_numpy(), months + 1),
+            "month": np.tile(np.arange(months + 1), n),
+            "payment": projection.payments.ravel(),
+            "net_cash_flow": projection.cash_flow.ravel(),
+            "cumulative": projection.cumulative.ravel(),
+            "discounted_cumulative": projection.discounted_cumulative.ravel(),
+        }
+    )
+    savings = np.concatenate(
+        [np.zeros((n, len(CATEGORIES), 1)), projection.category_savings], axis=2
+    )
+    for j, category in enumerate(CATEGORIES):
+        monthly[category] = savings[:, j, :].ravel()
+    return {"summary": summary, "monthly": monthly}
+
+
+def main(argv: List[str] | None = None) -> int:
+    defaults = ProjectionSettings()
+    parser = argparse.ArgumentParser(description="Export cash-flow projections for every tier and scenario.")
+    parser.add_argument("out_dir")
+    parser.add_argument("--months", type=int, default=defaults.months)
+    parser.add_argument("--ramp-months", type=int, default=defaults.ramp_months)
+    parser.add_argument("--discount-rate", type=float, default=defaults.discount_rate)
+    parser.add_argument("--price-escalation", type=float, default=defaults.price_escalation)
+    args = parser.parse_args(argv)
+
+    settings = ProjectionSettings(
+        months=args.months,
+        ramp_months=args.ramp_months,
+        discount_rate=args.discount_rate,
+        price_escalation=args.price_escalation,
+    )
+    os.makedirs(args.out_dir, exist_ok=True)
+    for name, frame in export_frames(*project_tiers(settings=settings)).items():
+        frame.to_csv(os.path.join(args.out_dir, f"{name}.csv"), index=False)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
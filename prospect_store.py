@@ -0,0 +1,239 @@
+"""prospect_store.py
+Append-only, memory-mapped columnar store of prospect inputs.
+A store is a directory with one raw little-endian float64 file per column
+(``<column>.f64``) and a small ``manifest.json`` holding the committed row
+count and column list.  Readers map the columns with :class:`numpy.memmap`
+and hand them straight to :mod:`batch`, so scoring reads the data
+zero-copy and pages it in on demand instead of parsing it into pandas.
+Appends write past the committed end of every column file and then
+replace the manifest atomically, so readers never see a torn append and
+nothing already stored is rewritten.
+
+Usage::
+
+    python prospect_store.py import prospects.csv prospects.store
+    python prospect_store.py info prospects.store
+    python scoring.py prospects.store scored.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, Iterator, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+from batch import BASELINE_CONSTANTS, INPUT_COLUMNS, compute_all_savings_batch
+from constants import OPERETA_IMPACT
+
+__all__ = [
+    "ProspectStore",
+    "import_file",
+    "is_store",
+]
+
+MANIFEST_NAME = "manifest.json"
+FORMAT_NAME = "opereta-prospect-store"
+FORMAT_VERSION = 1
+PRICE_COLUMN = "annual_price"
+DTYPE = np.dtype("<f8")
+
+REQUIRED_COLUMNS: Tuple[str, ...] = (*INPUT_COLUMNS, PRICE_COLUMN)
+# Optional per-row model overrides (see batch.build_params).
+OVERRIDE_COLUMNS: Tuple[str, ...] = (*OPERETA_IMPACT, *BASELINE_CONSTANTS)
+
+
+def is_store(path: str) -> bool:
+    """Whether *path* is a prospect store directory."""
+    return os.path.isfile(os.path.join(path, MANIFEST_NAME))
+
+
+class ProspectStore:
+    """A prospect store opened at its committed row count.
+
+    The view is a snapshot: rows appended by another process appear after
+    :meth:`refresh`.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.refresh()
+
+    @classmethod
+    def create(cls, path: str, columns: Sequence[str] = REQUIRED_COLUMNS) -> "ProspectStore":
+        """Create an empty store with *columns* (the required ones plus any overrides)."""
+        columns = list(dict.fromkeys(columns))
+        missing = [name for name in REQUIRED_COLUMNS if name not in columns]
+        unknown = [name for name in columns if name not in REQUIRED_COLUMNS and name not in OVERRIDE_COLUMNS]
+        if missing or unknown:
+            raise ValueError(f"Store columns missing {missing}, unknown {unknown}")
+        if is_store(path):
+            raise FileExistsError(f"{path} already holds a prospect store")
+        os.makedirs(path, exist_ok=True)
+        for name in columns:
+            open(os.path.join(path, f"{name}.f64"), "wb").close()
+        _write_manifest(path, {"format": FORMAT_NAME, "version": FORMAT_VERSION, "rows": 0, "columns": columns})
+        return cls(path)
+
+    def refresh(self) -> None:
+        """Re-read the manifest and re-map the columns."""
+        with open(os.path.join(self.path, MANIFEST_NAME), "r") as fh:
+            manifest = json.load(fh)
+        if manifest.get("format") != FORMAT_NAME or manifest.get("version") != FORMAT_VERSION:
+            raise ValueError(f"{self.path} is not a version {FORMAT_VERSION} prospect store")
+        self.rows: int = manifest["rows"]
+        self.columns: Tuple[str, ...] = tuple(manifest["columns"])
+        self._maps: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, f"{name}.f64")
+
+    def column(self, name: str) -> np.ndarray:
+        """Read-only memory map of one column (no data is read until touched)."""
+        if name not in self.columns:
+            raise KeyError(f"{name!r} is not a column of {self.path}")
+        column = self._maps.get(name)
+        if column is None:
+            if self.rows:
+                column = np.memmap(self._file(name), dtype=DTYPE, mode="r", shape=(self.rows,))
+            else:
+                column = np.empty(0, dtype=DTYPE)
+            column = self._maps[name] = column
+        return column
+
+    def data(self, start: int = 0, stop: int | None = None) -> Dict[str, np.ndarray]:
+        """Zero-copy column slices ``[start, stop)``, ready for :func:`batch.build_params`."""
+        return {name: self.column(name)[start:stop] for name in self.columns}
+
+    def iter_chunks(self, chunk_size: int) -> Iterator[Dict[str, np.ndarray]]:
+        for start in range(0, self.rows, chunk_size):
+            yield self.data(start, start + chunk_size)
+
+    def iter_frames(self, chunk_size: int) -> Iterator[Any]:
+        """:meth:`iter_chunks` as DataFrames backed by the same mapped memory."""
+        import pandas as pd
+
+        for chunk in self.iter_chunks(chunk_size):
+            yield pd.DataFrame(chunk, copy=False)
+
+    def compute_savings(
+        self, start: int = 0, stop: int | None = None, **kwargs: Any
+    ) -> Dict[str, np.ndarray]:
+        """:func:`batch.compute_all_savings_batch` straight off the mapped columns."""
+        return compute_all_savings_batch(self.data(start, stop), **kwargs)
+
+    # ---------- Writing ---------- #
+
+    def append(self, data: Mapping[str, Any]) -> int:
+        """Append rows (a dict of equal-length arrays or a DataFrame); returns the new row count.
+
+        Every store column must be present; other keys raise ``ValueError``.
+        Only one process may append at a time.
+        """
+
+        keys = list(data.keys())
+        missing = [name for name in self.columns if name not in keys]
+        extra = [name for name in keys if name not in self.columns]
+        if missing or extra:
+            raise ValueError(f"Append to {self.path} is missing {missing} and has unexpected {extra}")
+        arrays = [np.ascontiguousarray(np.asarray(data[name], dtype=DTYPE)) for name in self.columns]
+        n = len(arrays[0])
+        if any(array.shape != (n,) for array in arrays):
+            raise ValueError("Appended columns must be 1-D and of equal length")
+
+        with open(os.path.join(self.path, MANIFEST_NAME), "r") as fh:
+            manifest = json.load(fh)
+        committed = manifest["rows"] * DTYPE.itemsize
+        for name, array in zip(self.columns, arrays):
+            with open(self._file(name), "r+b") as fh:
+                fh.truncate(committed)  # drop the tail of an interrupted append
+                fh.seek(committed)
+                fh.write(array.tobytes())
+                fh.flush()
+                os.fsync(fh.fileno())
+        manifest["rows"] += n
+        _write_manifest(self.path, manifest)  # commit point
+        self.refresh()
+        return self.rows
+
+
+def _write_manifest(path: str, manifest: Mapping[str, Any]) -> None:
+    final_path = os.path.join(path, MANIFEST_NAME)
+    tmp_path = f"{final_path}.tmp-{os.getpid()}"
+    with open(tmp_path, "w") as fh:
+        json.dump(manifest, fh, indent=2)
+    os.replace(tmp_path, final_path)
+
+
+def import_file(in_path: str, store_path: str, *, chunk_size: int = 200_000) -> Dict[str, Any]:
+    """Append a prospect CSV/Parquet file to a store, creating it if needed.
+
+    ``annual_hires_percent`` is converted to whole ``annual_hires`` like
+    :func:`scoring.score_frame` does; columns that are neither inputs, the
+    price nor impact/baseline overrides (e.g. account names) are skipped.
+    """
+
+    from scoring import iter_prospect_chunks
+
+    store = ProspectStore(store_path) if is_store(store_path) else None
+    skipped: List[str] = []
+    started = time.perf_counter()
+    for chunk in iter_prospect_chunks(in_path, chunk_size):
+        if "annual_hires" not in chunk.columns and "annual_hires_percent" in chunk.columns:
+            chunk = chunk.assign(
+                annual_hires=np.floor(chunk["num_employees"].to_numpy(np.float64) * chunk["annual_hires_percent"])
+            )
+        if store is None:
+            columns = [*REQUIRED_COLUMNS, *(name for name in OVERRIDE_COLUMNS if name in chunk.columns)]
+            store = ProspectStore.create(store_path, columns)
+        missing = [name for name in store.columns if name not in chunk.columns]
+        if missing:
+            raise ValueError(f"{in_path} is missing store columns {missing}")
+        skipped.extend(name for name in chunk.columns if name not in store.columns and name not in skipped)
+        store.append({name: chunk[name].to_numpy() for name in store.columns})
+    if store is None:
+        raise ValueError(f"{in_path} holds no rows")
+    return {
+        "rows": len(store),
+        "columns": list(store.columns),
+        "skipped": [name for name in skipped if name != "annual_hires_percent"],
+        "seconds": time.perf_counter() - started,
+    }
+
+
+# ---------- CLI ---------- #
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Build and inspect memory-mapped prospect stores.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    importer = commands.add_parser("import", help="Append a CSV/Parquet prospect file to a store")
+    importer.add_argument("input")
+    importer.add_argument("store")
+    importer.add_argument("--chunk-size", type=int, default=200_000)
+    info = commands.add_parser("info", help="Print a store's manifest")
+    info.add_argument("store")
+    args = parser.parse_args(argv)
+
+    if args.command == "import":
+        stats = import_file(args.input, args.store, chunk_size=args.chunk_size)
+        print(
+            f"Stored {stats['rows']:,} rows in {args.store} ({stats['seconds']:.1f}s)"
+            + (f"; skipped columns: {', '.join(stats['skipped'])}" if stats["skipped"] else ""),
+            file=sys.stderr,
+        )
+    else:
+        store = ProspectStore(args.store)
+        print(json.dumps({"path": store.path, "rows": len(store), "columns": list(store.columns)}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
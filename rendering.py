@@ -0,0 +1,141 @@
+"""rendering.py
+Cached HTML fragments for the investor app.
+The static copy (category explanations, formula notes) lives here at module
+level instead of being rebuilt on every Streamlit rerun, and the rendered
+HTML for each breakdown card, savings table and metric card is memoised on
+its inputs.  A fragment is therefore built once per distinct result and
+reused across reruns and sessions on the same server.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from html import escape
+from typing import Any, Dict, Tuple
+
+from formulas import category_markdown
+from results import SavingsResult
+
+__all__ = [
+    "CATEGORY_EXPLANATIONS",
+    "FORMULAS_LOOKUP",
+    "category_card_html",
+    "category_table_html",
+    "metric_card_html",
+    "savings_table_html",
+]
+
+# ---------- Static copy ---------- #
+
+# Representative text taken from the Value Generation Framework markdown.
+CATEGORY_EXPLANATIONS: Dict[str, Dict[str, Any]] = {
+    "1. Hiring Process Optimization": {
+        "problem": "**The Problem:** Businesses face lengthy time-to-fill (avg. 44 days), high cost-per-hire (avg. $4,700), and massive recruiter workloads (e.g., 67% spend 30 mins-2 hours to schedule one interview). This leads to lost productivity valued at tens of thousands per vacancy.",
+        "solution": "**Opereta's Impact:** By optimizing sourcing, screening, and scheduling, Opereta reduces time-to-fill (by ~25-30% based on AI platform benchmarks), increases recruiter capacity (saving ~11 hours/week/recruiter), and lowers direct hiring costs (e.g., reducing agency reliance).",
+        "areas": ["Reduced Time-to-Fill", "Increased Recruiter Productivity", "Lower Cost-Per-Hire"]
+    },
+    "2. Enhanced Hiring Quality": {
+        "problem": "**The Problem:** Mis-hires are common (75% of employers admit to them) and costly, ranging from $17,000 to 30% of first-year salary. Poor hires also drag down team performance (managers spend ~17% of time on underperformers) and fuel early turnover.",
+        "solution": "**Opereta's Impact:** AI-driven matching and assessment improve quality-of-hire, directly reducing mis-hire rates and associated costs. Better hires lead to higher productivity (top talent can be 8x more productive) and improved retention.",
+        "areas": ["Reduced Mis-Hire Costs"]
+    },
+    "3. Strategic Role Alignment": {
+        "problem": "**The Problem:** 'Shift shock' from poorly defined roles causes early attrition (43% of early leavers cite mismatched expectations). Misalignment with business strategy (a challenge for 71% of orgs) leads to talent not being optimally deployed and strategic initiatives stalling.",
+        "solution": "**Opereta's Impact:** Opereta ensures precise role definitions based on success-driving skills and aligns talent to strategic value. This reduces early turnover from role ambiguity and ensures human capital is deployed effectively, improving strategy execution.",
+        "areas": ["Lower Early Attrition (Role Clarity)"]
+    },
+    "4. Optimized Interviewing": {
+        "problem": "**The Problem:** Interview processes are often lengthy (avg. 23 days) and time-consuming for managers (e.g., ~21% more interviewer hours per hire recently). Unstructured interviews have low predictive validity, contributing to mis-hires, and a poor candidate experience can lose top talent (53% cite bad questions as a deal-breaker).",
+        "solution": "**Opereta's Impact:** Opereta streamlines interview scheduling (saving hours per interview), enables structured, data-driven assessments to improve predictive quality, and reduces the overall interview load on hiring teams, while enhancing candidate experience.",
+        "areas": ["Efficient Interview Scheduling"]
+    },
+    "5. Accelerated Onboarding": {
+        "problem": "**The Problem:** New hires take an average of 8 months to reach full productivity, representing significant lost output. Poor onboarding leads to high early turnover (20% in first 45 days) because only 12% of employees feel their company excels at it.",
+        "solution": "**Opereta's Impact:** Opereta provides structured, personalized onboarding experiences that can improve new hire productivity by ~50% and significantly increase retention (strong onboarding can retain 50% more new hires), getting employees to contribute value faster.",
+        "areas": ["Faster Time-to-Productivity"]
+    },
+    "6. Improved Internal Mobility": {
+        "problem": "**The Problem:** Low internal fill rates (avg. 24%) mean companies over-rely on costly external hires (18% salary premium, plus recruiting costs). Lack of visibility into internal skills leads to skill gaps and high turnover from employees seeing no growth paths (companies with high mobility retain employees 41% longer).",
+        "solution": "**Opereta's Impact:** Opereta's talent marketplace provides visibility into internal skills, boosting internal fill rates (e.g., by 30%+), saving significantly on external hiring costs, filling roles faster, and retaining top talent by offering clear career pathways.",
+        "areas": ["Increased Internal Fill Rate & Cost Savings"]
+    },
+    "7. Effective Performance & Development": {
+        "problem": "**The Problem:** Traditional performance reviews are often ineffective (90% fail to improve performance), yet time-consuming (managers spend ~210 hours/year). This leads to skill stagnation, disengagement (only 21% globally engaged), and turnover (24% would quit due to poor PM).",
+        "solution": "**Opereta's Impact:** Opereta facilitates continuous, AI-backed performance management and development. This increases productivity (engaged teams are ~12-21% more productive/profitable), reduces turnover (by ~15%+ through regular feedback), and builds a stronger talent pipeline.",
+        "areas": ["Productivity Gains from Engaged PM", "Reduced Turnover (Better Growth Paths)"]
+    },
+    "8. Strategic Workforce Planning": {
+        "problem": "**The Problem:** Lack of workforce foresight (71% struggle to align workforce to strategy) leads to costly reactive decisions like talent shortages or overstaffing. Skills gaps alone can cost enterprises ~$59M/year per enterprise in lost productivity.",
+        "solution": "**Opereta's Impact:** Opereta enables proactive, AI-driven SWP, helping predict future talent needs, optimize workforce size/mix, and bridge skill gaps through reskilling (1/6th cost of hiring new). This can save 5-7% of labor budget annually and ensure strategic readiness.",
+        "areas": ["Optimized Labor Budget & Skill Deployment"]
+    }
+}
+
+# Markdown notes shown under each category table, generated from the formula
+# declarations so they always match the engine.
+FORMULAS_LOOKUP: Dict[str, str] = {category: category_markdown(category) for category in CATEGORY_EXPLANATIONS}
+
+
+# ---------- Fragments ---------- #
+
+_TABLE_STYLE = "width:100%; border-collapse: collapse;"
+_TH_STYLE = "text-align: left; padding: 8px; background-color: #f2f2f2; border-bottom: 2px solid #ddd;"
+_TD_STYLE = "text-align: left; padding: 8px; border-top: 1px solid #ddd;"
+
+
+@lru_cache(maxsize=None)
+def category_card_html(category: str) -> str:
+    """Heading plus problem / impact panels for one breakdown category."""
+    explanation = CATEGORY_EXPLANATIONS[category]
+    return f"""
+            <div style="margin-bottom: 30px; background-color: white; padding: 20px; border-radius: 10px; box-shadow: 0 2px 4px rgba(0,0,0,0.05);">
+                <h3 style="color: #0e5394; border-bottom: 1px solid #e0e0e0; padding-bottom: 10px;">{category}</h3>
+                <div style="margin: 15px 0;">
+                    <div style="margin-bottom: 15px; background-color: #fafafa; padding: 15px; border-left: 4px solid #ff6b6b; border-radius: 4px;">
+                        {explanation["problem"]}
+                    </div>
+                    <div style="background-color: #f0f8ff; padding: 15px; border-left: 4px solid #0e5394; border-radius: 4px;">
+                        {explanation["solution"]}
+                    </div>
+                </div>
+            """
+
+
+@lru_cache(maxsize=4096)
+def savings_table_html(areas: Tuple[str, ...], amounts: Tuple[float, ...]) -> str:
+    """Styled "Projected Savings in This Category" table."""
+    rows = "".join(
+        f'<tr><td style="{_TD_STYLE}">{escape(area)}</td>'
+        f'<td style="{_TD_STYLE}">${amount:,.0f}</td></tr>'
+        for area, amount in zip(areas, amounts)
+    )
+    return f"""
+            <div style="margin-top: 15px;">
+                <h4 style="font-size: 1rem; margin-bottom: 10px;">Projected Savings in This Category:</h4>
+                <div style="max-height: 200px; overflow-y: auto;">
+                    <table style="{_TABLE_STYLE}" class="dataframe">
+                    <thead><tr><th style="{_TH_STYLE}">Area</th><th style="{_TH_STYLE}">Annual Savings ($)</th></tr></thead>
+                    <tbody>{rows}</tbody>
+                    </table>
+                </div>
+            </div>
+            """
+
+
+def category_table_html(result: SavingsResult, category: str) -> str:
+    """:func:`savings_table_html` for one category of a single-prospect result."""
+    areas, amounts = result.for_category(category)
+    return savings_table_html(areas, tuple(amounts.tolist()))
+
+
+@lru_cache(maxsize=1024)
+def metric_card_html(label: str, value: str, note: str, value_color: str | None = None) -> str:
+    """One of the headline metric cards (Total Annual Value, ROI, ...)."""
+    value_style = f' style="color: {value_color};"' if value_color else ""
+    return f"""
+    <div style="background-color: white; padding: 20px; border-radius: 10px; box-shadow: 0 4px 6px rgba(0,0,0,0.1); height: 100%;">
+        <p class="metric-label">{label}</p>
+        <p class="metric-value"{value_style}>{value}</p>
+        <p style="font-size: 0.9rem; color: #596e79;">{note}</p>
+    </div>
+    """
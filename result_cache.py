@@ -0,0 +1,339 @@
+"""result_cache.py
+Persistent, content-addressed result cache shared across processes.
+Results are pickled into a SQLite database (WAL mode, so many readers and
+one writer at a time across Streamlit replicas and batch workers) under a
+key hashing the call's namespace, its canonical-JSON arguments and a
+fingerprint of ``constants.py`` and the model modules.  Editing any of them
+changes every key, so stale results are never served; old entries simply
+age out under the LRU limits.
+
+Set ``OPERETA_RESULT_CACHE=0`` to bypass it and ``OPERETA_CACHE_DIR`` to
+move it.  ``python result_cache.py stats`` prints the counters.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Mapping, Tuple, TypeVar
+
+__all__ = [
+    "ResultCache",
+    "cached_call",
+    "fingerprint",
+    "result_key",
+    "shared_cache",
+]
+
+T = TypeVar("T")
+
+_ROOT = os.path.dirname(os.path.abspath(__file__))
+# Sources whose edits invalidate every cached result.
+FINGERPRINT_FILES = (
+    "constants.py",
+    "calculations.py",
+    "batch.py",
+    "results.py",
+    "model_terms.py",
+    "simulation.py",
+    "sensitivity.py",
+    "projection.py",
+    "formulas.py",
+)
+
+DEFAULT_MAX_ENTRIES = 50_000
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+COUNTERS = ("hits", "misses", "writes", "evictions")
+# Read-side bookkeeping (LRU recency, hit/miss counters) is buffered per
+# instance and written at most this often, or with the next ``set``.
+FLUSH_INTERVAL = 5.0
+
+_fingerprint: str | None = None
+
+
+def fingerprint() -> str:
+    """Short hash of :data:`FINGERPRINT_FILES` (computed once per process)."""
+    global _fingerprint
+    if _fingerprint is None:
+        digest = hashlib.sha256()
+        for name in FINGERPRINT_FILES:
+            with open(os.path.join(_ROOT, name), "rb") as fh:
+                digest.update(name.encode() + b"\0" + fh.read())
+        _fingerprint = digest.hexdigest()[:16]
+    return _fingerprint
+
+
+def result_key(namespace: str, arguments: Mapping[str, Any]) -> str:
+    """Stable key for *namespace* called with *arguments*.
+
+    Arguments are serialised as sorted-key JSON, so dict ordering does not
+    matter; numbers keep their exact ``repr``.
+    """
+    payload = json.dumps(
+        [namespace, fingerprint(), arguments], sort_keys=True, separators=(",", ":"), default=float
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResultCache:
+    """SQLite-backed LRU of pickled values.
+
+    Bounded by entry count and total pickled bytes; the least recently read
+    entries are evicted first.  Counters are kept both per instance
+    (``local``) and in the database (``shared``, summed over all processes).
+    Reads are plain SELECTs; their recency updates and counters are flushed
+    in batches, best-effort, so readers never wait on the write lock.
+    Only open caches you trust: values are unpickled on read.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        timeout: float = 10.0,
+    ) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.local: Dict[str, int] = dict.fromkeys(COUNTERS, 0)
+        self._counter_lock = threading.Lock()
+        self._accessed: Dict[str, float] = {}  # unflushed read recency
+        self._unflushed: Dict[str, int] = dict.fromkeys(COUNTERS, 0)
+        self._last_flush = time.monotonic()
+        self._thread = threading.local()  # sqlite3 connections are per thread
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL,"
+                " created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+            db.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            db.executemany("INSERT OR IGNORE INTO counters VALUES (?, 0)", [(c,) for c in COUNTERS])
+
+    def _connect(self) -> sqlite3.Connection:
+        db = getattr(self._thread, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._thread.db = db
+        return db
+
+    def _count(self, db: sqlite3.Connection, name: str, n: int = 1) -> None:
+        with self._counter_lock:
+            self.local[name] += n
+        db.execute("UPDATE counters SET value = value + ? WHERE name = ?", (n, name))
+
+    def _note_read(self, key: str | None, counter: str) -> None:
+        with self._counter_lock:
+            self.local[counter] += 1
+            self._unflushed[counter] += 1
+            if key is not None:
+                self._accessed[key] = time.time()
+            due = time.monotonic() - self._last_flush >= FLUSH_INTERVAL
+        if due:
+            self.flush(wait=False)
+
+    def _write_reads(self, db: sqlite3.Connection) -> Tuple[Dict[str, float], Dict[str, int]]:
+        """Move buffered read bookkeeping into the caller's write transaction.
+
+        Returns what was taken so a caller that rolls back can hand it to
+        :meth:`_restore_reads`.
+        """
+        with self._counter_lock:
+            accessed, self._accessed = self._accessed, {}
+            counts, self._unflushed = self._unflushed, dict.fromkeys(COUNTERS, 0)
+            self._last_flush = time.monotonic()
+        taken = (accessed, counts)
+        try:
+            db.executemany("UPDATE entries SET accessed = ? WHERE key = ?", [(t, k) for k, t in accessed.items()])
+            db.executemany(
+                "UPDATE counters SET value = value + ? WHERE name = ?", [(n, c) for c, n in counts.items() if n]
+            )
+        except BaseException:
+            self._restore_reads(*taken)
+            raise
+        return taken
+
+    def _restore_reads(self, accessed: Dict[str, float], counts: Dict[str, int]) -> None:
+        with self._counter_lock:
+            for key, when in accessed.items():
+                self._accessed.setdefault(key, when)
+            for name, n in counts.items():
+                self._unflushed[name] += n
+
+    def flush(self, *, wait: bool = True) -> bool:
+        """Write buffered read bookkeeping; without *wait*, give up if the database is locked."""
+        with self._counter_lock:
+            if not self._accessed and not any(self._unflushed.values()):
+                self._last_flush = time.monotonic()
+                return True
+        db = self._connect()
+        if not wait:
+            db.execute("PRAGMA busy_timeout = 0")
+        try:
+            db.execute("BEGIN IMMEDIATE")
+        except sqlite3.OperationalError:
+            with self._counter_lock:
+                self._last_flush = time.monotonic()  # retry after the next interval
+            return False
+        finally:
+            if not wait:
+                db.execute(f"PRAGMA busy_timeout = {int(self.timeout * 1000)}")
+        taken = None
+        try:
+            taken = self._write_reads(db)
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            if taken is not None:
+                self._restore_reads(*taken)
+            if wait:
+                raise
+            return False
+        return True
+
+    # ---------- Access ---------- #
+
+    def get(self, key: str, default: Any = None) -> Any:
+        db = self._connect()
+        row = db.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is not None:
+            try:
+                value = pickle.loads(row[0])
+            except Exception:
+                # Written by an incompatible version of a result class.
+                row = None
+                try:
+                    db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                except sqlite3.OperationalError:
+                    pass  # overwritten by the next set() anyway
+        if row is None:
+            self._note_read(None, "misses")
+            return default
+        self._note_read(key, "hits")
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        now = time.time()
+        db = self._connect()
+        db.execute("BEGIN IMMEDIATE")  # one writer at a time across processes
+        taken = None
+        try:
+            db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)", (key, blob, len(blob), now, now)
+            )
+            self._count(db, "writes")
+            taken = self._write_reads(db)
+            self._evict(db)
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            if taken is not None:
+                self._restore_reads(*taken)
+            raise
+
+    def _evict(self, db: sqlite3.Connection) -> None:
+        entries, size = db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        excess = max(entries - self.max_entries, 0)
+        if size > self.max_bytes:
+            # Oldest entries needed to bring the total under the byte budget.
+            over_budget, freed = 0, 0
+            for (entry_size,) in db.execute("SELECT size FROM entries ORDER BY accessed"):
+                freed += entry_size
+                over_budget += 1
+                if size - freed <= self.max_bytes:
+                    break
+            excess = max(excess, over_budget)
+        if excess:
+            db.execute(
+                "DELETE FROM entries WHERE key IN (SELECT key FROM entries ORDER BY accessed LIMIT ?)",
+                (excess,),
+            )
+            self._count(db, "evictions", excess)
+
+    def get_or_compute(self, key: str, compute: Callable[[], T]) -> T:
+        missing = object()
+        try:
+            value = self.get(key, missing)
+        except sqlite3.OperationalError:
+            value = missing  # locked or busy database: treat as a miss
+        if value is missing:
+            value = compute()
+            try:
+                self.set(key, value)
+            except sqlite3.OperationalError:
+                pass  # lock timeout under heavy contention: serve uncached
+        return value
+
+    # ---------- Maintenance ---------- #
+
+    def stats(self) -> Dict[str, Any]:
+        self.flush(wait=False)
+        db = self._connect()
+        entries, size = db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        shared = dict(db.execute("SELECT name, value FROM counters").fetchall())
+        with self._counter_lock:
+            local = dict(self.local)
+        return {"path": self.path, "entries": entries, "bytes": size, "local": local, "shared": shared}
+
+    def clear(self) -> None:
+        db = self._connect()
+        db.execute("DELETE FROM entries")
+        db.execute("UPDATE counters SET value = 0")
+
+
+_shared: ResultCache | None = None
+_shared_lock = threading.Lock()
+
+
+def shared_cache() -> ResultCache | None:
+    """The process-wide default cache, or ``None`` if disabled by env var."""
+    global _shared
+    if os.environ.get("OPERETA_RESULT_CACHE", "1") == "0":
+        return None
+    if _shared is None:
+        with _shared_lock:
+            if _shared is None:
+                cache_dir = os.environ.get(
+                    "OPERETA_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "opereta")
+                )
+                _shared = ResultCache(os.path.join(cache_dir, "results.sqlite"))
+    return _shared
+
+
+def cached_call(namespace: str, fn: Callable[..., T], **arguments: Any) -> T:
+    """``fn(**arguments)`` through :func:`shared_cache` (direct call if disabled)."""
+    cache = shared_cache()
+    if cache is None:
+        return fn(**arguments)
+    return cache.get_or_compute(result_key(namespace, arguments), lambda: fn(**arguments))
+
+
+def main(argv: List[str] | None = None) -> int:
+    command = (argv if argv is not None else sys.argv[1:]) or ["stats"]
+    cache = shared_cache()
+    if cache is None:
+        print("Result cache disabled (OPERETA_RESULT_CACHE=0)", file=sys.stderr)
+        return 1
+    if command[0] == "clear":
+        cache.clear()
+    print(json.dumps(cache.stats(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,154 @@
+"""results.py
+Compact, array-backed savings results.
+A :class:`SavingsResult` is a float64 vector of line-item amounts (or an
+``(n, len(LINE_ITEMS))`` matrix for many prospects).  Category and area
+labels are interned once at class level and referenced by small integer
+codes, so building, caching and stacking results never copies strings;
+DataFrames are only built on demand.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Mapping, Tuple
+
+import numpy as np
+
+from calculations import LINE_ITEMS, compute_savings_amounts
+
+if TYPE_CHECKING:  # pragma: no cover
+    import pandas as pd
+
+__all__ = [
+    "AREAS",
+    "CATEGORIES",
+    "SavingsResult",
+    "compute_savings_result",
+]
+
+KEYS: Tuple[str, ...] = tuple(key for key, _c, _a in LINE_ITEMS)
+AREAS: Tuple[str, ...] = tuple(area for _k, _c, area in LINE_ITEMS)
+CATEGORIES: Tuple[str, ...] = tuple(dict.fromkeys(category for _k, category, _a in LINE_ITEMS))
+
+# Per line item: index into CATEGORIES.  Items of one category are
+# contiguous, so per-category sums are a single ``reduceat``.
+CATEGORY_CODES = np.array(
+    [CATEGORIES.index(category) for _k, category, _a in LINE_ITEMS], dtype=np.int8
+)
+_CATEGORY_STARTS = np.flatnonzero(np.r_[True, np.diff(CATEGORY_CODES) != 0])
+
+
+class SavingsResult:
+    """Line-item savings for one prospect (1-D) or many (2-D, one row each)."""
+
+    __slots__ = ("amounts",)
+
+    keys = KEYS
+    areas = AREAS
+    categories = CATEGORIES
+    category_codes = CATEGORY_CODES
+
+    def __init__(self, amounts: Any) -> None:
+        amounts = np.asarray(amounts, dtype=np.float64)
+        if amounts.shape[-1:] != (len(KEYS),) or amounts.ndim > 2:
+            raise ValueError(
+                f"amounts must have shape ({len(KEYS)},) or (n, {len(KEYS)}), got {amounts.shape}"
+            )
+        self.amounts = amounts
+
+    # ---------- Construction ---------- #
+
+    @classmethod
+    def from_batch(cls, columns: Mapping[str, np.ndarray]) -> "SavingsResult":
+        """Wrap the wide dict returned by :func:`batch.compute_all_savings_batch`."""
+        return cls(np.column_stack([columns[key] for key in KEYS]))
+
+    @classmethod
+    def stack(cls, results: Iterable["SavingsResult"]) -> "SavingsResult":
+        """Concatenate single or stacked results into one 2-D result."""
+        return cls(np.vstack([np.atleast_2d(r.amounts) for r in results]))
+
+    # ---------- Aggregates ---------- #
+
+    @property
+    def total(self) -> Any:
+        """Total annual savings (float, or one per row).
+
+        Summed left to right so it matches ``compute_all_savings`` exactly.
+        """
+        total = self.amounts[..., 0].copy()
+        for j in range(1, len(KEYS)):
+            total += self.amounts[..., j]
+        return float(total) if self.amounts.ndim == 1 else total
+
+    def category_totals(self) -> np.ndarray:
+        """Savings per entry of :data:`CATEGORIES` (last axis)."""
+        return np.add.reduceat(self.amounts, _CATEGORY_STARTS, axis=-1)
+
+    def for_category(self, category: str) -> Tuple[Tuple[str, ...], np.ndarray]:
+        """Return ``(areas, amounts)`` of one category without any filtering copy."""
+        mask = CATEGORY_CODES == CATEGORIES.index(category)
+        first = int(np.argmax(mask))
+        stop = first + int(mask.sum())
+        return AREAS[first:stop], self.amounts[..., first:stop]
+
+    # ---------- Conversion ---------- #
+
+    def __len__(self) -> int:
+        return 1 if self.amounts.ndim == 1 else self.amounts.shape[0]
+
+    def __getitem__(self, row: int) -> "SavingsResult":
+        if self.amounts.ndim == 1:
+            raise TypeError("A single-prospect SavingsResult cannot be indexed")
+        return SavingsResult(self.amounts[row])
+
+    def to_line_items(self) -> List[Dict[str, float]]:
+        """The legacy list-of-dicts form (single prospect only)."""
+        if self.amounts.ndim != 1:
+            raise TypeError("to_line_items() needs a single-prospect result")
+        return [
+            {"Category": category, "Area": area, "Annual Savings ($)": amount}
+            for (_key, category, area), amount in zip(LINE_ITEMS, self.amounts.tolist())
+        ]
+
+    def to_frame(self) -> "pd.DataFrame":
+        """Long Category/Area frame for one prospect, wide key columns for many."""
+        import pandas as pd
+
+        if self.amounts.ndim == 1:
+            return pd.DataFrame(
+                {
+                    "Category": pd.Categorical.from_codes(CATEGORY_CODES, CATEGORIES),
+                    "Area": AREAS,
+                    "Annual Savings ($)": self.amounts,
+                }
+            )
+        frame = pd.DataFrame(self.amounts, columns=list(KEYS))
+        frame["total_annual_savings"] = self.total
+        return frame
+
+    def __repr__(self) -> str:
+        if self.amounts.ndim == 1:
+            return f"SavingsResult(total={self.total:,.0f})"
+        return f"SavingsResult(n={len(self)})"
+
+
+def compute_savings_result(
+    *,
+    num_employees: int,
+    annual_hires: int,
+    avg_annual_salary: float,
+    avg_recruiter_salary: float,
+    num_recruiters: int,
+    impact: Dict[str, float] | None = None,
+) -> SavingsResult:
+    """``compute_all_savings`` returning a :class:`SavingsResult` instead of dicts."""
+    return SavingsResult(
+        compute_savings_amounts(
+            num_employees=num_employees,
+            annual_hires=annual_hires,
+            avg_annual_salary=avg_annual_salary,
+            avg_recruiter_salary=avg_recruiter_salary,
+            num_recruiters=num_recruiters,
+            impact=impact,
+        )
+    )
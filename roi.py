@@ -0,0 +1,160 @@
+"""roi.py
+Headless ROI queries from the command line.
+Evaluates a tier (or fully custom inputs) under a scenario multiplier and
+prints JSON, without importing Streamlit, NumPy or pandas.  pandas is only
+loaded when ``--format csv`` / ``--format table`` asks for a DataFrame.
+
+Usage::
+
+    python roi.py --tier "Mid-Market" --scenario Conservative
+    python roi.py --tier all --scenario 1.1 --format table
+    python roi.py --employees 2000 --hiring-rate 0.12 --salary 80000 \\
+        --recruiter-salary 72000 --recruiters 6 --price 150000 --line-items
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import sys
+from typing import Any, Dict, List
+
+from calculations import (
+    compute_all_savings,
+    compute_payback_months,
+    compute_roi_percent,
+    tier_inputs,
+)
+from constants import OPERETA_IMPACT, SCENARIOS, TIER_DATA
+
+__all__ = [
+    "evaluate",
+    "parse_scenario",
+]
+
+FORMATS = ("json", "csv", "table")
+
+# CLI flag -> compute_all_savings input it overrides
+_INPUT_FLAGS = {
+    "employees": "num_employees",
+    "salary": "avg_annual_salary",
+    "recruiter_salary": "avg_recruiter_salary",
+    "recruiters": "num_recruiters",
+}
+
+
+def parse_scenario(value: str) -> float:
+    """Scenario multiplier from a number or a (prefix of a) ``SCENARIOS`` label."""
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    matches = [label for label in SCENARIOS if label.lower().startswith(value.lower())]
+    if len(matches) != 1:
+        raise ValueError(f"Unknown scenario {value!r}; use a number or one of {list(SCENARIOS)}")
+    return SCENARIOS[matches[0]]
+
+
+def _finite_or_none(value: float) -> float | None:
+    # JSON has no infinity; an unbounded ROI / payback is reported as null.
+    return value if math.isfinite(value) else None
+
+
+def evaluate(
+    inputs: Dict[str, float],
+    annual_price: float,
+    *,
+    scenario_multiplier: float = 1.0,
+    line_items: bool = False,
+) -> Dict[str, Any]:
+    """Savings, ROI and payback for one set of ``compute_all_savings`` inputs."""
+    impact = {k: v * scenario_multiplier for k, v in OPERETA_IMPACT.items()}
+    items, total = compute_all_savings(**inputs, impact=impact)
+    record: Dict[str, Any] = {
+        "scenario_multiplier": scenario_multiplier,
+        **inputs,
+        "annual_price": annual_price,
+        "total_annual_savings": total,
+        "roi_percent": _finite_or_none(compute_roi_percent(total, annual_price)),
+        "payback_months": _finite_or_none(compute_payback_months(total, annual_price)),
+    }
+    if line_items:
+        record["line_items"] = items
+    return record
+
+
+def _records(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    if args.tier is None:
+        missing = [f"--{flag.replace('_', '-')}" for flag in _INPUT_FLAGS if getattr(args, flag) is None]
+        if args.price is None:
+            missing.append("--price")
+        if args.annual_hires is None and args.hiring_rate is None:
+            missing.append("--annual-hires or --hiring-rate")
+        if missing:
+            raise ValueError(f"Without --tier these inputs are required: {', '.join(missing)}")
+    tiers = list(TIER_DATA) if args.tier == "all" else [args.tier]
+
+    records = []
+    for tier_name in tiers:
+        tier_config = TIER_DATA[tier_name] if tier_name is not None else {}
+        inputs = tier_inputs(tier_config) if tier_config else {}
+        for flag, name in _INPUT_FLAGS.items():
+            if getattr(args, flag) is not None:
+                inputs[name] = getattr(args, flag)
+        if args.annual_hires is not None:
+            inputs["annual_hires"] = args.annual_hires
+        elif args.hiring_rate is not None or args.employees is not None:
+            rate = args.hiring_rate if args.hiring_rate is not None else tier_config["annual_hires_percent"]
+            inputs["annual_hires"] = int(inputs["num_employees"] * rate)
+        price = args.price if args.price is not None else tier_config["opereta_target_annual_price"]
+
+        record = evaluate(
+            inputs, price, scenario_multiplier=args.scenario, line_items=args.line_items
+        )
+        records.append({"tier": tier_name, **record})
+    return records
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Evaluate Opereta ROI for a tier or custom inputs.")
+    parser.add_argument("--tier", choices=[*TIER_DATA, "all"], help="Tier defaults to start from ('all' for every tier)")
+    parser.add_argument("--scenario", type=parse_scenario, default=1.0,
+                        help="Impact multiplier or scenario name, e.g. 0.8 or 'Conservative' (default 1.0)")
+    parser.add_argument("--price", type=float, help="Opereta annual price (default: tier target price)")
+    parser.add_argument("--employees", type=int)
+    parser.add_argument("--hiring-rate", type=float, help="Annual hires as a fraction of employees")
+    parser.add_argument("--annual-hires", type=int)
+    parser.add_argument("--salary", type=float, help="Average annual salary")
+    parser.add_argument("--recruiter-salary", type=float)
+    parser.add_argument("--recruiters", type=int)
+    parser.add_argument("--line-items", action="store_true", help="Include every savings line item")
+    parser.add_argument("--format", choices=FORMATS, default="json")
+    args = parser.parse_args(argv)
+
+    try:
+        records = _records(args)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    if args.format == "json":
+        payload: Any = records[0] if len(records) == 1 else records
+        json.dump(payload, sys.stdout, indent=2)
+        print()
+        return 0
+
+    import pandas as pd  # only needed for tabular output
+
+    if args.line_items:
+        frame = pd.json_normalize(records, record_path="line_items", meta=["tier", "scenario_multiplier"])
+    else:
+        frame = pd.DataFrame(records)
+    if args.format == "csv":
+        frame.to_csv(sys.stdout, index=False)
+    else:
+        print(frame.to_string(index=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,236 @@
+"""scoring.py
+Headless, bounded-memory scoring of prospect files.
+Reads a CSV or Parquet file one row-chunk at a time, scores each chunk with
+the vectorised engine in :mod:`batch` (same formulas as
+``compute_all_savings`` plus the app's ROI / payback logic) and writes it
+out before reading the next, so memory stays flat for any file size.
+
+Usage::
+
+    python scoring.py prospects.csv scored.csv --chunk-size 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from typing import Any, Dict, Iterator, List
+
+import numpy as np
+import pandas as pd
+
+from batch import TOTAL_COLUMN, compute_all_savings_batch, payback_months_batch, roi_percent_batch
+from calculations import LINE_ITEMS
+
+__all__ = [
+    "iter_prospect_chunks",
+    "score_file",
+    "score_frame",
+]
+
+PRICE_COLUMN = "annual_price"
+
+
+def _is_parquet(path: str) -> bool:
+    return os.path.splitext(path)[1].lower() in (".parquet", ".pq")
+
+
+def iter_prospect_chunks(path: str, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """Yield *path* as DataFrames of at most *chunk_size* rows.
+
+    A :mod:`prospect_store` directory is read zero-copy from its memory maps.
+    """
+    from prospect_store import ProspectStore, is_store
+
+    if is_store(path):
+        yield from ProspectStore(path).iter_frames(chunk_size)
+    elif _is_parquet(path):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise ImportError("Parquet input requires the 'pyarrow' package.") from exc
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size)
+
+
+def _fill_tier_defaults(frame: pd.DataFrame, price_column: str) -> pd.DataFrame:
+    """*frame* with absent or NaN inputs and prices taken from :mod:`tiers`."""
+    from tiers import fill_defaults
+
+    filled = fill_defaults({name: frame[name].to_numpy() for name in frame.columns}, price_column=price_column)
+    if "tier" in frame.columns:
+        del filled["tier"]
+    return frame.assign(**filled)
+
+
+def score_frame(
+    frame: pd.DataFrame,
+    *,
+    price_column: str = PRICE_COLUMN,
+    line_items: bool = False,
+    fill_defaults: bool = False,
+) -> pd.DataFrame:
+    """Return *frame* with savings, ROI and payback columns appended.
+
+    ``annual_hires`` may be replaced by ``annual_hires_percent``, which is
+    truncated to whole hires like the app does.  Columns named after
+    ``OPERETA_IMPACT`` keys override the impact per row.  With
+    *fill_defaults*, only ``num_employees`` is required: absent or NaN
+    inputs and prices take :func:`tiers.fill_defaults` values and a
+    ``tier`` column is added.
+    """
+
+    if fill_defaults:
+        frame = _fill_tier_defaults(frame, price_column)
+    data: Dict[str, Any] = {name: frame[name].to_numpy() for name in frame.columns}
+    if "annual_hires" not in data and "annual_hires_percent" in data:
+        data["annual_hires"] = np.floor(
+            data["num_employees"].astype(np.float64) * data["annual_hires_percent"]
+        )
+
+    savings = compute_all_savings_batch(data)
+    total = savings[TOTAL_COLUMN]
+    price = frame[price_column].to_numpy(dtype=np.float64)
+
+    scored: Dict[str, np.ndarray] = {}
+    if "annual_hires" not in frame.columns:
+        scored["annual_hires"] = data["annual_hires"]
+    if line_items:
+        scored.update({key: savings[key] for key, _c, _a in LINE_ITEMS})
+    scored[TOTAL_COLUMN] = total
+    scored["roi_percent"] = roi_percent_batch(total, price)
+    scored["payback_months"] = payback_months_batch(total, price)
+    return frame.assign(**scored)
+
+
+class _ChunkWriter:
+    """Appends DataFrame chunks to a CSV or Parquet file."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.writer: Any = None
+        self.chunks = 0
+
+    def write(self, frame: pd.DataFrame) -> None:
+        if _is_parquet(self.path):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self.writer is None:
+                self.writer = pq.ParquetWriter(self.path, table.schema)
+            self.writer.write_table(table)
+        else:
+            frame.to_csv(self.path, mode="w" if self.chunks == 0 else "a", header=self.chunks == 0, index=False)
+        self.chunks += 1
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+
+
+def score_file(
+    in_path: str,
+    out_path: str,
+    *,
+    chunk_size: int = 200_000,
+    price_column: str = PRICE_COLUMN,
+    line_items: bool = False,
+    fill_defaults: bool = False,
+    quarantine_path: str | None = None,
+    report: bool = True,
+) -> Dict[str, float]:
+    """Stream *in_path* through :func:`score_frame` into *out_path*.
+
+    The output format follows the *out_path* extension.  With
+    *quarantine_path*, every chunk is checked by
+    :func:`validation.validate_columns` first: rows failing an error rule go
+    to the quarantine file with a ``validation_errors`` column instead of
+    being scored, and scored rows get a ``validation_flags`` column naming
+    any warnings.  Returns the row count, elapsed seconds, rows per second
+    and, when validating, the quarantined row count.  *fill_defaults* is
+    applied before validation.
+    """
+
+    writer = _ChunkWriter(out_path)
+    quarantine = _ChunkWriter(quarantine_path) if quarantine_path else None
+    rows = quarantined = 0
+    started = time.perf_counter()
+    try:
+        for chunk in iter_prospect_chunks(in_path, chunk_size):
+            if fill_defaults:
+                chunk = _fill_tier_defaults(chunk, price_column)
+            if quarantine is not None:
+                from validation import validate_columns
+
+                checked = validate_columns(chunk, price_column=price_column)
+                if checked.table_errors:
+                    raise ValueError(f"{in_path}: {'; '.join(checked.table_errors)}")
+                valid, flags = checked.valid, checked.describe()
+                if not valid.all():
+                    quarantine.write(chunk[~valid].assign(validation_errors=flags[~valid]))
+                    quarantined += int((~valid).sum())
+                    chunk = chunk[valid]
+                chunk = chunk.assign(validation_flags=flags[valid])
+            scored = score_frame(chunk, price_column=price_column, line_items=line_items)
+            writer.write(scored)
+            rows += len(scored)
+            if report:
+                elapsed = time.perf_counter() - started
+                print(f"\r{rows:,} rows – {rows / elapsed:,.0f} rows/s", end="", file=sys.stderr, flush=True)
+    finally:
+        writer.close()
+        if quarantine is not None:
+            quarantine.close()
+
+    elapsed = time.perf_counter() - started
+    if report:
+        print(file=sys.stderr)
+    stats = {
+        "rows": rows,
+        "seconds": elapsed,
+        "rows_per_second": rows / elapsed if elapsed > 0 else 0.0,
+    }
+    if quarantine is not None:
+        stats["quarantined"] = quarantined
+    return stats
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Score a prospect CSV/Parquet file in bounded memory.")
+    parser.add_argument("input", help="Prospect file (.csv or .parquet) or prospect_store directory")
+    parser.add_argument("output", help="Scored output file (.csv or .parquet)")
+    parser.add_argument("--chunk-size", type=int, default=200_000)
+    parser.add_argument("--price-column", default=PRICE_COLUMN)
+    parser.add_argument("--line-items", action="store_true", help="Also write every savings line item")
+    parser.add_argument(
+        "--fill-defaults", action="store_true",
+        help="Fill missing inputs and prices from headcount-interpolated tier defaults",
+    )
+    parser.add_argument("--quarantine", default=None, help="Validate rows; write failing ones to this file")
+    args = parser.parse_args(argv)
+
+    stats = score_file(
+        args.input,
+        args.output,
+        chunk_size=args.chunk_size,
+        price_column=args.price_column,
+        line_items=args.line_items,
+        fill_defaults=args.fill_defaults,
+        quarantine_path=args.quarantine,
+    )
+    print(
+        f"Scored {stats['rows']:,} rows in {stats['seconds']:.1f}s "
+        f"({stats['rows_per_second']:,.0f} rows/s)"
+        + (f"; quarantined {stats['quarantined']:,} rows" if "quarantined" in stats else ""),
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,121 @@
+"""sensitivity.py
+Closed-form local sensitivity (tornado) analysis.
+Partial derivatives of total savings come straight from the sum-of-products
+form in :mod:`model_terms`, so one analytic pass ranks every impact key and
+research baseline — no 2×N perturbation re-runs, and it vectorises across a
+whole prospect portfolio.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Mapping, Tuple
+
+import numpy as np
+
+from batch import BASELINE_CONSTANTS, build_params
+from calculations import compute_roi_percent
+from constants import OPERETA_IMPACT
+from model_terms import SAVINGS_TERMS, add_size_flags
+
+__all__ = [
+    "SENSITIVITY_PARAMETERS",
+    "sensitivity_table",
+    "total_savings_gradient",
+]
+
+# Assumptions ranked by default: all impact keys, then the research baselines.
+SENSITIVITY_PARAMETERS: Tuple[str, ...] = tuple(OPERETA_IMPACT) + tuple(BASELINE_CONSTANTS)
+
+
+def _gradient_pass(
+    params: Mapping[str, np.ndarray], parameters: Iterable[str]
+) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """Return ``(total, {parameter: d total / d parameter})`` in one sweep.
+
+    Each term is a product, so its derivative w.r.t. one factor is the
+    product of all the others; prefix/suffix products avoid dividing by
+    factors that may be zero.
+    """
+
+    shape = params["num_employees"].shape
+    grad = {name: np.zeros(shape, dtype=np.float64) for name in parameters}
+    total = np.zeros(shape, dtype=np.float64)
+    for terms in SAVINGS_TERMS.values():
+        for coefficient, factors in terms:
+            values = [params[name] for name in factors]
+            prefix = [np.full(shape, coefficient, dtype=np.float64)]
+            for value in values:
+                prefix.append(prefix[-1] * value)
+            suffix = np.ones(shape, dtype=np.float64)
+            for i in range(len(factors) - 1, -1, -1):
+                name = factors[i]
+                if name in grad:
+                    grad[name] += prefix[i] * suffix
+                suffix = suffix * values[i]
+            total += prefix[-1]
+    return total, grad
+
+
+def total_savings_gradient(
+    data: Mapping[str, Any] | None = None,
+    *,
+    impact: Mapping[str, Any] | None = None,
+    baseline: Mapping[str, Any] | None = None,
+    parameters: Iterable[str] = SENSITIVITY_PARAMETERS,
+    **columns: Any,
+) -> Dict[str, np.ndarray]:
+    """Exact ``d total_annual_savings / d parameter`` for every row.
+
+    Arguments follow :func:`batch.build_params`.  The ROI gradient is this
+    value ``/ annual_price × 100``; parameters that feed no line item (some
+    impact keys are not yet modelled) get a gradient of zero.
+    """
+
+    params = add_size_flags(build_params(data, impact=impact, baseline=baseline, **columns))
+    return _gradient_pass(params, parameters)[1]
+
+
+def sensitivity_table(
+    inputs: Mapping[str, float],
+    *,
+    annual_price: float,
+    impact: Mapping[str, float] | None = None,
+    baseline: Mapping[str, float] | None = None,
+    relative_change: float = 0.10,
+    parameters: Iterable[str] = SENSITIVITY_PARAMETERS,
+) -> List[Dict[str, Any]]:
+    """Rank assumptions by how far a ±*relative_change* move shifts the total.
+
+    *inputs* are the scalar ``compute_all_savings`` keyword inputs for one
+    prospect (see :func:`calculations.tier_inputs`).  The model is linear in
+    each single parameter, so the low/high totals are exact rather than a
+    first-order approximation.  Rows are sorted by savings swing, largest
+    first.
+    """
+
+    params = add_size_flags(build_params(inputs, impact=impact, baseline=baseline))
+    total_arr, grad = _gradient_pass(params, parameters)
+    total = float(total_arr[0])
+
+    rows: List[Dict[str, Any]] = []
+    for name, slope in grad.items():
+        value = float(params[name][0])
+        derivative = float(slope[0])
+        swing = derivative * value * relative_change
+        low, high = sorted((total - swing, total + swing))
+        rows.append(
+            {
+                "Parameter": name,
+                "Kind": "Baseline" if name in BASELINE_CONSTANTS else "Impact",
+                "Value": value,
+                "d Total / d Parameter": derivative,
+                "Elasticity": derivative * value / total if total else 0.0,
+                "Savings Swing ($)": abs(swing),
+                "Total Low ($)": low,
+                "Total High ($)": high,
+                "ROI Low (%)": compute_roi_percent(low, annual_price),
+                "ROI High (%)": compute_roi_percent(high, annual_price),
+            }
+        )
+    rows.sort(key=lambda row: row["Savings Swing ($)"], reverse=True)
+    return rows
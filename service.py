@@ -0,0 +1,416 @@
+"""service.py
+Local JSON scoring service around the calculations engine.
+A dependency-free asyncio HTTP/1.1 server: requests that arrive together are
+merged by a micro-batcher into one vectorised :mod:`batch` call, and every
+response carries line items, total savings, ROI and payback.  ``/metrics``
+exposes latency percentiles and throughput counters; ``--load-test`` runs a
+local keep-alive client against a running server.
+
+Endpoints::
+
+    POST /score    {"num_employees": ..., "annual_price": ...}   # one prospect
+                   {"prospects": [{...}, {...}]}                  # bulk
+    GET  /metrics
+    GET  /health
+
+Usage::
+
+    python service.py --port 8765
+    python service.py --port 8765 --load-test --concurrency 64 --requests 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Mapping, Tuple
+
+import numpy as np
+
+from batch import (
+    INPUT_COLUMNS,
+    TOTAL_COLUMN,
+    compute_all_savings_batch,
+    payback_months_batch,
+    roi_percent_batch,
+)
+from calculations import LINE_ITEMS
+from constants import OPERETA_IMPACT
+from validation import PRICE_COLUMN, RULES, validate_columns
+
+__all__ = [
+    "MicroBatcher",
+    "ScoringService",
+    "load_test",
+]
+
+_LATENCY_WINDOW = 10_000
+
+# Validation rules a request must pass: anything failing these would come
+# back as NaN / Infinity (not JSON) or as a negative payback.
+_REJECTED_BITS = sum(
+    rule.bit
+    for rule in RULES
+    if rule.name in ("not_numeric", "missing_value", "missing_price", "negative_value", "override_out_of_range")
+)
+
+
+def _finite_or_none(value: float) -> float | None:
+    # JSON has no Infinity; undefined ROI / payback become null.
+    return value if math.isfinite(value) else None
+
+
+class MicroBatcher:
+    """Coalesce concurrent scoring calls into single vectorised batches.
+
+    The first queued request opens a batch; everything else already queued,
+    or arriving within *max_wait* seconds, joins it up to *max_batch*
+    prospects.
+    """
+
+    def __init__(self, *, max_batch: int = 4096, max_wait: float = 0.002) -> None:
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.batches = 0
+        self.batched_prospects = 0
+        self._queue: "asyncio.Queue[Tuple[List[Mapping[str, Any]], asyncio.Future]]" = asyncio.Queue()
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+
+    async def score(self, prospects: List[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((prospects, future))
+        return await future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self._queue.get()]
+            try:
+                size = len(pending[0][0])
+                deadline = loop.time() + self.max_wait
+                while size < self.max_batch:
+                    try:
+                        item = self._queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        remaining = deadline - loop.time()
+                        if remaining <= 0:
+                            break
+                        try:
+                            item = await asyncio.wait_for(self._queue.get(), remaining)
+                        except asyncio.TimeoutError:
+                            break
+                    pending.append(item)
+                    size += len(item[0])
+                self._flush(pending)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                # Never let one bad item end the task: fail only what is unanswered.
+                for _prospects, future in pending:
+                    if not future.done():
+                        future.set_exception(exc)
+
+    def _flush(self, pending: List[Tuple[List[Mapping[str, Any]], asyncio.Future]]) -> None:
+        flat = [p for prospects, _ in pending for p in prospects]
+        try:
+            results = _score_prospects(flat)
+        except Exception:
+            # One malformed request must not fail its batch-mates: retry
+            # each request on its own so the error lands where it belongs.
+            for prospects, future in pending:
+                try:
+                    future.set_result(_score_prospects(prospects))
+                except Exception as exc:
+                    future.set_exception(exc)
+            return
+
+        self.batches += 1
+        self.batched_prospects += len(flat)
+        offset = 0
+        for prospects, future in pending:
+            if not future.done():
+                future.set_result(results[offset : offset + len(prospects)])
+            offset += len(prospects)
+
+
+def _check_prospects(columns: Mapping[str, List[Any]], multiplier: List[Any]) -> None:
+    """Raise ``ValueError`` naming the first prospect the engine cannot score."""
+
+    result = validate_columns(columns)
+    if result.table_errors:
+        raise ValueError("; ".join(result.table_errors))
+    rejected = result.mask & _REJECTED_BITS
+    if rejected.any():
+        row = int(np.flatnonzero(rejected)[0])
+        problems = [rule.message for rule in RULES if rejected[row] & rule.bit]
+        raise ValueError(f"prospect {row}: {'; '.join(problems)}")
+    for row, factor in enumerate(multiplier):
+        if isinstance(factor, bool) or not isinstance(factor, (int, float)) or not 0 <= factor < math.inf:
+            raise ValueError(f"prospect {row}: scenario_multiplier must be a finite non-negative number")
+
+
+def _score_prospects(prospects: List[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+    """Score a list of prospect dicts in one batch call."""
+
+    if not prospects:
+        return []
+    overrides = [prospect.get("impact", {}) for prospect in prospects]
+    for override in overrides:
+        unknown = [key for key in override if key not in OPERETA_IMPACT]
+        if unknown:
+            raise KeyError(f"Unknown impact key: {unknown[0]!r}")
+    columns = {name: [p[name] for p in prospects] for name in (*INPUT_COLUMNS, PRICE_COLUMN)}
+    for key in sorted({key for override in overrides for key in override}):
+        columns[key] = [override.get(key, OPERETA_IMPACT[key]) for override in overrides]
+    multiplier = [p.get("scenario_multiplier", 1.0) for p in prospects]
+    _check_prospects(columns, multiplier)
+
+    price = np.array(columns[PRICE_COLUMN], dtype=np.float64)
+    factors = np.array(multiplier, dtype=np.float64)
+    impact: Dict[str, Any] = {k: v * factors for k, v in OPERETA_IMPACT.items()}
+    for row, override in enumerate(overrides):
+        for key, value in override.items():
+            impact[key][row] = value  # per-row override (arrays are fresh copies)
+
+    with np.errstate(over="ignore", invalid="ignore"):  # overflow is reported below
+        savings = compute_all_savings_batch({name: columns[name] for name in INPUT_COLUMNS}, impact=impact)
+    total = savings[TOTAL_COLUMN]
+    roi = roi_percent_batch(total, price)
+    payback = payback_months_batch(total, price)
+    overflow = ~np.isfinite(np.vstack([savings[key] for key, _c, _a in LINE_ITEMS] + [total])).all(axis=0)
+    if overflow.any():
+        raise ValueError(f"prospect {int(np.flatnonzero(overflow)[0])}: inputs too large to score")
+
+    item_columns = [(key, savings[key].tolist()) for key, _c, _a in LINE_ITEMS]
+    total_list, roi_list, payback_list = total.tolist(), roi.tolist(), payback.tolist()
+    return [
+        {
+            "line_items": {key: values[i] for key, values in item_columns},
+            TOTAL_COLUMN: total_list[i],
+            "roi_percent": _finite_or_none(roi_list[i]),
+            "payback_months": _finite_or_none(payback_list[i]),
+        }
+        for i in range(len(prospects))
+    ]
+
+
+class ScoringService:
+    """HTTP front-end plus latency / throughput bookkeeping."""
+
+    def __init__(self, batcher: MicroBatcher) -> None:
+        self.batcher = batcher
+        self.started = time.perf_counter()
+        self.requests = 0
+        self.errors = 0
+        self.prospects = 0
+        self.latencies_ms: Deque[float] = deque(maxlen=_LATENCY_WINDOW)
+
+    def metrics(self) -> Dict[str, Any]:
+        uptime = time.perf_counter() - self.started
+        lat = np.array(self.latencies_ms) if self.latencies_ms else np.zeros(1)
+        p50, p95, p99 = np.percentile(lat, (50, 95, 99)).tolist()
+        return {
+            "uptime_seconds": uptime,
+            "requests": self.requests,
+            "errors": self.errors,
+            "prospects_scored": self.prospects,
+            "batches": self.batcher.batches,
+            "avg_batch_size": self.batcher.batched_prospects / max(self.batcher.batches, 1),
+            "requests_per_second": self.requests / uptime if uptime > 0 else 0.0,
+            "prospects_per_second": self.prospects / uptime if uptime > 0 else 0.0,
+            "latency_ms": {"p50": p50, "p95": p95, "p99": p99, "window": len(self.latencies_ms)},
+        }
+
+    async def _dispatch(self, method: str, path: str, body: bytes) -> Tuple[int, Any]:
+        if method == "GET" and path == "/health":
+            return 200, {"status": "ok"}
+        if method == "GET" and path == "/metrics":
+            return 200, self.metrics()
+        if method != "POST" or path != "/score":
+            return 404, {"error": f"No route for {method} {path}"}
+
+        started = time.perf_counter()
+        try:
+            payload = json.loads(body or b"null")
+            if isinstance(payload, list):
+                prospects, bulk = payload, True
+            elif isinstance(payload, dict) and "prospects" in payload:
+                prospects, bulk = payload["prospects"], True
+            else:
+                prospects, bulk = [payload], False
+            if not isinstance(prospects, list) or not all(isinstance(p, dict) for p in prospects):
+                raise TypeError("prospects must be a list of JSON objects")
+            results = await self.batcher.score(prospects)
+        except (KeyError, TypeError, ValueError, AttributeError) as exc:
+            self.errors += 1
+            return 400, {"error": f"{type(exc).__name__}: {exc}"}
+        except Exception as exc:
+            self.errors += 1
+            return 500, {"error": f"{type(exc).__name__}: {exc}"}
+        self.prospects += len(prospects)
+        self.latencies_ms.append((time.perf_counter() - started) * 1000)
+        return 200, {"results": results} if bulk else results[0]
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _version = request_line.decode("latin-1").split(" ", 2)
+                headers: Dict[str, str] = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                self.requests += 1
+                status, payload = await self._dispatch(method, path, body)
+                data = json.dumps(payload, allow_nan=False).encode()
+                keep_alive = headers.get("connection", "").lower() != "close"
+                writer.write(
+                    f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode()
+                    + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(host: str = "127.0.0.1", port: int = 8765, **batcher_kwargs: Any) -> None:
+    batcher = MicroBatcher(**batcher_kwargs)
+    batcher.start()
+    service = ScoringService(batcher)
+    server = await asyncio.start_server(service.handle, host, port)
+    print(f"Scoring service listening on http://{host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+# ---------- Local load-test client ---------- #
+
+
+async def _request(
+    reader: asyncio.StreamReader, writer: asyncio.StreamWriter, method: str, path: str, body: bytes = b""
+) -> Tuple[int, bytes]:
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode()
+        + body
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        if line.lower().startswith(b"content-length:"):
+            length = int(line.split(b":")[1])
+    return status, await reader.readexactly(length)
+
+
+async def load_test(
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    *,
+    concurrency: int = 64,
+    total_requests: int = 5000,
+) -> Dict[str, Any]:
+    """Fire *total_requests* single-prospect scores over *concurrency* connections.
+
+    Returns client-side latency percentiles and throughput plus the server's
+    own ``/metrics`` snapshot.
+    """
+
+    rng = np.random.default_rng(0)
+    latencies: List[float] = []
+    remaining = [total_requests]
+
+    async def worker() -> None:
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            while remaining[0] > 0:
+                remaining[0] -= 1
+                body = json.dumps(
+                    {
+                        "num_employees": int(rng.integers(500, 20000)),
+                        "annual_hires": int(rng.integers(50, 2000)),
+                        "avg_annual_salary": float(rng.integers(60000, 120000)),
+                        "avg_recruiter_salary": 75000.0,
+                        "num_recruiters": int(rng.integers(2, 40)),
+                        "annual_price": 250000.0,
+                    }
+                ).encode()
+                started = time.perf_counter()
+                status, _ = await _request(reader, writer, "POST", "/score", body)
+                latencies.append((time.perf_counter() - started) * 1000)
+                if status != 200:
+                    raise RuntimeError(f"Server returned HTTP {status}")
+        finally:
+            writer.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    reader, writer = await asyncio.open_connection(host, port)
+    _, metrics = await _request(reader, writer, "GET", "/metrics")
+    writer.close()
+
+    p50, p95, p99 = np.percentile(latencies, (50, 95, 99)).tolist()
+    return {
+        "requests": len(latencies),
+        "seconds": elapsed,
+        "requests_per_second": len(latencies) / elapsed,
+        "client_latency_ms": {"p50": p50, "p95": p95, "p99": p99},
+        "server_metrics": json.loads(metrics),
+    }
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Local ROI scoring service with micro-batching.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-batch", type=int, default=4096)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    parser.add_argument("--load-test", action="store_true", help="Run the load-test client instead of serving")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    if args.load_test:
+        report = asyncio.run(
+            load_test(args.host, args.port, concurrency=args.concurrency, total_requests=args.requests)
+        )
+        print(json.dumps(report, indent=2))
+        return 0
+    try:
+        asyncio.run(serve(args.host, args.port, max_batch=args.max_batch, max_wait=args.max_wait_ms / 1000))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,188 @@
+"""simulation.py
+Monte Carlo uncertainty engine for the Opereta ROI model.
+Each impact key and research baseline gets its own distribution; samples are
+scored in one vectorised pass through :mod:`batch` and summarised as
+P5 / P50 / P95 bands for total savings, ROI and payback per tier.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Mapping, Tuple
+
+import numpy as np
+
+from batch import (
+    BASELINE_CONSTANTS,
+    TOTAL_COLUMN,
+    compute_all_savings_batch,
+    payback_months_batch,
+    roi_percent_batch,
+)
+from calculations import tier_inputs
+from constants import OPERETA_IMPACT, TIER_DATA
+
+__all__ = [
+    "DEFAULT_BASELINE_DISTRIBUTIONS",
+    "DEFAULT_IMPACT_DISTRIBUTION",
+    "Distribution",
+    "PERCENTILES",
+    "sample_parameters",
+    "simulate_tier",
+    "simulate_tiers",
+]
+
+PERCENTILES: Tuple[int, ...] = (5, 50, 95)
+
+
+@dataclass(frozen=True)
+class Distribution:
+    """A named sampling distribution.
+
+    ``kind`` is one of ``"fixed"`` (value), ``"uniform"`` (low, high),
+    ``"triangular"`` (low, mode, high) or ``"normal"`` (mean, std; clipped
+    at zero because every model parameter is non-negative).
+    """
+
+    kind: str
+    params: Tuple[float, ...]
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        if self.kind == "fixed":
+            return np.full(size, self.params[0], dtype=np.float64)
+        if self.kind == "uniform":
+            return rng.uniform(self.params[0], self.params[1], size)
+        if self.kind == "triangular":
+            return rng.triangular(*self.params, size)
+        if self.kind == "normal":
+            return np.maximum(rng.normal(self.params[0], self.params[1], size), 0.0)
+        raise ValueError(f"Unknown distribution kind: {self.kind!r}")
+
+    def scaled(self, factor: float) -> "Distribution":
+        """Return the same shape multiplied by *factor* (std scales too)."""
+        return Distribution(self.kind, tuple(v * factor for v in self.params))
+
+
+# Impact keys are drawn as a multiplicative factor on their assumed value.
+# The default spans the app's Conservative (0.5×) to Aggressive (1.25×)
+# scenarios, centred on the Base assumption.
+DEFAULT_IMPACT_DISTRIBUTION = Distribution("triangular", (0.5, 1.0, 1.25))
+
+# Research baselines are drawn in absolute units around the cited figure.
+DEFAULT_BASELINE_DISTRIBUTIONS: Dict[str, Distribution] = {
+    "AVG_TIME_TO_FILL_DAYS": Distribution("triangular", (36, 44, 52)),
+    "COST_OF_VACANCY_PER_DAY_ESTIMATE_FACTOR": Distribution("triangular", (1.0, 1.5, 2.0)),
+    "AVG_COST_PER_HIRE_SHRM": Distribution("triangular", (4000, 4700, 5500)),
+    "AVG_COST_PER_HIRE_SMALL_BIZ": Distribution("triangular", (6500, 7645, 9000)),
+    "CURRENT_MISHIRE_RATE_PERCENT": Distribution("triangular", (0.10, 0.15, 0.20)),
+    "MISHIRE_COST_PERCENT_OF_SALARY_DOL": Distribution("triangular", (0.20, 0.30, 0.40)),
+    "NEW_HIRES_LEAVING_IN_90_DAYS_PERCENT": Distribution("triangular", (0.20, 0.30, 0.35)),
+    "SHIFT_SHOCK_SHARE_OF_EARLY_LEAVERS_PERCENT": Distribution("triangular", (0.35, 0.43, 0.50)),
+    "COST_TO_REPLACE_PERCENT_OF_SALARY": Distribution("triangular", (0.16, 0.21, 0.33)),
+    "INTERVIEWS_PER_HIRE": Distribution("triangular", (4, 5, 6)),
+    "RECRUITER_AVG_HOURLY_RATE": Distribution("triangular", (30, 35, 40)),
+    "AVG_TIME_TO_PRODUCTIVITY_MONTHS": Distribution("triangular", (6, 8, 10)),
+    "CURRENT_INTERNAL_FILL_RATE_PERCENT": Distribution("triangular", (0.20, 0.24, 0.28)),
+    "EXTERNAL_HIRE_SALARY_PREMIUM_PERCENT": Distribution("triangular", (0.10, 0.18, 0.20)),
+    "CURRENT_ANNUAL_VOLUNTARY_TURNOVER_PERCENT": Distribution("triangular", (0.10, 0.12, 0.15)),
+}
+
+
+def sample_parameters(
+    n_samples: int,
+    *,
+    impact: Mapping[str, float] | None = None,
+    impact_distributions: Mapping[str, Distribution] | None = None,
+    baseline_distributions: Mapping[str, Distribution] | None = None,
+    seed: int | None = None,
+) -> Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray]]:
+    """Draw *n_samples* independent impact and baseline values.
+
+    *impact* (default ``OPERETA_IMPACT``) is the centre each impact
+    distribution scales; entries in *impact_distributions* are factors on it
+    and fall back to :data:`DEFAULT_IMPACT_DISTRIBUTION`.  Baselines without
+    a distribution are held at their constant value.
+
+    Returns ``(impact_samples, baseline_samples)`` ready for
+    :func:`batch.compute_all_savings_batch`.
+    """
+
+    impact = impact or OPERETA_IMPACT
+    impact_distributions = impact_distributions or {}
+    if baseline_distributions is None:
+        baseline_distributions = DEFAULT_BASELINE_DISTRIBUTIONS
+
+    rng = np.random.default_rng(seed)
+    impact_samples = {
+        key: impact_distributions.get(key, DEFAULT_IMPACT_DISTRIBUTION)
+        .scaled(value)
+        .sample(rng, n_samples)
+        for key, value in impact.items()
+    }
+    baseline_samples = {
+        name: baseline_distributions[name].sample(rng, n_samples)
+        for name in BASELINE_CONSTANTS
+        if name in baseline_distributions
+    }
+    return impact_samples, baseline_samples
+
+
+def _bands(values: np.ndarray) -> Dict[str, float]:
+    # ``inverted_cdf`` picks real samples, so infinite paybacks stay inf
+    # instead of turning into NaN through interpolation.
+    qs = np.percentile(values, PERCENTILES, method="inverted_cdf")
+    return {f"p{p}": float(q) for p, q in zip(PERCENTILES, qs)}
+
+
+def simulate_tier(
+    tier_config: Mapping[str, object],
+    *,
+    annual_price: float | None = None,
+    samples: Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray]] | None = None,
+    n_samples: int = 100_000,
+    seed: int | None = None,
+    **sample_kwargs: object,
+) -> Dict[str, Dict[str, float]]:
+    """Return P5/P50/P95 bands for one tier.
+
+    Keys of the result are ``total_annual_savings``, ``roi_percent`` and
+    ``payback_months``.  Pass pre-drawn *samples* to reuse the same draws
+    across tiers (common random numbers).
+    """
+
+    if samples is None:
+        samples = sample_parameters(n_samples, seed=seed, **sample_kwargs)
+    impact_samples, baseline_samples = samples
+    if annual_price is None:
+        annual_price = tier_config["opereta_target_annual_price"]
+
+    totals = compute_all_savings_batch(
+        tier_inputs(tier_config), impact=impact_samples, baseline=baseline_samples
+    )[TOTAL_COLUMN]
+    return {
+        "total_annual_savings": _bands(totals),
+        "roi_percent": _bands(roi_percent_batch(totals, annual_price)),
+        "payback_months": _bands(payback_months_batch(totals, annual_price)),
+    }
+
+
+def simulate_tiers(
+    tier_data: Mapping[str, Mapping[str, object]] | None = None,
+    *,
+    prices: Mapping[str, float] | None = None,
+    n_samples: int = 100_000,
+    seed: int | None = None,
+    **sample_kwargs: object,
+) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """Run :func:`simulate_tier` for every tier on one shared set of draws.
+
+    *prices* optionally overrides the target annual price per tier name.
+    """
+
+    tier_data = tier_data or TIER_DATA
+    prices = prices or {}
+    samples = sample_parameters(n_samples, seed=seed, **sample_kwargs)
+    return {
+        name: simulate_tier(config, annual_price=prices.get(name), samples=samples)
+        for name, config in tier_data.items()
+    }
@@ -0,0 +1,260 @@
+"""sweep.py
+Parallel parameter-grid sweeps over the savings model.
+A :class:`GridSpec` (tier × price change × scenario multiplier × headcount ×
+hiring rate) is split into fixed-size chunks of its flat index.  Worker
+processes decode their own slice, score it with :mod:`batch` and write one
+part file each, so neither side ever holds the full grid.  Finished parts
+are written atomically, which makes re-running an interrupted sweep resume
+where it stopped.
+
+Usage::
+
+    python sweep.py grid.json out_dir --chunk-size 250000 --workers 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+from batch import TOTAL_COLUMN, compute_all_savings_batch, payback_months_batch, roi_percent_batch
+from calculations import LINE_ITEMS
+from constants import OPERETA_IMPACT, TIER_DATA
+
+__all__ = [
+    "GridSpec",
+    "run_sweep",
+    "score_chunk",
+]
+
+MANIFEST_NAME = "manifest.json"
+FORMATS = ("csv", "parquet")
+
+
+@dataclass(frozen=True)
+class GridSpec:
+    """Axes of a pricing sweep.
+
+    ``headcounts`` / ``hiring_rates`` left empty fall back to each tier's
+    ``avg_employees`` / ``annual_hires_percent``.  In a JSON spec any axis
+    may be given as ``{"start": a, "stop": b, "num": n}`` (inclusive).
+    """
+
+    tiers: Tuple[str, ...] = tuple(TIER_DATA)
+    price_changes: Tuple[float, ...] = tuple(np.round(np.linspace(-0.5, 0.5, 11), 10).tolist())
+    scenario_multipliers: Tuple[float, ...] = tuple(np.round(np.linspace(0.0, 1.2, 13), 10).tolist())
+    headcounts: Tuple[float, ...] = ()
+    hiring_rates: Tuple[float, ...] = ()
+    line_items: bool = False
+
+    @classmethod
+    def from_dict(cls, raw: Mapping[str, Any]) -> "GridSpec":
+        def axis(value: Any) -> Tuple[Any, ...]:
+            if isinstance(value, Mapping):
+                return tuple(np.linspace(value["start"], value["stop"], int(value["num"])).tolist())
+            return tuple(value)
+
+        kwargs: Dict[str, Any] = {}
+        for name in cls.__dataclass_fields__:
+            if name in raw:
+                kwargs[name] = raw[name] if name == "line_items" else axis(raw[name])
+        unknown = [t for t in kwargs.get("tiers", ()) if t not in TIER_DATA]
+        if unknown:
+            raise KeyError(f"Unknown tiers in grid spec: {unknown}")
+        return cls(**kwargs)
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return (
+            len(self.tiers),
+            len(self.price_changes),
+            len(self.scenario_multipliers),
+            max(len(self.headcounts), 1),
+            max(len(self.hiring_rates), 1),
+        )
+
+    @property
+    def size(self) -> int:
+        return int(np.prod(self.shape))
+
+
+# ---------- Worker side ---------- #
+
+
+def _tier_column(tiers: Sequence[str], tier_idx: np.ndarray, field_name: str) -> np.ndarray:
+    return np.array([TIER_DATA[t][field_name] for t in tiers], dtype=np.float64)[tier_idx]
+
+
+def score_chunk(spec: GridSpec, start: int, stop: int) -> Dict[str, np.ndarray]:
+    """Decode and score flat grid indices ``[start, stop)``."""
+
+    t, p, s, h, r = np.unravel_index(np.arange(start, stop), spec.shape)
+
+    if spec.headcounts:
+        num_employees = np.asarray(spec.headcounts, dtype=np.float64)[h]
+    else:
+        num_employees = _tier_column(spec.tiers, t, "avg_employees")
+    if spec.hiring_rates:
+        hiring_rate = np.asarray(spec.hiring_rates, dtype=np.float64)[r]
+    else:
+        hiring_rate = _tier_column(spec.tiers, t, "annual_hires_percent")
+    multiplier = np.asarray(spec.scenario_multipliers, dtype=np.float64)[s]
+    price_change = np.asarray(spec.price_changes, dtype=np.float64)[p]
+    price = _tier_column(spec.tiers, t, "opereta_target_annual_price") * (1 + price_change)
+
+    inputs = {
+        "num_employees": num_employees,
+        # Same truncation as ``int(num_employees * rate)`` in the app.
+        "annual_hires": np.floor(num_employees * hiring_rate),
+        "avg_annual_salary": _tier_column(spec.tiers, t, "avg_annual_salary"),
+        "avg_recruiter_salary": _tier_column(spec.tiers, t, "avg_recruiter_salary"),
+        "num_recruiters": _tier_column(spec.tiers, t, "default_num_recruiters"),
+    }
+    savings = compute_all_savings_batch(
+        inputs, impact={k: v * multiplier for k, v in OPERETA_IMPACT.items()}
+    )
+    total = savings[TOTAL_COLUMN]
+
+    columns: Dict[str, np.ndarray] = {
+        "grid_index": np.arange(start, stop),
+        "tier": np.asarray(spec.tiers, dtype=object)[t],
+        "price_change": price_change,
+        "scenario_multiplier": multiplier,
+        "annual_hires_percent": hiring_rate,
+        **inputs,
+        "annual_price": price,
+    }
+    if spec.line_items:
+        columns.update({key: savings[key] for key, _c, _a in LINE_ITEMS})
+    columns[TOTAL_COLUMN] = total
+    columns["roi_percent"] = roi_percent_batch(total, price)
+    columns["payback_months"] = payback_months_batch(total, price)
+    return columns
+
+
+def _part_path(out_dir: str, index: int, fmt: str) -> str:
+    return os.path.join(out_dir, f"part-{index:05d}.{fmt}")
+
+
+def _write_chunk(spec: GridSpec, index: int, chunk_size: int, out_dir: str, fmt: str) -> int:
+    import pandas as pd
+
+    start = index * chunk_size
+    stop = min(start + chunk_size, spec.size)
+    frame = pd.DataFrame(score_chunk(spec, start, stop))
+
+    final_path = _part_path(out_dir, index, fmt)
+    tmp_path = f"{final_path}.tmp-{os.getpid()}"
+    if fmt == "csv":
+        frame.to_csv(tmp_path, index=False)
+    else:
+        frame.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, final_path)  # atomic: a part either exists whole or not at all
+    return stop - start
+
+
+# ---------- Driver ---------- #
+
+
+def _print_progress(done_rows: int, total_rows: int, elapsed: float) -> None:
+    rate = done_rows / elapsed if elapsed > 0 else 0.0
+    print(
+        f"\r{done_rows:,}/{total_rows:,} rows ({done_rows / total_rows:.0%}) – {rate:,.0f} rows/s",
+        end="",
+        file=sys.stderr,
+        flush=True,
+    )
+
+
+def run_sweep(
+    spec: GridSpec,
+    out_dir: str,
+    *,
+    chunk_size: int = 250_000,
+    workers: int | None = None,
+    fmt: str = "csv",
+    progress: Callable[[int, int, float], None] | None = _print_progress,
+) -> Dict[str, Any]:
+    """Run (or resume) a sweep, writing ``part-NNNNN.<fmt>`` files to *out_dir*.
+
+    A ``manifest.json`` records the spec; resuming against a different spec
+    or chunk size raises ``ValueError`` rather than mixing incompatible
+    parts.  *progress* receives ``(rows done, rows to do, seconds)`` for
+    this run only, so parts written by an earlier run do not inflate the
+    rate.  Returns the manifest with a ``completed_chunks`` count.
+    """
+
+    if fmt not in FORMATS:
+        raise ValueError(f"fmt must be one of {FORMATS}, got {fmt!r}")
+    if fmt == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as exc:
+            raise ImportError("Parquet output requires the 'pyarrow' package.") from exc
+
+    os.makedirs(out_dir, exist_ok=True)
+    n_chunks = -(-spec.size // chunk_size)
+    manifest = {
+        "spec": asdict(spec),
+        "chunk_size": chunk_size,
+        "n_chunks": n_chunks,
+        "rows": spec.size,
+        "format": fmt,
+    }
+    manifest_path = os.path.join(out_dir, MANIFEST_NAME)
+    if os.path.exists(manifest_path):
+        with open(manifest_path, "r") as fh:
+            existing = json.load(fh)
+        if json.loads(json.dumps(manifest)) != existing:
+            raise ValueError(f"{out_dir} holds a different sweep; use a fresh directory.")
+    else:
+        with open(manifest_path, "w") as fh:
+            json.dump(manifest, fh, indent=2)
+
+    pending = [i for i in range(n_chunks) if not os.path.exists(_part_path(out_dir, i, fmt))]
+    pending_rows = sum(min(chunk_size, spec.size - i * chunk_size) for i in pending)
+    done_rows = 0
+
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_write_chunk, spec, i, chunk_size, out_dir, fmt) for i in pending
+        ]
+        for future in as_completed(futures):
+            done_rows += future.result()
+            if progress is not None:
+                progress(done_rows, pending_rows, time.perf_counter() - started)
+    if progress is _print_progress and pending:
+        print(file=sys.stderr)
+
+    return {**manifest, "completed_chunks": n_chunks}
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run a parallel ROI parameter-grid sweep.")
+    parser.add_argument("spec", help="JSON grid spec (fields of GridSpec); '-' for defaults")
+    parser.add_argument("out_dir", help="Output directory (re-run to resume)")
+    parser.add_argument("--chunk-size", type=int, default=250_000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--format", choices=FORMATS, default="csv")
+    args = parser.parse_args(argv)
+
+    if args.spec == "-":
+        spec = GridSpec()
+    else:
+        with open(args.spec, "r") as fh:
+            spec = GridSpec.from_dict(json.load(fh))
+    run_sweep(spec, args.out_dir, chunk_size=args.chunk_size, workers=args.workers, fmt=args.format)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,63 @@
+"""test_batch_equivalence.py
+The vectorised engine must reproduce the scalar one exactly.
+Every tier under every scenario is scored by ``calculations.compute_all_savings``
+and by the generated NumPy kernels (fused and per line item); figures are
+compared for equality, not closeness, so a formula-registry change that
+alters either path shows up here.
+
+Usage::
+
+    python -m pytest tests
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from batch import (  # noqa: E402
+    INPUT_COLUMNS,
+    TOTAL_COLUMN,
+    build_params,
+    compute_all_savings_batch,
+    compute_line_items_batch,
+)
+from calculations import LINE_ITEMS, compute_all_savings, tier_inputs  # noqa: E402
+from constants import OPERETA_IMPACT, SCENARIOS, TIER_DATA  # noqa: E402
+
+KEYS = [key for key, _category, _area in LINE_ITEMS]
+
+
+def _cases():
+    for tier, config in TIER_DATA.items():
+        for scenario, multiplier in SCENARIOS.items():
+            impact = {name: value * multiplier for name, value in OPERETA_IMPACT.items()}
+            yield f"{tier} / {scenario}", tier_inputs(config), impact
+
+
+def test_batch_matches_scalar_for_every_tier_and_scenario():
+    for label, inputs, impact in _cases():
+        details, total = compute_all_savings(**inputs, impact=impact)
+        scalar = [item["Annual Savings ($)"] for item in details]
+
+        batch = compute_all_savings_batch({name: [inputs[name]] for name in INPUT_COLUMNS}, impact=impact)
+        assert [batch[key][0] for key in KEYS] == scalar, label
+        assert batch[TOTAL_COLUMN][0] == total, label
+
+        per_item = compute_line_items_batch(build_params(inputs, impact=impact), KEYS)
+        assert [per_item[key][0] for key in KEYS] == scalar, label
+
+
+def test_batch_scores_all_cases_in_one_call():
+    labels, rows, impacts = zip(*_cases())
+    columns = {name: np.array([row[name] for row in rows]) for name in INPUT_COLUMNS}
+    impact = {name: np.array([case[name] for case in impacts]) for name in OPERETA_IMPACT}
+    batch = compute_all_savings_batch(columns, impact=impact)
+    for i, (label, inputs, case_impact) in enumerate(zip(labels, rows, impacts)):
+        _details, total = compute_all_savings(**inputs, impact=case_impact)
+        assert batch[TOTAL_COLUMN][i] == total, label
@@ -0,0 +1,151 @@
+"""tiers.py
+Tier resolution and interpolated defaults for arbitrary headcounts.
+Each ``TIER_DATA`` tier is an anchor at its ``avg_employees``.  A headcount
+(or a whole column of them) is mapped to its tier with ``np.searchsorted``
+over the upper bounds parsed from ``employee_range``, and the profile
+defaults (hiring rate, salaries, recruiters per hire, price per employee)
+are linearly interpolated between the anchors with ``np.interp``, clamped
+beyond the first and last one.  At an anchor headcount the defaults equal
+the tier's own values, so tier-average results are unchanged.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+from typing import Any, Dict, List, Mapping, Tuple
+
+import numpy as np
+
+from calculations import tier_inputs
+from constants import TIER_DATA
+
+__all__ = [
+    "TIER_BOUNDS",
+    "TIER_NAMES",
+    "fill_defaults",
+    "interpolated_defaults",
+    "resolve_tier",
+    "tier_config_for",
+]
+
+TIER_NAMES: Tuple[str, ...] = tuple(TIER_DATA)
+PRICE_ROUNDING = 1_000  # interpolated list prices are whole thousands
+
+
+def _employee_range(text: str) -> Tuple[float, float]:
+    """``"1,001-5,000"`` -> ``(1001, 5000)``; ``"10,000+"`` -> ``(10000, inf)``."""
+    numbers = [float(n.replace(",", "")) for n in re.findall(r"\d[\d,]*", text)]
+    return (numbers[0], np.inf) if text.strip().endswith("+") else (numbers[0], numbers[-1])
+
+
+# Inclusive upper headcount of every tier but the last, ascending.  Below
+# the first range counts as the first tier.
+TIER_BOUNDS = np.array([_employee_range(TIER_DATA[name]["employee_range"])[1] for name in TIER_NAMES[:-1]])
+
+_ANCHOR_EMPLOYEES = np.array([TIER_DATA[name]["avg_employees"] for name in TIER_NAMES], dtype=np.float64)
+_ANCHORS: Dict[str, np.ndarray] = {
+    "annual_hires_percent": np.array([TIER_DATA[name]["annual_hires_percent"] for name in TIER_NAMES]),
+    "avg_annual_salary": np.array([TIER_DATA[name]["avg_annual_salary"] for name in TIER_NAMES], dtype=np.float64),
+    "avg_recruiter_salary": np.array(
+        [TIER_DATA[name]["avg_recruiter_salary"] for name in TIER_NAMES], dtype=np.float64
+    ),
+    "recruiters_per_hire": np.array(
+        [TIER_DATA[name]["default_num_recruiters"] / tier_inputs(TIER_DATA[name])["annual_hires"] for name in TIER_NAMES]
+    ),
+    "price_per_employee": np.array(
+        [TIER_DATA[name]["opereta_target_annual_price"] / TIER_DATA[name]["avg_employees"] for name in TIER_NAMES]
+    ),
+}
+if np.any(np.diff(_ANCHOR_EMPLOYEES) <= 0) or np.any(np.diff(TIER_BOUNDS) <= 0):
+    raise ValueError("TIER_DATA tiers must be ordered by headcount")
+
+
+def resolve_tier(num_employees: Any) -> Any:
+    """Index into :data:`TIER_NAMES` for each headcount (int for a scalar)."""
+    codes = np.searchsorted(TIER_BOUNDS, np.asarray(num_employees, dtype=np.float64), side="left")
+    return int(codes) if codes.ndim == 0 else codes
+
+
+def interpolated_defaults(num_employees: Any, annual_hires_percent: Any = None) -> Dict[str, np.ndarray]:
+    """Profile defaults for each headcount, as batch input columns.
+
+    Returns ``tier`` (codes), the :data:`batch.INPUT_COLUMNS`,
+    ``annual_hires_percent`` and ``annual_price``.  A given hiring rate
+    (NaN entries excepted) replaces the interpolated one.  Hires are
+    truncated like the app does; recruiters are rounded (at least one) and
+    prices rounded to :data:`PRICE_ROUNDING`.
+    """
+
+    employees = np.atleast_1d(np.asarray(num_employees, dtype=np.float64))
+    interp = {name: np.interp(employees, _ANCHOR_EMPLOYEES, values) for name, values in _ANCHORS.items()}
+    if annual_hires_percent is not None:
+        rate = np.asarray(annual_hires_percent, dtype=np.float64)
+        interp["annual_hires_percent"] = np.where(np.isnan(rate), interp["annual_hires_percent"], rate)
+    hires = np.floor(employees * interp["annual_hires_percent"])
+    return {
+        "tier": resolve_tier(employees),
+        "num_employees": employees,
+        "annual_hires_percent": interp["annual_hires_percent"],
+        "annual_hires": hires,
+        "avg_annual_salary": np.rint(interp["avg_annual_salary"]),
+        "avg_recruiter_salary": np.rint(interp["avg_recruiter_salary"]),
+        "num_recruiters": np.maximum(np.rint(hires * interp["recruiters_per_hire"]), 1.0),
+        "annual_price": np.rint(employees * interp["price_per_employee"] / PRICE_ROUNDING) * PRICE_ROUNDING,
+    }
+
+
+def tier_config_for(num_employees: float) -> Dict[str, Any]:
+    """A ``TIER_DATA``-shaped profile for one headcount (its tier's entry, re-anchored)."""
+    defaults = {name: values[0] for name, values in interpolated_defaults(num_employees).items()}
+    name = TIER_NAMES[int(defaults["tier"])]
+    return {
+        **TIER_DATA[name],
+        "tier": name,
+        "avg_employees": int(num_employees) if float(num_employees).is_integer() else float(num_employees),
+        "annual_hires_percent": float(defaults["annual_hires_percent"]),
+        "avg_annual_salary": int(defaults["avg_annual_salary"]),
+        "avg_recruiter_salary": int(defaults["avg_recruiter_salary"]),
+        "default_num_recruiters": int(defaults["num_recruiters"]),
+        "opereta_target_annual_price": int(defaults["annual_price"]),
+    }
+
+
+def fill_defaults(data: Mapping[str, Any], *, price_column: str = "annual_price") -> Dict[str, np.ndarray]:
+    """Interpolated values for the columns of *data* that are absent or NaN.
+
+    *data* needs ``num_employees``; a given ``annual_hires_percent`` is used
+    for hires before the interpolated rate.  Returns only the columns that
+    were added or had entries filled, plus a ``tier`` name column.
+    """
+
+    defaults = interpolated_defaults(data["num_employees"], data.get("annual_hires_percent"))
+    filled: Dict[str, np.ndarray] = {"tier": np.asarray(TIER_NAMES, dtype=object)[defaults.pop("tier")]}
+    defaults[price_column] = defaults.pop("annual_price")
+    for name, default in defaults.items():
+        if name in ("num_employees", "annual_hires_percent"):
+            continue
+        if name not in data:
+            filled[name] = default
+            continue
+        given = np.asarray(data[name], dtype=np.float64)
+        missing = np.isnan(given)
+        if missing.any():
+            filled[name] = np.where(missing, default, given)
+    return filled
+
+
+# ---------- CLI ---------- #
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Resolve tiers and interpolated defaults for headcounts.")
+    parser.add_argument("headcounts", nargs="+", type=float)
+    args = parser.parse_args(argv)
+    print(json.dumps([tier_config_for(n) for n in args.headcounts], indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
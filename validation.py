@@ -0,0 +1,254 @@
+"""validation.py
+Vectorised validation of prospect input columns.
+Every rule is a whole-column NumPy expression that sets one bit of a
+per-row ``uint32`` mask, so checking a million rows costs a few array
+passes and no Python loop over rows.  Rules are either errors (the row is
+quarantined) or warnings (the row is scored but flagged).  Problems with
+the table as a whole (missing columns, unknown impact keys) are reported
+separately.  :func:`scoring.score_file` uses this to divert bad rows to a
+quarantine file.
+
+Usage::
+
+    python validation.py prospects.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Tuple
+
+import numpy as np
+
+from batch import BASELINE_CONSTANTS, INPUT_COLUMNS
+from constants import OPERETA_IMPACT
+
+__all__ = [
+    "ERROR_BITS",
+    "RULES",
+    "Rule",
+    "ValidationResult",
+    "validate_columns",
+]
+
+PRICE_COLUMN = "annual_price"
+COUNT_COLUMNS = ("num_employees", "annual_hires", "num_recruiters")
+SALARY_COLUMNS = ("avg_annual_salary", "avg_recruiter_salary")
+MAX_HIRES_PER_RECRUITER = 300
+MAX_HOURS_PER_WEEK = 40
+
+
+@dataclass(frozen=True)
+class Rule:
+    """One row check: ``bit`` is set where it fails."""
+
+    name: str
+    bit: int
+    severity: str  # "error" quarantines the row, "warning" only flags it
+    message: str
+
+
+RULES: Tuple[Rule, ...] = (
+    Rule("not_numeric", 1 << 0, "error", "non-numeric value in an input column"),
+    Rule("missing_value", 1 << 1, "error", "missing or non-finite input"),
+    Rule("missing_price", 1 << 2, "error", "missing, non-finite or negative annual price"),
+    Rule("negative_value", 1 << 3, "error", "negative input value"),
+    Rule("no_employees", 1 << 4, "error", "num_employees is zero"),
+    Rule("no_salary", 1 << 5, "error", "salary is zero"),
+    Rule("recruiters_exceed_employees", 1 << 6, "error", "num_recruiters exceeds num_employees"),
+    Rule("override_out_of_range", 1 << 7, "error", "impact or baseline override out of range"),
+    Rule("zero_hires", 1 << 8, "warning", "annual_hires is zero"),
+    Rule("zero_price", 1 << 9, "warning", "annual price is zero (ROI is infinite)"),
+    Rule("fractional_count", 1 << 10, "warning", "headcount, hires or recruiters not a whole number"),
+    Rule("hires_exceed_employees", 1 << 11, "warning", "annual_hires exceeds num_employees"),
+    Rule("recruiter_load", 1 << 12, "warning",
+         f"hires without recruiters, or over {MAX_HIRES_PER_RECRUITER} hires per recruiter"),
+)
+
+_BY_NAME = {rule.name: rule for rule in RULES}
+ERROR_BITS = sum(rule.bit for rule in RULES if rule.severity == "error")
+
+
+def _numeric(values: Any) -> Tuple[np.ndarray, np.ndarray]:
+    """``(float64 values, mask of entries that were present but not numbers)``."""
+    array = np.asarray(values)
+    if array.dtype.kind in "biuf":
+        return array.astype(np.float64, copy=False), np.zeros(array.shape, dtype=bool)
+    import pandas as pd
+
+    present = ~pd.isna(array)
+    numbers = pd.to_numeric(pd.Series(array, copy=False), errors="coerce").to_numpy(dtype=np.float64)
+    return numbers, present & np.isnan(numbers)
+
+
+def _override_range(name: str) -> Tuple[float, float]:
+    if name in OPERETA_IMPACT:
+        return (0.0, MAX_HOURS_PER_WEEK) if name.endswith("_per_recruiter") else (0.0, 1.0)
+    return 0.0, np.inf
+
+
+@dataclass
+class ValidationResult:
+    """Per-row failure mask plus table-level problems."""
+
+    mask: np.ndarray
+    table_errors: List[str] = field(default_factory=list)
+    table_warnings: List[str] = field(default_factory=list)
+
+    @property
+    def valid(self) -> np.ndarray:
+        """Rows free of error bits (warnings allowed); all ``False`` on table errors."""
+        if self.table_errors:
+            return np.zeros(self.mask.shape, dtype=bool)
+        return (self.mask & ERROR_BITS) == 0
+
+    def counts(self) -> Dict[str, int]:
+        """Rows failing each rule (only rules that fired)."""
+        counts = {rule.name: int(np.count_nonzero(self.mask & rule.bit)) for rule in RULES}
+        return {name: n for name, n in counts.items() if n}
+
+    def report(self, examples: int = 5) -> Dict[str, Any]:
+        """Compact summary: totals, per-rule counts and the first few failing rows."""
+        valid = self.valid
+        return {
+            "rows": int(self.mask.size),
+            "valid_rows": int(np.count_nonzero(valid)),
+            "quarantined_rows": int(self.mask.size - np.count_nonzero(valid)),
+            "table_errors": list(self.table_errors),
+            "table_warnings": list(self.table_warnings),
+            "rules": {
+                name: {
+                    "severity": _BY_NAME[name].severity,
+                    "message": _BY_NAME[name].message,
+                    "rows": n,
+                    "examples": np.flatnonzero(self.mask & _BY_NAME[name].bit)[:examples].tolist(),
+                }
+                for name, n in self.counts().items()
+            },
+        }
+
+    def describe(self) -> np.ndarray:
+        """Comma-separated rule names per row, decoded once per distinct mask value."""
+        codes, inverse = np.unique(self.mask, return_inverse=True)
+        labels = np.array(
+            [",".join(rule.name for rule in RULES if code & rule.bit) for code in codes.tolist()], dtype=object
+        )
+        return labels[inverse.reshape(self.mask.shape)]
+
+
+def validate_columns(
+    data: Mapping[str, Any],
+    *,
+    price_column: str | None = PRICE_COLUMN,
+    impact: Mapping[str, Any] | None = None,
+) -> ValidationResult:
+    """Check prospect input columns (a DataFrame or dict of arrays) in bulk.
+
+    Accepts the same layout as :func:`scoring.score_frame`: the
+    :data:`batch.INPUT_COLUMNS` (``annual_hires_percent`` may stand in for
+    ``annual_hires``), a price column and optional per-row impact/baseline
+    overrides.  *impact* is the shared impact mapping the rows will be
+    scored with; keys outside ``OPERETA_IMPACT`` are table errors.
+    """
+
+    columns = list(data.keys())
+    n = len(data[columns[0]]) if columns else 0
+    mask = np.zeros(n, dtype=np.uint32)
+    result = ValidationResult(mask)
+
+    if impact is not None:
+        unknown = sorted(set(impact) - set(OPERETA_IMPACT))
+        missing = sorted(set(OPERETA_IMPACT) - set(impact))
+        if unknown:
+            result.table_errors.append(f"impact keys not in OPERETA_IMPACT: {unknown}")
+        if missing:
+            result.table_errors.append(f"impact mapping lacks keys: {missing}")
+
+    def flag(name: str, where: np.ndarray) -> None:
+        mask[where] |= np.uint32(_BY_NAME[name].bit)
+
+    values: Dict[str, np.ndarray] = {}
+    for name in (*INPUT_COLUMNS, "annual_hires_percent", *([price_column] if price_column else [])):
+        if name in data:
+            values[name], not_numeric = _numeric(data[name])
+            flag("not_numeric", not_numeric)
+    if "annual_hires" not in values and "annual_hires_percent" in values and "num_employees" in values:
+        values["annual_hires"] = np.floor(values["num_employees"] * values["annual_hires_percent"])
+    missing_columns = [name for name in INPUT_COLUMNS if name not in values]
+    if price_column and price_column not in values:
+        missing_columns.append(price_column)
+    if missing_columns:
+        result.table_errors.append(f"missing columns: {missing_columns}")
+        return result
+
+    inputs = np.vstack([values[name] for name in INPUT_COLUMNS])
+    with np.errstate(invalid="ignore"):
+        flag("missing_value", ~np.isfinite(inputs).all(axis=0))
+        flag("negative_value", (inputs < 0).any(axis=0))
+        flag("no_employees", values["num_employees"] == 0)
+        flag("no_salary", np.vstack([values[name] == 0 for name in SALARY_COLUMNS]).any(axis=0))
+        employees, hires, recruiters = (values[name] for name in COUNT_COLUMNS)
+        flag("recruiters_exceed_employees", recruiters > employees)
+        flag("zero_hires", hires == 0)
+        flag("hires_exceed_employees", hires > employees)
+        flag(
+            "fractional_count",
+            np.vstack([values[name] != np.floor(values[name]) for name in COUNT_COLUMNS]).any(axis=0)
+            & np.isfinite(inputs).all(axis=0),
+        )
+        flag("recruiter_load", ((recruiters == 0) & (hires > 0)) | (hires > recruiters * MAX_HIRES_PER_RECRUITER))
+        if price_column:
+            price = values[price_column]
+            flag("missing_price", ~np.isfinite(price) | (price < 0))
+            flag("zero_price", price == 0)
+
+        for name in columns:
+            if name in OPERETA_IMPACT or name in BASELINE_CONSTANTS:
+                override, not_numeric = _numeric(data[name])
+                low, high = _override_range(name)
+                flag("not_numeric", not_numeric)
+                in_range = np.isfinite(override) & (override >= low) & (override <= high)
+                flag("override_out_of_range", ~in_range & ~not_numeric)
+
+    looks_like_override = [
+        name for name in columns
+        if name not in values and name not in OPERETA_IMPACT and name not in BASELINE_CONSTANTS
+        and (name.endswith(("_percent", "_pct", "_points", "_per_recruiter")) or name.isupper())
+    ]
+    if looks_like_override:
+        result.table_warnings.append(
+            f"columns ignored by the model (not OPERETA_IMPACT keys or baseline constants): {looks_like_override}"
+        )
+    return result
+
+
+# ---------- CLI ---------- #
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Validate a prospect file without scoring it.")
+    parser.add_argument("input", help="Prospect file (.csv or .parquet) or prospect_store directory")
+    parser.add_argument("--price-column", default=PRICE_COLUMN)
+    parser.add_argument("--chunk-size", type=int, default=200_000)
+    args = parser.parse_args(argv)
+
+    from scoring import iter_prospect_chunks
+
+    masks: List[np.ndarray] = []
+    table_errors: List[str] = []
+    table_warnings: List[str] = []
+    for chunk in iter_prospect_chunks(args.input, args.chunk_size):
+        result = validate_columns(chunk, price_column=args.price_column)
+        masks.append(result.mask)
+        table_errors = table_errors or result.table_errors
+        table_warnings = table_warnings or result.table_warnings
+    combined = ValidationResult(np.concatenate(masks) if masks else np.zeros(0, np.uint32), table_errors, table_warnings)
+    report = combined.report()
+    print(json.dumps(report, indent=2))
+    return 1 if report["quarantined_rows"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())